@@ -1,6 +1,8 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS 
 
+import contextlib
 import sys
 import os
 import traceback
@@ -14,80 +16,445 @@ if project_root_directory not in sys.path:
 if app_module_path not in sys.path:
     sys.path.insert(0, app_module_path)
 
-from app.agents.pesquisador_principal import buscar_vagas_principais
-from app.agents.pesquisador_proximidade import buscar_vagas_em_proximidades
-from app.agents.consolidador_formatador import processar_e_formatar_vagas
-from app.core.config import GOOGLE_API_KEY
-from datetime import datetime
+from app.agents.orquestrador import executar_busca_em_pipeline, ExecucaoIncremental
+from app.agents.busca_em_lote import ler_matriz_de_busca, iterar_busca_em_lote, evento_para_ndjson
+from app.agents.consolidador_formatador import chave_ordenacao_vaga, LIMITE_ANTIGUIDADE_VAGA_DIAS
+from app.agents.pesquisador_proximidade import obter_cache_cidades_proximas
+from app.agents.registro_agentes import preaquecer_agentes
+from app.core.config import (
+    LLM_CONFIGURADO,
+    PREAQUECER_AGENTES,
+    CACHE_CONSULTAS_TTL_SEGUNDOS,
+    CACHE_CONSULTAS_JANELA_STALE_SEGUNDOS,
+    MAX_WORKERS_JOBS,
+    MAX_JOBS_NA_FILA,
+    TTL_JOBS_FINALIZADOS_SEGUNDOS,
+    INDICE_VAGAS_ATIVO,
+    INDICE_VAGAS_INTERVALO_BUSCA_AO_VIVO_SEGUNDOS,
+    PAGINACAO_LIMITE_PADRAO,
+    PAGINACAO_LIMITE_MAXIMO,
+    RESULTADOS_PAGINADOS_TTL_SEGUNDOS,
+    RESULTADOS_PAGINADOS_MAX
+)
+from app.core.cache import CacheComRevalidacao, normalizar_chave
+from app.core.jobs import GerenciadorDeJobs, FilaDeJobsCheiaError, EVENTO_ETAPA, EVENTO_VAGA, EVENTO_FINAL, EVENTO_ERRO
+from app.core.metricas import registro_metricas, DetalhamentoDeTempos, DURACAO_REQUISICAO
+from app.core.indice_vagas import obter_indice_vagas
+from app.core.vaga import Vaga, serializar_para_json
+from app.core.paginacao import ArmazemDeResultados, CursorInvalidoError, decodificar_cursor, ler_campos, projetar_vaga
+from datetime import date, datetime
+import time
+
+class ProvedorJSONComVagas(DefaultJSONProvider):
+    """Serializa `Vaga` no mesmo formato dos dicts de vaga (datas como no restante da API)."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (Vaga, date)):
+            return serializar_para_json(o)
+        return DefaultJSONProvider.default(o)
 
 app = Flask(__name__)
+app.json = ProvedorJSONComVagas(app)
 CORS(app) 
+if PREAQUECER_AGENTES:
+    preaquecer_agentes()
 
 DATA_REFERENCIA_CENARIO_GEMINI = datetime(2025, 5, 17) 
+INTERVALO_KEEPALIVE_SSE_SEGUNDOS = 15
 
-@app.route('/api/buscar-vagas', methods=['POST'])
-def api_buscar_vagas():
-    print("[API] Nova requisição recebida para /api/buscar-vagas")
-    if not GOOGLE_API_KEY:
-        print("[API] ERRO: GOOGLE_API_KEY não configurada.")
-        return jsonify({"erro": "Configuração da API Key do Google ausente no servidor."}), 500
+cache_consultas = CacheComRevalidacao(
+    ttl_segundos=CACHE_CONSULTAS_TTL_SEGUNDOS,
+    janela_stale_segundos=CACHE_CONSULTAS_JANELA_STALE_SEGUNDOS
+)
+
+gerenciador_jobs = GerenciadorDeJobs(
+    max_workers=MAX_WORKERS_JOBS,
+    max_fila=MAX_JOBS_NA_FILA,
+    ttl_jobs_finalizados_segundos=TTL_JOBS_FINALIZADOS_SEGUNDOS
+)
 
-    data = request.get_json()
+armazem_resultados = ArmazemDeResultados(
+    ttl_segundos=RESULTADOS_PAGINADOS_TTL_SEGUNDOS,
+    max_resultados=RESULTADOS_PAGINADOS_MAX
+)
+
+def _ler_parametros_paginacao(limite_obrigatorio: bool = False):
+    """Lê ?limit= e ?campos=. Retorna (limite ou None, campos, None) ou (None, None, resposta_de_erro)."""
+    campos = ler_campos(request.args.get('campos'))
+    texto_limite = request.args.get('limit')
+    if not texto_limite:
+        return (PAGINACAO_LIMITE_PADRAO if limite_obrigatorio else None), campos, None
+    try:
+        limite = int(texto_limite)
+    except ValueError:
+        return None, None, (jsonify({"erro": "O parâmetro 'limit' deve ser um número inteiro."}), 400)
+    return max(1, min(limite, PAGINACAO_LIMITE_MAXIMO)), campos, None
+
+def _paginar_resultado_final(dados: dict, resultado_id: str | None, limite: int | None, campos: tuple[str, ...] | None) -> dict:
+    """Com paginação pedida, troca a lista completa de vagas do resultado pela primeira página e o cursor da seguinte."""
+    if 'vagas' not in dados:
+        return dados
+    if limite is None:
+        return {**dados, "vagas": [projetar_vaga(vaga, campos) for vaga in dados['vagas']]} if campos else dados
+    pagina = armazem_resultados.pagina(resultado_id, 0, limite, campos)
+    if pagina is None:
+        pagina = armazem_resultados.pagina(armazem_resultados.guardar(dados['vagas'], resultado_id), 0, limite, campos)
+    return {**dados, **pagina}
+
+def _ler_parametros_busca():
+    """Valida o payload JSON. Retorna (parametros, None) ou (None, resposta_de_erro)."""
+    if not LLM_CONFIGURADO:
+        print("[API] ERRO: GOOGLE_API_KEY não configurada (e LLM_BACKEND exige a API real).")
+        return None, (jsonify({"erro": "Configuração da API Key do Google ausente no servidor."}), 500)
+
+    data = request.get_json(silent=True)
     if not data:
         print("[API] ERRO: Payload JSON ausente ou inválido.")
-        return jsonify({"erro": "Payload da requisição ausente ou inválido."}), 400
+        return None, (jsonify({"erro": "Payload da requisição ausente ou inválido."}), 400)
 
     cargo = data.get('cargo')
     cidade_principal = data.get('cidade_principal')
     buscar_proximas = data.get('buscar_proximas', False)
+    incremental = data.get('incremental', False)
+    indice_local = data.get('indice_local', False)
 
     if not cargo or not cidade_principal:
         print("[API] ERRO: Campos 'cargo' ou 'cidade_principal' ausentes.")
-        return jsonify({"erro": "Os campos 'cargo' e 'cidade_principal' são obrigatórios."}), 400
+        return None, (jsonify({"erro": "Os campos 'cargo' e 'cidade_principal' são obrigatórios."}), 400)
 
-    print(f"[API] Buscando por Cargo: '{cargo}', Cidade: '{cidade_principal}', Próximas: {buscar_proximas}")
+    return {
+        "cargo": cargo,
+        "cidade_principal": cidade_principal,
+        "buscar_proximas": bool(buscar_proximas),
+        "incremental": bool(incremental),
+        "indice_local": bool(indice_local)
+    }, None
+
+class ResultadoDaBusca:
+    """
+    Resultado de uma execução do pipeline guardado no cache de consultas: as vagas, o tempo gasto
+    por etapa e, na atualização incremental, os parses que servem de base para a próxima execução.
+    Não guarda nada da requisição que disparou a execução.
+    """
+
+    def __init__(self, vagas: list[Vaga], tempos_por_etapa: dict[str, float], parses_da_execucao: dict[str, tuple[str, dict]] | None = None,
+                 do_indice_local: bool = False):
+        self.vagas = vagas
+        self.tempos_por_etapa = tempos_por_etapa
+        self.parses_da_execucao = parses_da_execucao
+        self.do_indice_local = do_indice_local
+        self.execucao_salva = False
+
+def _buscar_vagas_com_cache(cargo: str, cidade_principal: str, buscar_proximas: bool, ao_mudar_etapa=None, ao_aceitar_vaga=None, detalhamento_tempos=None,
+                            incremental: bool = False, indice_local: bool = False) -> tuple[list[Vaga], str]:
+    """
+    Busca ao vivo pelo cache de consultas. O cálculo em cache só publica seu progresso (etapas e
+    vagas aceitas), e cada chamador repassa aos próprios callbacks o progresso do cálculo que
+    aguarda; se o resultado veio pronto do cache, as vagas são repassadas de uma vez. Os tempos
+    por etapa e a base da atualização incremental são aplicados aqui, por requisição.
+    Com `indice_local` (e fora do modo incremental), uma consulta ausente do cache é respondida
+    pelo índice local quando ele pode dispensar os agentes; o estado devolvido é "indice_local".
+    """
+    usar_indice_local = indice_local and not incremental and INDICE_VAGAS_ATIVO
 
-    resultados_ag1_bruto = None
-    resultados_ag2_por_cidade = {}
+    def executar_pipeline(publicar) -> ResultadoDaBusca:
+        if usar_indice_local:
+            inicio_indice = time.perf_counter()
+            vagas_locais, busca_ao_vivo_necessaria = _consultar_indice_local(cargo, cidade_principal, buscar_proximas)
+            if not busca_ao_vivo_necessaria:
+                for vaga in vagas_locais:
+                    publicar((EVENTO_VAGA, vaga))
+                return ResultadoDaBusca(vagas_locais, {"indice_local": time.perf_counter() - inicio_indice}, do_indice_local=True)
+        print(f"[API] Iniciando pipeline: {'busca principal e busca por proximidade em paralelo' if buscar_proximas else 'busca principal'}, parse à medida que cada busca termina...")
+        execucao_incremental = _carregar_execucao_incremental(cargo, cidade_principal, buscar_proximas) if incremental else None
+        tempos_da_execucao = DetalhamentoDeTempos()
+        vagas = executar_busca_em_pipeline(
+            cargo,
+            cidade_principal,
+            buscar_proximas,
+            DATA_REFERENCIA_CENARIO_GEMINI,
+            ao_mudar_etapa=lambda etapa: publicar((EVENTO_ETAPA, etapa)),
+            ao_aceitar_vaga=lambda vaga: publicar((EVENTO_VAGA, vaga)),
+            detalhamento_tempos=tempos_da_execucao,
+            execucao_incremental=execucao_incremental
+        )
+        print(f"[API] Pipeline concluído. {len(vagas)} vagas processadas.")
+        if INDICE_VAGAS_ATIVO:
+            _registrar_no_indice_local(cargo, cidade_principal, buscar_proximas, vagas)
+        return ResultadoDaBusca(vagas, tempos_da_execucao.para_dict(), execucao_incremental.parses_para_salvar() if execucao_incremental else None)
+
+    def repassar_progresso(evento: tuple[str, object]):
+        tipo, dados = evento
+        if tipo == EVENTO_ETAPA and ao_mudar_etapa:
+            ao_mudar_etapa(dados)
+        elif tipo == EVENTO_VAGA and ao_aceitar_vaga:
+            ao_aceitar_vaga(dados)
+
+    chave_consulta = (normalizar_chave(cargo), normalizar_chave(cidade_principal), bool(buscar_proximas), bool(incremental), usar_indice_local)
+    resultado, estado_cache = cache_consultas.obter_ou_calcular(chave_consulta, executar_pipeline, ouvinte=repassar_progresso)
+    if resultado.do_indice_local and estado_cache in ("calculado", "coalescido"):
+        estado_cache = "indice_local"
+    if estado_cache in ("fresco", "stale"):
+        if ao_aceitar_vaga:
+            for vaga in resultado.vagas:
+                ao_aceitar_vaga(vaga)
+    elif detalhamento_tempos is not None:
+        for etapa, segundos in resultado.tempos_por_etapa.items():
+            detalhamento_tempos.registrar(etapa, segundos)
+    if resultado.parses_da_execucao is not None and not resultado.execucao_salva:
+        # A base da próxima execução incremental é a execução cujo resultado foi de fato entregue.
+        resultado.execucao_salva = True
+        _salvar_execucao_incremental(cargo, cidade_principal, buscar_proximas, resultado.parses_da_execucao)
+    print(f"[API] Resultado da consulta: {estado_cache} ({len(resultado.vagas)} vagas).")
+    return resultado.vagas, estado_cache
+
+def _carregar_execucao_incremental(cargo: str, cidade_principal: str, buscar_proximas: bool) -> ExecucaoIncremental:
+    try:
+        parses_anteriores = obter_indice_vagas().obter_parses_da_ultima_execucao(cargo, cidade_principal, buscar_proximas)
+    except Exception as e:
+        print(f"[API] Não foi possível carregar a execução anterior da consulta; todas as vagas serão parseadas: {e}")
+        parses_anteriores = {}
+    print(f"[API] Atualização incremental: {len(parses_anteriores)} vagas parseadas na execução anterior.")
+    return ExecucaoIncremental(parses_anteriores)
+
+def _salvar_execucao_incremental(cargo: str, cidade_principal: str, buscar_proximas: bool, parses_da_execucao: dict[str, tuple[str, dict]]):
+    try:
+        obter_indice_vagas().salvar_parses_da_execucao(cargo, cidade_principal, buscar_proximas, parses_da_execucao)
+    except Exception as e:
+        print(f"[API] Não foi possível salvar os parses da execução para a atualização incremental: {e}")
 
+def _registrar_no_indice_local(cargo: str, cidade_principal: str, buscar_proximas: bool, vagas: list[Vaga]):
     try:
-        print(f"[API] Etapa 1: Chamando Agente Pesquisador Principal...")
-        resultados_ag1_bruto = buscar_vagas_principais(cargo, cidade_principal)
-        print(f"[API] Etapa 1: Concluída. Preview Ag1: {str(resultados_ag1_bruto)[:100] if resultados_ag1_bruto else 'Nenhum resultado'}...")
-        
+        indice = obter_indice_vagas()
+        novas = indice.registrar_vagas(vagas)
+        indice.registrar_busca_ao_vivo(cargo, cidade_principal, buscar_proximas, len(vagas))
+        removidas = indice.remover_antigas(DATA_REFERENCIA_CENARIO_GEMINI, LIMITE_ANTIGUIDADE_VAGA_DIAS)
+        print(f"[API] Índice local: {novas} vagas novas, {removidas} antigas removidas, {len(indice)} no total.")
+    except Exception as e:
+        print(f"[API] Não foi possível atualizar o índice local de vagas: {e}")
+
+def _consultar_indice_local(cargo: str, cidade_principal: str, buscar_proximas: bool) -> tuple[list[Vaga], bool]:
+    """
+    Retorna (vagas do índice local, se a busca ao vivo ainda é necessária). A consulta só é atendida
+    localmente se ela mesma (cargo, cidade, próximas) foi buscada ao vivo há menos de
+    INDICE_VAGAS_INTERVALO_BUSCA_AO_VIVO_SEGUNDOS: vagas indexadas por outras consultas não dispensam os agentes.
+    """
+    if not INDICE_VAGAS_ATIVO:
+        return [], True
+    try:
+        indice = obter_indice_vagas()
+        cidades = [cidade_principal]
         if buscar_proximas:
-            print(f"[API] Etapa 2: Chamando Agente Pesquisador de Proximidade...")
-            resultados_ag2_por_cidade = buscar_vagas_em_proximidades(cargo, cidade_principal)
-            print(f"[API] Etapa 2: Concluída. Cidades próximas processadas: {len(resultados_ag2_por_cidade)}")
-        else:
-            print(f"[API] Etapa 2: Pular busca por proximidade.")
-
-
-        print(f"[API] Etapa 3: Processando com o Agente Consolidador...")
-        vagas_processadas_lista_de_dicts = processar_e_formatar_vagas(
-            resultados_ag1_bruto, 
-            resultados_ag2_por_cidade,
-            DATA_REFERENCIA_CENARIO_GEMINI
-        )
-        print(f"[API] Etapa 3: Concluída. {len(vagas_processadas_lista_de_dicts)} vagas processadas.")
+            cidades.extend(obter_cache_cidades_proximas().obter(normalizar_chave(cidade_principal)) or [])
+        vagas = indice.buscar(cargo, cidades)
+        segundos_desde_busca = indice.segundos_desde_ultima_busca_ao_vivo(cargo, cidade_principal, buscar_proximas)
+    except Exception as e:
+        print(f"[API] Não foi possível consultar o índice local de vagas: {e}")
+        return [], True
+
+    vagas.sort(key=lambda vaga: chave_ordenacao_vaga(vaga, DATA_REFERENCIA_CENARIO_GEMINI), reverse=True)
+    busca_necessaria = segundos_desde_busca is None or segundos_desde_busca > INDICE_VAGAS_INTERVALO_BUSCA_AO_VIVO_SEGUNDOS
+    print(f"[API] Índice local: {len(vagas)} vagas para a consulta; busca ao vivo {'necessária' if busca_necessaria else 'dispensada'}.")
+    return vagas, busca_necessaria
 
-        if not vagas_processadas_lista_de_dicts:
-            return jsonify({"mensagem": "Nenhuma vaga relevante encontrada após processamento.", "vagas": []})
-        
-        return jsonify({
-            "mensagem": f"{len(vagas_processadas_lista_de_dicts)} vagas encontradas e processadas.",
-            "vagas": vagas_processadas_lista_de_dicts
-        })
+def _mensagem_resultado(vagas: list[Vaga]) -> str:
+    if not vagas:
+        return "Nenhuma vaga relevante encontrada após processamento."
+    novas = sum(1 for vaga in vagas if vaga.nova)
+    if novas:
+        return f"{len(vagas)} vagas encontradas e processadas ({novas} novas desde a última busca)."
+    return f"{len(vagas)} vagas encontradas e processadas."
+
+def _registrar_erro_inesperado(e: Exception):
+    print("[API] !!!! ERRO INESPERADO DURANTE O PROCESSAMENTO !!!!")
+    print(f"[API] Tipo de Erro: {type(e).__name__}")
+    print(f"[API] Mensagem do Erro: {str(e)}")
+    print("[API] --- TRACEBACK COMPLETO ABAIXO ---")
+    print(traceback.format_exc()) 
+    print("[API] --- FIM DO TRACEBACK ---")
+
+@app.route('/api/buscar-vagas', methods=['POST'])
+def api_buscar_vagas():
+    print("[API] Nova requisição recebida para /api/buscar-vagas")
+    parametros, resposta_erro = _ler_parametros_busca()
+    if resposta_erro:
+        return resposta_erro
+
+    cargo = parametros['cargo']
+    cidade_principal = parametros['cidade_principal']
+    buscar_proximas = parametros['buscar_proximas']
+    incremental = parametros['incremental']
+    print(f"[API] Buscando por Cargo: '{cargo}', Cidade: '{cidade_principal}', Próximas: {buscar_proximas}")
+    incluir_tempos = request.args.get('tempos', '').lower() in ('1', 'true', 'sim')
+    limite, campos, resposta_erro = _ler_parametros_paginacao()
+    if resposta_erro:
+        return resposta_erro
+
+    inicio = time.perf_counter()
+    detalhamento_tempos = DetalhamentoDeTempos()
+    try:
+        vagas_processadas, estado_cache = _buscar_vagas_com_cache(
+            cargo, cidade_principal, buscar_proximas, detalhamento_tempos=detalhamento_tempos,
+            incremental=incremental, indice_local=parametros['indice_local']
+        )
+        duracao_total = time.perf_counter() - inicio
+        DURACAO_REQUISICAO.observar(duracao_total, endpoint="/api/buscar-vagas", cache=estado_cache)
+        print(f"[API] Busca concluída em {duracao_total:.2f}s. Tempo por etapa: {detalhamento_tempos.para_dict()}")
+        resposta = {
+            "mensagem": _mensagem_resultado(vagas_processadas),
+            "vagas": vagas_processadas,
+            "cache": estado_cache
+        }
+        resultado_id = armazem_resultados.guardar(vagas_processadas) if limite is not None else None
+        resposta = _paginar_resultado_final(resposta, resultado_id, limite, campos)
+        if incluir_tempos:
+            resposta["tempos"] = {"total_segundos": round(duracao_total, 4), "etapas": detalhamento_tempos.para_dict()}
+        return jsonify(resposta)
 
     except Exception as e:
-        print("[API] !!!! ERRO INESPERADO DURANTE O PROCESSAMENTO !!!!")
-        print(f"[API] Tipo de Erro: {type(e).__name__}")
-        print(f"[API] Mensagem do Erro: {str(e)}")
-        print("[API] --- TRACEBACK COMPLETO ABAIXO ---")
-        print(traceback.format_exc()) 
-        print("[API] --- FIM DO TRACEBACK ---")
+        _registrar_erro_inesperado(e)
         return jsonify({"erro": f"Ocorreu um erro interno no servidor ao processar sua busca. Por favor, verifique os logs do servidor."}), 500
 
+@app.route('/api/buscar-vagas/lote', methods=['POST'])
+def api_buscar_vagas_em_lote():
+    """
+    Busca a matriz {"cargos": [...], "cidades": [...], "buscar_proximas": bool} e transmite em NDJSON
+    uma linha por combinação, na ordem em que terminam, e um resumo final. Buscas, cidades próximas
+    e parses repetidos entre as combinações são feitos uma única vez.
+    """
+    print("[API] Nova requisição recebida para /api/buscar-vagas/lote")
+    if not LLM_CONFIGURADO:
+        print("[API] ERRO: GOOGLE_API_KEY não configurada (e LLM_BACKEND exige a API real).")
+        return jsonify({"erro": "Configuração da API Key do Google ausente no servidor."}), 500
+
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        print("[API] ERRO: Payload JSON ausente ou inválido.")
+        return jsonify({"erro": "Payload da requisição ausente ou inválido."}), 400
+    try:
+        cargos, cidades = ler_matriz_de_busca(data)
+    except ValueError as e:
+        print(f"[API] ERRO: Matriz de busca inválida: {e}")
+        return jsonify({"erro": str(e)}), 400
+
+    buscar_proximas = bool(data.get('buscar_proximas', False))
+    print(f"[API] Busca em lote: {len(cargos)} cargos × {len(cidades)} cidades, Próximas: {buscar_proximas}")
+
+    def gerar():
+        inicio = time.perf_counter()
+        try:
+            # Se o cliente desconectar, fechar o iterador cancela o restante da matriz.
+            with contextlib.closing(iterar_busca_em_lote(cargos, cidades, buscar_proximas, DATA_REFERENCIA_CENARIO_GEMINI)) as eventos:
+                for evento in eventos:
+                    yield evento_para_ndjson(evento)
+        except Exception as e:
+            _registrar_erro_inesperado(e)
+            yield evento_para_ndjson({"tipo": "erro", "erro": "Ocorreu um erro interno no servidor ao processar a busca em lote."})
+        finally:
+            DURACAO_REQUISICAO.observar(time.perf_counter() - inicio, endpoint="/api/buscar-vagas/lote", cache="calculado")
+
+    return Response(gerar(), mimetype='application/x-ndjson', headers={'X-Accel-Buffering': 'no'})
+
+@app.route('/api/jobs', methods=['POST'])
+def api_criar_job():
+    print("[API] Nova requisição recebida para /api/jobs")
+    parametros, resposta_erro = _ler_parametros_busca()
+    if resposta_erro:
+        return resposta_erro
+
+    def executar_job(job) -> tuple[str, list[Vaga]]:
+        vagas, _ = _buscar_vagas_com_cache(
+            parametros['cargo'],
+            parametros['cidade_principal'],
+            parametros['buscar_proximas'],
+            ao_mudar_etapa=job.atualizar_etapa,
+            ao_aceitar_vaga=job.adicionar_vaga_parcial,
+            incremental=parametros['incremental'],
+            indice_local=parametros['indice_local']
+        )
+        armazem_resultados.guardar(vagas, job.id)
+        return _mensagem_resultado(vagas), vagas
+
+    try:
+        job = gerenciador_jobs.submeter(
+            parametros,
+            executar_job,
+            chave_ordenacao=lambda vaga: chave_ordenacao_vaga(vaga, DATA_REFERENCIA_CENARIO_GEMINI)
+        )
+    except FilaDeJobsCheiaError as e:
+        print(f"[API] Job recusado: {e}")
+        return jsonify({"erro": "O servidor está com muitas buscas em andamento. Tente novamente em alguns instantes."}), 503
+
+    print(f"[API] Job {job.id} criado para Cargo: '{parametros['cargo']}', Cidade: '{parametros['cidade_principal']}', Próximas: {parametros['buscar_proximas']}")
+    return jsonify(job.para_dict(incluir_parciais=False)), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def api_consultar_job(job_id):
+    job = gerenciador_jobs.obter(job_id)
+    if not job:
+        return jsonify({"erro": "Job não encontrado ou expirado."}), 404
+    limite, campos, resposta_erro = _ler_parametros_paginacao()
+    if resposta_erro:
+        return resposta_erro
+    return jsonify(_paginar_resultado_final(job.para_dict(), job.id, limite, campos))
+
+@app.route('/api/jobs/<job_id>/eventos', methods=['GET'])
+def api_eventos_job(job_id):
+    """
+    Server-Sent Events do job: 'etapa', 'vaga' (cada vaga aceita, com rank provisório)
+    e, ao final, 'final' (lista deduplicada e ordenada) ou 'erro'. Com ?limit=, o evento
+    'final' traz só a primeira página e o cursor para /api/resultados.
+    Reconexões com o cabeçalho Last-Event-ID continuam a partir do evento seguinte.
+    """
+    job = gerenciador_jobs.obter(job_id)
+    if not job:
+        return jsonify({"erro": "Job não encontrado ou expirado."}), 404
+    limite, campos, resposta_erro = _ler_parametros_paginacao()
+    if resposta_erro:
+        return resposta_erro
+
+    ultimo_evento_id = request.headers.get('Last-Event-ID', '')
+    proximo_evento = int(ultimo_evento_id) + 1 if ultimo_evento_id.isdigit() else 0
+
+    def gerar_eventos():
+        indice = proximo_evento
+        while True:
+            eventos = job.aguardar_eventos(indice, timeout=INTERVALO_KEEPALIVE_SSE_SEGUNDOS)
+            if not eventos:
+                yield ": keep-alive\n\n"
+                continue
+            for indice_evento, tipo, dados in eventos:
+                if tipo == EVENTO_FINAL:
+                    dados = _paginar_resultado_final(dados, job.id, limite, campos)
+                yield f"id: {indice_evento}\nevent: {tipo}\ndata: {app.json.dumps(dados)}\n\n"
+                indice = indice_evento + 1
+                if tipo in (EVENTO_FINAL, EVENTO_ERRO):
+                    return
+
+    return Response(gerar_eventos(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/resultados', methods=['GET'])
+def api_pagina_resultados():
+    """Página seguinte de um resultado paginado, a partir do `proximo_cursor` da página anterior."""
+    limite, campos, resposta_erro = _ler_parametros_paginacao(limite_obrigatorio=True)
+    if resposta_erro:
+        return resposta_erro
+    try:
+        resultado_id, posicao = decodificar_cursor(request.args.get('cursor', ''))
+    except CursorInvalidoError:
+        return jsonify({"erro": "O parâmetro 'cursor' é obrigatório e deve ser um cursor devolvido pela API."}), 400
+
+    pagina = armazem_resultados.pagina(resultado_id, posicao, limite, campos)
+    if pagina is None:
+        return jsonify({"erro": "Resultado não encontrado ou expirado. Refaça a busca."}), 404
+    return jsonify(pagina)
+
+@app.route('/metrics', methods=['GET'])
+def api_metricas():
+    """Métricas no formato texto do Prometheus (etapas, chamadas ao LLM, limitador, contagem de vagas, extrator por template e cache de parse)."""
+    return Response(registro_metricas.exportar_prometheus(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     print("Iniciando servidor Flask para a API de Vagas Gemini...")
     app.run(debug=True, use_reloader=False, port=5000)
\ No newline at end of file
@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, AsyncIterator
+
+from app.core.config import (
+    GOOGLE_API_KEY,
+    LLM_BACKEND,
+    LLM_GRAVACOES_DIR,
+    LLM_STUB_LATENCIA_SEGUNDOS,
+    LLM_STUB_VARIACAO_LATENCIA_SEGUNDOS,
+    LLM_STUB_TAXA_FALHAS,
+    LLM_STUB_SEMENTE
+)
+
+if TYPE_CHECKING:
+    from google.adk.agents import Agent
+    from google.adk.runners import Runner
+
+BACKEND_ADK = "adk"
+BACKEND_STUB = "stub"
+BACKEND_GRAVAR = "gravar"
+BACKEND_REPLAY = "replay"
+
+USER_ID_PADRAO = "user_default"
+
+class FalhaSimuladaLLMError(RuntimeError):
+    """Falha injetada pelo backend stub para simular erros da API do LLM."""
+
+class RespostaNaoGravadaError(LookupError):
+    """O backend de replay não tem gravação para a chamada recebida."""
+
+_runners_por_agente: dict[tuple[str, str], Runner] = {}
+_runners_lock = threading.Lock()
+_loop_sessoes: asyncio.AbstractEventLoop | None = None
+_loop_sessoes_lock = threading.Lock()
+
+def _obter_loop_sessoes() -> asyncio.AbstractEventLoop:
+    global _loop_sessoes
+    if _loop_sessoes is None:
+        with _loop_sessoes_lock:
+            if _loop_sessoes is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="adk-sessoes", daemon=True).start()
+                _loop_sessoes = loop
+    return _loop_sessoes
+
+async def _aguardar_se_awaitable(resultado):
+    if inspect.isawaitable(resultado):
+        return await resultado
+    return resultado
+
+def _resolver_se_awaitable(resultado):
+    # Versões mais novas do google-adk tornaram os métodos do session service assíncronos.
+    # Um único loop em background evita criar um event loop novo (asyncio.run) a cada chamada.
+    if inspect.isawaitable(resultado):
+        return asyncio.run_coroutine_threadsafe(resultado, _obter_loop_sessoes()).result()
+    return resultado
+
+def _agendar_remocao_sessao(session_service, app_name: str, session_id: str):
+    # A remoção não precisa bloquear o retorno da chamada: com o session service assíncrono,
+    # ela é apenas agendada no loop de sessões.
+    resultado = session_service.delete_session(app_name=app_name, user_id=USER_ID_PADRAO, session_id=session_id)
+    if inspect.isawaitable(resultado):
+        asyncio.run_coroutine_threadsafe(resultado, _obter_loop_sessoes())
+
+def obter_runner(agent: Agent, app_name: str) -> Runner:
+    """
+    Retorna o Runner em cache para (nome do agente, app_name), criando-o na primeira chamada.
+    Agentes com o mesmo nome são considerados equivalentes: o Runner guarda a primeira instância recebida.
+    """
+    chave = (agent.name, app_name)
+    runner = _runners_por_agente.get(chave)
+    if runner is None:
+        with _runners_lock:
+            runner = _runners_por_agente.get(chave)
+            if runner is None:
+                from google.adk.runners import Runner
+                from google.adk.sessions import InMemorySessionService
+
+                runner = Runner(agent=agent, app_name=app_name, session_service=InMemorySessionService())
+                _runners_por_agente[chave] = runner
+    return runner
+
+def limpar_pool_de_runners():
+    with _runners_lock:
+        _runners_por_agente.clear()
+
+def _mensagem_do_usuario(message_text: str):
+    from google.genai import types as genai_types
+    return genai_types.Content(role="user", parts=[genai_types.Part(text=message_text)])
+
+def _acumular_texto_final(texto_acumulado: str, event) -> str:
+    if event.is_final_response() and event.content and event.content.parts:
+        for part in event.content.parts:
+            if part.text is not None:
+                texto_acumulado += part.text
+                if not texto_acumulado.endswith("\n"):
+                     texto_acumulado += " "
+    return texto_acumulado
+
+class BackendLLM:
+    """
+    Interface dos backends usados por `call_agent`, `call_agent_async` e `call_agent_em_partes_async`.
+    `usa_api_real` indica se as chamadas consomem a cota da API (e, portanto, o limitador
+    compartilhado de requisições). Backends sem versão assíncrona própria rodam `responder` em uma
+    thread do pool padrão; sem streaming próprio, `responder_em_partes_async` entrega a resposta inteira de uma vez.
+    """
+    nome = ""
+    usa_api_real = True
+
+    def responder(self, agent: Agent, message_text: str, app_name: str) -> str:
+        raise NotImplementedError
+
+    async def responder_async(self, agent: Agent, message_text: str, app_name: str) -> str:
+        return await asyncio.to_thread(self.responder, agent, message_text, app_name)
+
+    async def responder_em_partes_async(self, agent: Agent, message_text: str, app_name: str) -> AsyncIterator[str]:
+        yield await self.responder_async(agent, message_text, app_name)
+
+    def preaquecer(self):
+        """Carrega antecipadamente as dependências pesadas do backend (usado por `preaquecer_agentes`)."""
+
+class BackendADK(BackendLLM):
+    """Executa o agente de verdade com o Runner do google-adk (Runners reaproveitados, sessão única por chamada)."""
+    nome = BACKEND_ADK
+
+    def __init__(self):
+        if not GOOGLE_API_KEY:
+            raise ValueError("A variável de ambiente GOOGLE_API_KEY não foi configurada. "
+                             "Por favor, crie um arquivo .env e adicione GOOGLE_API_KEY=SUA_CHAVE_AQUI "
+                             f"ou use LLM_BACKEND={BACKEND_STUB} / LLM_BACKEND={BACKEND_REPLAY} para rodar sem a API.")
+
+    def preaquecer(self):
+        import google.adk.runners
+        import google.adk.sessions
+        import google.adk.agents.run_config
+        import google.genai.types
+
+    def responder(self, agent: Agent, message_text: str, app_name: str) -> str:
+        runner = obter_runner(agent, app_name)
+        session_service = runner.session_service
+        session_id = uuid.uuid4().hex
+        _resolver_se_awaitable(session_service.create_session(app_name=app_name, user_id=USER_ID_PADRAO, session_id=session_id))
+
+        content = _mensagem_do_usuario(message_text)
+
+        final_response_text = ""
+        try:
+            for event in runner.run(user_id=USER_ID_PADRAO, session_id=session_id, new_message=content):
+                final_response_text = _acumular_texto_final(final_response_text, event)
+        finally:
+            _agendar_remocao_sessao(session_service, app_name, session_id)
+        return final_response_text.strip()
+
+    async def responder_async(self, agent: Agent, message_text: str, app_name: str) -> str:
+        """Usa `runner.run_async` no event loop atual: nenhuma thread fica presa enquanto o modelo responde."""
+        runner = obter_runner(agent, app_name)
+        session_service = runner.session_service
+        session_id = uuid.uuid4().hex
+        await _aguardar_se_awaitable(session_service.create_session(app_name=app_name, user_id=USER_ID_PADRAO, session_id=session_id))
+
+        content = _mensagem_do_usuario(message_text)
+
+        final_response_text = ""
+        try:
+            async for event in runner.run_async(user_id=USER_ID_PADRAO, session_id=session_id, new_message=content):
+                final_response_text = _acumular_texto_final(final_response_text, event)
+        finally:
+            await _aguardar_se_awaitable(session_service.delete_session(app_name=app_name, user_id=USER_ID_PADRAO, session_id=session_id))
+        return final_response_text.strip()
+
+    async def responder_em_partes_async(self, agent: Agent, message_text: str, app_name: str) -> AsyncIterator[str]:
+        """
+        Streaming por SSE: entrega o texto de cada evento parcial assim que o modelo o gera.
+        O evento final repete o texto completo e só é usado se nenhum parcial tiver chegado.
+        """
+        runner = obter_runner(agent, app_name)
+        session_service = runner.session_service
+        session_id = uuid.uuid4().hex
+        await _aguardar_se_awaitable(session_service.create_session(app_name=app_name, user_id=USER_ID_PADRAO, session_id=session_id))
+
+        content = _mensagem_do_usuario(message_text)
+        from google.adk.agents.run_config import RunConfig, StreamingMode
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+
+        recebeu_parciais = False
+        try:
+            async for event in runner.run_async(user_id=USER_ID_PADRAO, session_id=session_id, new_message=content, run_config=run_config):
+                if event.partial:
+                    for part in (event.content.parts if event.content and event.content.parts else []):
+                        if part.text:
+                            recebeu_parciais = True
+                            yield part.text
+                elif not recebeu_parciais:
+                    texto_final = _acumular_texto_final("", event)
+                    if texto_final:
+                        yield texto_final
+        finally:
+            await _aguardar_se_awaitable(session_service.delete_session(app_name=app_name, user_id=USER_ID_PADRAO, session_id=session_id))
+
+def _hash_chamada(*partes: str) -> str:
+    return hashlib.sha256("\n".join(partes).encode("utf-8")).hexdigest()
+
+class BackendStub(BackendLLM):
+    """
+    Backend local e determinístico: a mesma (agente, mensagem) sempre produz a mesma resposta,
+    a mesma latência simulada e a mesma decisão de falha, independentemente da ordem das chamadas.
+    As respostas seguem o formato que cada agente do projeto devolve (lista de cidades, vagas
+    no template com delimitador ou em array JSON na busca estruturada, JSON de uma vaga ou array JSON do lote).
+    """
+    nome = BACKEND_STUB
+    usa_api_real = False
+
+    NIVEIS = ["Júnior", "Pleno", "Sênior"]
+    EMPRESAS = ["TechNova", "Banco Horizonte", "DataCorp", "Nuvem Sistemas", "Fintech Prisma", "Varejo Brasil"]
+    CIDADES_VIZINHAS = ["Cidade Vizinha A", "Cidade Vizinha B", "Cidade Vizinha C", "Cidade Vizinha D"]
+    REGEX_CAMPO_MENSAGEM = re.compile(r"^\s*([A-Z_]+):\s*(.+)$", re.MULTILINE)
+    REGEX_CAMPO_VAGA = re.compile(r"^[*\-•\s]*(?:\*\*)?([A-Za-zÀ-ÿ ]{3,30}?)\s*:(?:\*\*)?\s*(.+)$")
+    REGEX_MARCADOR_LOTE = re.compile(r"^=== VAGA (\d+) ===$", re.MULTILINE)
+    REGEX_PREFIXO_ORIGEM = re.compile(r"^\s*\(Origem da busca: [^)]*\)\s*")
+    CAMPOS_POR_ROTULO = {
+        "empresa": "empresa", "localização": "localizacao", "local": "localizacao",
+        "descrição": "descricao_resumida", "data de postagem": "data_postagem_original",
+        "link": "link", "salário": "salario",
+    }
+
+    def __init__(self, latencia_segundos: float = LLM_STUB_LATENCIA_SEGUNDOS,
+                 variacao_latencia_segundos: float = LLM_STUB_VARIACAO_LATENCIA_SEGUNDOS,
+                 taxa_falhas: float = LLM_STUB_TAXA_FALHAS, semente: int = LLM_STUB_SEMENTE,
+                 vagas_por_busca: int = 5, tamanho_parte_streaming: int = 64):
+        self.latencia_segundos = latencia_segundos
+        self.variacao_latencia_segundos = variacao_latencia_segundos
+        self.taxa_falhas = taxa_falhas
+        self.semente = semente
+        self.vagas_por_busca = vagas_por_busca
+        self.tamanho_parte_streaming = max(1, tamanho_parte_streaming)
+
+    def _sortear_chamada(self, agent: Agent, message_text: str) -> tuple[random.Random, float]:
+        rng = random.Random(_hash_chamada(str(self.semente), agent.name, message_text))
+        return rng, self.latencia_segundos + rng.uniform(0, self.variacao_latencia_segundos)
+
+    def responder(self, agent: Agent, message_text: str, app_name: str) -> str:
+        rng, latencia = self._sortear_chamada(agent, message_text)
+        if latencia > 0:
+            time.sleep(latencia)
+        return self._gerar_resposta(agent, message_text, rng)
+
+    async def responder_async(self, agent: Agent, message_text: str, app_name: str) -> str:
+        rng, latencia = self._sortear_chamada(agent, message_text)
+        if latencia > 0:
+            await asyncio.sleep(latencia)
+        return self._gerar_resposta(agent, message_text, rng)
+
+    async def responder_em_partes_async(self, agent: Agent, message_text: str, app_name: str) -> AsyncIterator[str]:
+        """Entrega a mesma resposta de `responder` em pedaços de até `tamanho_parte_streaming` caracteres, com a latência distribuída entre eles."""
+        rng, latencia = self._sortear_chamada(agent, message_text)
+        resposta = self._gerar_resposta(agent, message_text, rng)
+        partes = [resposta[i:i + self.tamanho_parte_streaming] for i in range(0, len(resposta), self.tamanho_parte_streaming)] or [""]
+        for parte in partes:
+            if latencia > 0:
+                await asyncio.sleep(latencia / len(partes))
+            yield parte
+
+    def _gerar_resposta(self, agent: Agent, message_text: str, rng: random.Random) -> str:
+        if rng.random() < self.taxa_falhas:
+            raise FalhaSimuladaLLMError(f"Falha simulada do LLM para o agente '{agent.name}'.")
+
+        if agent.name.endswith("_json"):
+            return self._responder_busca_estruturada(message_text, rng)
+        if "identificador_cidades" in agent.name:
+            return ", ".join(rng.sample(self.CIDADES_VIZINHAS, k=3))
+        if "consolidador" in agent.name and "lote" in agent.name:
+            return self._responder_parse_lote(message_text)
+        if "consolidador" in agent.name:
+            return json.dumps(self._parsear_vaga(message_text), ensure_ascii=False)
+        return self._responder_busca(message_text, rng)
+
+    def _gerar_vagas(self, message_text: str, rng: random.Random) -> list[dict]:
+        campos = dict(self.REGEX_CAMPO_MENSAGEM.findall(message_text))
+        cargo = campos.get("CARGO", "Profissional").strip()
+        cidade = (campos.get("CIDADE_PRINCIPAL") or campos.get("CIDADE") or "Remoto").strip()
+        return [
+            {
+                "titulo": f"{cargo} {rng.choice(self.NIVEIS)}",
+                "empresa": rng.choice(self.EMPRESAS),
+                "localizacao": cidade,
+                "descricao_resumida": f"Vaga simulada para {cargo.lower()} com {rng.randint(1, 8)} anos de experiência.",
+                "data_postagem_original": f"há {rng.randint(0, 30)} dias",
+                "link": f"https://vagas.exemplo.com/{rng.randint(10000, 99999)}",
+            }
+            for _ in range(self.vagas_por_busca)
+        ]
+
+    def _responder_busca(self, message_text: str, rng: random.Random) -> str:
+        return "\n\n".join(
+            f"**{vaga['titulo']}**\n"
+            f"*   Empresa: {vaga['empresa']}\n"
+            f"*   Localização: {vaga['localizacao']}\n"
+            f"*   Descrição: {vaga['descricao_resumida']}\n"
+            f"*   Data de Postagem: {vaga['data_postagem_original']}\n"
+            f"*   Link: {vaga['link']}\n"
+            f"---FIM_DA_VAGA---"
+            for vaga in self._gerar_vagas(message_text, rng)
+        )
+
+    def _responder_busca_estruturada(self, message_text: str, rng: random.Random) -> str:
+        return json.dumps(self._gerar_vagas(message_text, rng), ensure_ascii=False)
+
+    def _parsear_vaga(self, texto_vaga: str) -> dict:
+        texto_vaga = self.REGEX_PREFIXO_ORIGEM.sub("", texto_vaga, count=1)
+        linhas = [linha.strip() for linha in texto_vaga.strip().splitlines() if linha.strip()]
+        if not linhas:
+            return {"vaga_valida": False}
+        vaga = {"vaga_valida": True, "titulo": linhas[0].strip("*#0123456789. ")}
+        for linha in linhas[1:]:
+            match_campo = self.REGEX_CAMPO_VAGA.match(linha)
+            campo = self.CAMPOS_POR_ROTULO.get(match_campo.group(1).strip().lower()) if match_campo else None
+            if campo and campo not in vaga:
+                vaga[campo] = match_campo.group(2).strip()
+        if not vaga["titulo"] or not vaga.get("localizacao"):
+            return {"vaga_valida": False}
+        return vaga
+
+    def _responder_parse_lote(self, message_text: str) -> str:
+        partes = self.REGEX_MARCADOR_LOTE.split(message_text)
+        itens = []
+        for i in range(1, len(partes) - 1, 2):
+            itens.append({"indice": int(partes[i]), **self._parsear_vaga(partes[i + 1])})
+        return json.dumps(itens, ensure_ascii=False)
+
+class BackendGravacao(BackendLLM):
+    """
+    Grava em disco (um arquivo JSON por chamada) as respostas reais de outro backend,
+    indexadas por hash de (nome do agente, mensagem), para reprodução posterior com BackendReplay.
+    """
+    nome = BACKEND_GRAVAR
+
+    def __init__(self, backend_real: BackendLLM, diretorio: str = LLM_GRAVACOES_DIR):
+        self.backend_real = backend_real
+        self.diretorio = diretorio
+        self.usa_api_real = backend_real.usa_api_real
+        os.makedirs(diretorio, exist_ok=True)
+
+    def preaquecer(self):
+        self.backend_real.preaquecer()
+
+    def caminho_gravacao(self, agent: Agent, message_text: str) -> str:
+        return os.path.join(self.diretorio, f"{_hash_chamada(agent.name, message_text)}.json")
+
+    def responder(self, agent: Agent, message_text: str, app_name: str) -> str:
+        resposta = self.backend_real.responder(agent, message_text, app_name)
+        self._gravar(agent, message_text, app_name, resposta)
+        return resposta
+
+    async def responder_async(self, agent: Agent, message_text: str, app_name: str) -> str:
+        resposta = await self.backend_real.responder_async(agent, message_text, app_name)
+        self._gravar(agent, message_text, app_name, resposta)
+        return resposta
+
+    async def responder_em_partes_async(self, agent: Agent, message_text: str, app_name: str) -> AsyncIterator[str]:
+        partes = []
+        async for parte in self.backend_real.responder_em_partes_async(agent, message_text, app_name):
+            partes.append(parte)
+            yield parte
+        self._gravar(agent, message_text, app_name, "".join(partes).strip())
+
+    def _gravar(self, agent: Agent, message_text: str, app_name: str, resposta: str):
+        caminho = self.caminho_gravacao(agent, message_text)
+        gravacao = {
+            "agente": agent.name,
+            "app_name": app_name,
+            "mensagem": message_text,
+            "resposta": resposta,
+            "gravado_em": datetime.now().isoformat(timespec="seconds"),
+        }
+        caminho_temporario = f"{caminho}.{uuid.uuid4().hex}.tmp"
+        with open(caminho_temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(gravacao, arquivo, ensure_ascii=False, indent=2)
+        os.replace(caminho_temporario, caminho)
+
+class BackendReplay(BackendLLM):
+    """Reproduz as respostas gravadas por BackendGravacao, sem acessar a API."""
+    nome = BACKEND_REPLAY
+    usa_api_real = False
+
+    def __init__(self, diretorio: str = LLM_GRAVACOES_DIR):
+        self.diretorio = diretorio
+
+    def responder(self, agent: Agent, message_text: str, app_name: str) -> str:
+        caminho = os.path.join(self.diretorio, f"{_hash_chamada(agent.name, message_text)}.json")
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                return json.load(arquivo)["resposta"]
+        except FileNotFoundError:
+            raise RespostaNaoGravadaError(
+                f"Nenhuma resposta gravada para o agente '{agent.name}' com esta mensagem em {self.diretorio}. "
+                f"Grave-a antes com LLM_BACKEND={BACKEND_GRAVAR}."
+            ) from None
+
+    async def responder_async(self, agent: Agent, message_text: str, app_name: str) -> str:
+        # Leitura de um arquivo local pequeno: não compensa passar por uma thread.
+        return self.responder(agent, message_text, app_name)
+
+def criar_backend_llm(nome: str = LLM_BACKEND) -> BackendLLM:
+    if nome == BACKEND_ADK:
+        return BackendADK()
+    if nome == BACKEND_STUB:
+        return BackendStub()
+    if nome == BACKEND_GRAVAR:
+        return BackendGravacao(BackendADK())
+    if nome == BACKEND_REPLAY:
+        return BackendReplay()
+    raise ValueError(f"LLM_BACKEND desconhecido: '{nome}'. Use um de: "
+                     f"{', '.join([BACKEND_ADK, BACKEND_STUB, BACKEND_GRAVAR, BACKEND_REPLAY])}.")
+
+_backend_llm: BackendLLM | None = None
+_backend_llm_lock = threading.Lock()
+
+def obter_backend_llm() -> BackendLLM:
+    """Backend usado por `call_agent`, criado na primeira chamada a partir de LLM_BACKEND."""
+    global _backend_llm
+    if _backend_llm is None:
+        with _backend_llm_lock:
+            if _backend_llm is None:
+                _backend_llm = criar_backend_llm()
+    return _backend_llm
+
+def definir_backend_llm(backend: BackendLLM | None):
+    """Troca o backend usado por `call_agent` (None volta ao configurado em LLM_BACKEND na próxima chamada)."""
+    global _backend_llm
+    with _backend_llm_lock:
+        _backend_llm = backend
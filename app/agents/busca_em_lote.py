@@ -0,0 +1,294 @@
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.core.config import (
+    BUSCA_ESTRUTURADA,
+    BUSCA_LOTE_MAX_COMBINACOES,
+    BUSCA_LOTE_MAX_COMBINACOES_SIMULTANEAS
+)
+from app.core.cache import normalizar_chave
+from app.core.paginacao import projetar_vaga
+from app.core.vaga import Vaga, serializar_para_json
+from app.agents.pesquisador_principal import buscar_vagas_principais_async
+from app.agents.pesquisador_proximidade import (
+    identificar_cidades_proximas_async,
+    criar_agente_buscador_proximidade,
+    criar_agente_buscador_proximidade_estruturado,
+    _buscar_vagas_em_cidade_async,
+    TIMEOUT_BUSCA_POR_CIDADE_SEGUNDOS
+)
+from app.agents.consolidador_formatador import (
+    criar_agente_consolidador,
+    criar_agente_consolidador_lote,
+    split_into_individual_vagas,
+    remover_textos_duplicados,
+    preparar_vagas_estruturadas,
+    parsear_textos_async,
+    filtrar_e_contextualizar_vaga,
+    chave_cache_parse,
+    consolidar_vagas,
+    TAMANHO_LOTE_PARSE
+)
+from datetime import datetime
+from typing import AsyncIterator, Iterator
+import asyncio
+import json
+import queue
+import threading
+import time
+
+ORIGEM_BUSCA_PRINCIPAL = "Busca Principal"
+
+EVENTO_RESULTADO = "resultado"
+EVENTO_ERRO = "erro"
+EVENTO_RESUMO = "resumo"
+
+MAX_EVENTOS_PENDENTES_LOTE = 16
+INTERVALO_ESPERA_CONSUMIDOR_SEGUNDOS = 0.05
+
+def ler_matriz_de_busca(dados: dict, max_combinacoes: int = BUSCA_LOTE_MAX_COMBINACOES) -> tuple[list[str], list[str]]:
+    """
+    Valida {"cargos": [...], "cidades": [...]} e devolve as listas sem repetições (ignorando
+    maiúsculas e acentos). Levanta ValueError com a mensagem para o usuário se a matriz for inválida.
+    """
+    listas = []
+    for campo in ("cargos", "cidades"):
+        valores = dados.get(campo)
+        if not isinstance(valores, list) or not all(isinstance(valor, str) for valor in valores):
+            raise ValueError(f"O campo '{campo}' deve ser uma lista de textos.")
+        unicos = {}
+        for valor in valores:
+            if valor.strip():
+                unicos.setdefault(normalizar_chave(valor), valor.strip())
+        if not unicos:
+            raise ValueError(f"O campo '{campo}' deve ter ao menos um valor.")
+        listas.append(list(unicos.values()))
+    cargos, cidades = listas
+    if len(cargos) * len(cidades) > max_combinacoes:
+        raise ValueError(f"A busca em lote aceita no máximo {max_combinacoes} combinações de cargo e cidade.")
+    return cargos, cidades
+
+class BuscaEmLote:
+    """
+    Busca uma matriz de cargos × cidades compartilhando o trabalho entre as combinações:
+    cada (cargo, cidade) é buscada uma única vez (a mesma resposta serve à cidade como principal
+    e como próxima de outra), as cidades próximas são identificadas uma vez por cidade e cada
+    texto de vaga distinto (pela impressão digital de `chave_cache_parse`) é parseado uma vez.
+    Todas as chamadas passam pelo mesmo limitador de requisições ao LLM.
+    """
+
+    def __init__(self, buscar_proximas: bool, data_atual_cenario: datetime,
+                 tamanho_lote: int = TAMANHO_LOTE_PARSE,
+                 busca_estruturada: bool = BUSCA_ESTRUTURADA,
+                 max_combinacoes_simultaneas: int = BUSCA_LOTE_MAX_COMBINACOES_SIMULTANEAS):
+        self.buscar_proximas = buscar_proximas
+        self.data_atual_cenario = data_atual_cenario
+        self.tamanho_lote = tamanho_lote
+        self.busca_estruturada = busca_estruturada
+        self.max_combinacoes_simultaneas = max(1, max_combinacoes_simultaneas)
+        self._buscas: dict[tuple[str, str], asyncio.Future] = {}
+        self._cidades_proximas: dict[str, asyncio.Future] = {}
+        self._parses: dict[str, asyncio.Future] = {}
+        self.textos_reaproveitados = 0
+
+    def _memorizar(self, tarefas: dict, chave, criar_corrotina) -> asyncio.Future:
+        # shield: uma combinação cancelada não cancela o trabalho que outras combinações aguardam.
+        if chave not in tarefas:
+            tarefas[chave] = asyncio.ensure_future(criar_corrotina())
+        return asyncio.shield(tarefas[chave])
+
+    async def _buscar(self, cargo: str, cidade: str, como_proxima: bool = False) -> str:
+        async def buscar() -> str:
+            if not como_proxima:
+                return await buscar_vagas_principais_async(cargo, cidade, estruturada=self.busca_estruturada)
+            agente = criar_agente_buscador_proximidade_estruturado() if self.busca_estruturada else criar_agente_buscador_proximidade()
+            return await asyncio.wait_for(_buscar_vagas_em_cidade_async(agente, cargo, cidade), TIMEOUT_BUSCA_POR_CIDADE_SEGUNDOS)
+
+        tarefa = self._memorizar(self._buscas, (normalizar_chave(cargo), normalizar_chave(cidade)), buscar)
+        if not como_proxima:
+            return await tarefa
+        try:
+            return await tarefa
+        except Exception as e:
+            print(f"[Lote] Erro ao buscar vagas de '{cargo}' em {cidade}: {e}")
+            return f"Erro ao buscar vagas: {e}"
+
+    async def _respostas_das_cidades_proximas(self, cargo: str, cidade: str) -> list[tuple[str, str]]:
+        cidades = await self._memorizar(self._cidades_proximas, normalizar_chave(cidade), lambda: identificar_cidades_proximas_async(cidade))
+        respostas = await asyncio.gather(*(self._buscar(cargo, cidade_prox, como_proxima=True) for cidade_prox in cidades))
+        return list(zip(cidades, respostas))
+
+    async def _parsear(self, textos_vagas: list[str]) -> list[tuple[str, dict | None]]:
+        """Parseia em lotes só os textos ainda não vistos na matriz; os demais esperam o parse já em andamento."""
+        impressoes = [chave_cache_parse(texto) for texto in textos_vagas]
+        textos_novos = [texto for texto, impressao in zip(textos_vagas, impressoes) if impressao not in self._parses]
+        self.textos_reaproveitados += len(textos_vagas) - len(textos_novos)
+
+        if textos_novos:
+            async def parsear_novos() -> dict[str, dict | None]:
+                resultados = await parsear_textos_async(
+                    textos_novos, criar_agente_consolidador(),
+                    criar_agente_consolidador_lote() if self.tamanho_lote > 1 else None, self.tamanho_lote
+                )
+                return {chave_cache_parse(texto): vaga_parseada for texto, vaga_parseada in resultados}
+
+            tarefa = asyncio.ensure_future(parsear_novos())
+            for texto in textos_novos:
+                self._parses[chave_cache_parse(texto)] = tarefa
+
+        resultados = []
+        for texto, impressao in zip(textos_vagas, impressoes):
+            vagas_por_impressao = await asyncio.shield(self._parses[impressao])
+            resultados.append((texto, vagas_por_impressao[impressao]))
+        return resultados
+
+    async def buscar_combinacao(self, cargo: str, cidade: str) -> list[Vaga]:
+        """Mesmo resultado de `executar_busca_async` para (cargo, cidade), reaproveitando o trabalho das outras combinações."""
+        async def sem_proximas() -> list[tuple[str, str]]:
+            return []
+
+        resposta_principal, respostas_proximas = await asyncio.gather(
+            self._buscar(cargo, cidade),
+            self._respostas_das_cidades_proximas(cargo, cidade) if self.buscar_proximas else sem_proximas()
+        )
+
+        resultados_parse = []
+        textos_vagas = []
+        for origem, resposta_bruta in [(ORIGEM_BUSCA_PRINCIPAL, resposta_principal)] + respostas_proximas:
+            vagas_estruturadas = preparar_vagas_estruturadas(resposta_bruta, origem)
+            if vagas_estruturadas is not None:
+                resultados_parse.extend(vagas_estruturadas)
+            else:
+                textos_vagas.extend(split_into_individual_vagas(resposta_bruta, origem))
+        resultados_parse.extend(await self._parsear(remover_textos_duplicados(textos_vagas)))
+
+        vagas_aceitas = []
+        for texto_vaga, vaga_parseada in resultados_parse:
+            if vaga_parseada:
+                vaga_filtrada = filtrar_e_contextualizar_vaga(vaga_parseada, texto_vaga, self.data_atual_cenario)
+                if vaga_filtrada:
+                    vagas_aceitas.append(vaga_filtrada)
+        return consolidar_vagas(vagas_aceitas, self.data_atual_cenario)
+
+    async def executar(self, cargos: list[str], cidades: list[str]) -> AsyncIterator[dict]:
+        """
+        Gera um evento por combinação, na ordem em que terminam ("resultado" com as vagas ou "erro"),
+        e por fim um "resumo" com o trabalho feito e as vagas únicas da matriz inteira.
+        """
+        inicio = time.perf_counter()
+
+        async def executar_combinacao(cargo: str, cidade: str) -> tuple[str, str, list[Vaga] | None, Exception | None]:
+            try:
+                return cargo, cidade, await self.buscar_combinacao(cargo, cidade), None
+            except Exception as e:
+                return cargo, cidade, None, e
+
+        # Uma combinação só começa quando outra termina: se quem consome os eventos parar de ler,
+        # no máximo `max_combinacoes_simultaneas` combinações seguem em andamento.
+        combinacoes = [(cargo, cidade) for cargo in cargos for cidade in cidades]
+        pendentes = iter(combinacoes)
+        em_andamento = set()
+
+        def iniciar_proximas():
+            for cargo, cidade in pendentes:
+                em_andamento.add(asyncio.ensure_future(executar_combinacao(cargo, cidade)))
+                if len(em_andamento) >= self.max_combinacoes_simultaneas:
+                    return
+
+        todas_as_vagas = []
+        total_erros = 0
+        iniciar_proximas()
+        try:
+            while em_andamento:
+                concluidas, em_andamento = await asyncio.wait(em_andamento, return_when=asyncio.FIRST_COMPLETED)
+                iniciar_proximas()
+                for tarefa in concluidas:
+                    cargo, cidade, vagas, erro = tarefa.result()
+                    if erro is not None:
+                        total_erros += 1
+                        print(f"[Lote] Erro em '{cargo}' / {cidade}: {erro}")
+                        yield {"tipo": EVENTO_ERRO, "cargo": cargo, "cidade": cidade, "erro": str(erro)}
+                        continue
+                    todas_as_vagas.extend(vagas)
+                    yield {
+                        "tipo": EVENTO_RESULTADO, "cargo": cargo, "cidade": cidade,
+                        "total_vagas": len(vagas), "vagas": [projetar_vaga(vaga) for vaga in vagas]
+                    }
+        finally:
+            for tarefa in em_andamento:
+                tarefa.cancel()
+
+        yield {
+            "tipo": EVENTO_RESUMO,
+            "combinacoes": len(combinacoes),
+            "erros": total_erros,
+            "buscas_ao_vivo": len(self._buscas),
+            "cidades_identificadas": len(self._cidades_proximas),
+            "textos_parseados": len(self._parses),
+            "textos_reaproveitados": self.textos_reaproveitados,
+            "vagas_unicas": len(consolidar_vagas(todas_as_vagas, self.data_atual_cenario)),
+            "duracao_segundos": round(time.perf_counter() - inicio, 3)
+        }
+
+def iterar_busca_em_lote(cargos: list[str], cidades: list[str], buscar_proximas: bool, data_atual_cenario: datetime, **opcoes) -> Iterator[dict]:
+    """
+    Versão síncrona de `BuscaEmLote.executar`: roda a matriz em um event loop em uma thread
+    própria e entrega cada evento assim que ele fica pronto. Até MAX_EVENTOS_PENDENTES_LOTE
+    eventos esperam por quem consome; fechar o gerador (ex.: o cliente do NDJSON desconectou)
+    cancela a busca, e nenhuma nova chamada ao LLM é feita.
+    """
+    fila: queue.Queue = queue.Queue(maxsize=MAX_EVENTOS_PENDENTES_LOTE)
+    fim = object()
+    parar = threading.Event()
+    execucao = {}
+
+    async def entregar(item):
+        # Sem bloquear o event loop: com a fila cheia, a busca espera (e continua cancelável).
+        while True:
+            try:
+                fila.put_nowait(item)
+                return
+            except queue.Full:
+                await asyncio.sleep(INTERVALO_ESPERA_CONSUMIDOR_SEGUNDOS)
+
+    async def produzir():
+        execucao["loop"], execucao["tarefa"] = asyncio.get_running_loop(), asyncio.current_task()
+        if parar.is_set():
+            return
+        try:
+            async for evento in BuscaEmLote(buscar_proximas, data_atual_cenario, **opcoes).executar(cargos, cidades):
+                await entregar(evento)
+        except Exception as e:
+            await entregar(e)
+        await entregar(fim)
+
+    def rodar():
+        try:
+            asyncio.run(produzir())
+        except asyncio.CancelledError:
+            print("[Lote] Busca em lote cancelada: quem consumia os eventos parou de ler.")
+
+    produtor = threading.Thread(target=rodar, name="busca-em-lote", daemon=True)
+    produtor.start()
+    try:
+        while True:
+            item = fila.get()
+            if item is fim:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        parar.set()
+        if "tarefa" in execucao:
+            try:
+                execucao["loop"].call_soon_threadsafe(execucao["tarefa"].cancel)
+            except RuntimeError:
+                pass  # O event loop já terminou.
+        produtor.join()
+
+def evento_para_ndjson(evento: dict) -> str:
+    return json.dumps(evento, ensure_ascii=False, default=serializar_para_json) + "\n"
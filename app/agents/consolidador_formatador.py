@@ -1,23 +1,98 @@
+from __future__ import annotations
+
 import sys
 import os
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from google.adk.agents import Agent
-from app.core.config import DEFAULT_MODEL_ID, GOOGLE_API_KEY
-from app.agents.utils import call_agent
-from datetime import datetime, timedelta
+from app.core.config import (
+    DEFAULT_MODEL_ID,
+    LLM_CONFIGURADO,
+    CACHE_DIR,
+    CACHE_PARSE_MAX_ENTRADAS_MEMORIA,
+    CACHE_PARSE_SQLITE,
+    CACHE_PARSE_MAX_ENTRADAS_SQLITE,
+    MAX_PARSES_SIMULTANEOS
+)
+from app.core.cache import CacheEmCamadas, CacheMemoria, CacheSQLite
+from app.core.metricas import VAGAS_PROCESSADAS, DetalhamentoDeTempos, medir_etapa, registro_metricas
+from app.core.deduplicacao import (
+    DetectorDeDuplicatas,
+    criar_detector_de_textos_duplicados,
+    canonicalizar_url,
+    shingles_de_palavras,
+    empresas_compativeis,
+    senioridades_compativeis
+)
+from app.core.vaga import Vaga
+from app.agents.utils import call_agent, call_agent_async
+from app.agents.registro_agentes import agente_registrado
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+import asyncio
+import hashlib
 import json
 import re
-import time 
+import threading
+
+if TYPE_CHECKING:
+    from google.adk.agents import Agent
 
 AGENT_NAME = "consolidador_formatador_vagas"
 VAGAS_POR_PAGINA = 3
 LIMITE_ANTIGUIDADE_VAGA_DIAS = 90 
 DELIMITADOR_FIM_VAGA = "---FIM_DA_VAGA---"
+AGENT_NAME_LOTE = "consolidador_formatador_vagas_lote"
+TAMANHO_LOTE_PARSE = 5
+MARCADOR_INICIO_VAGA_LOTE = "=== VAGA"
+MAX_PARSES_SIMULTANEOS_ASYNC = 64
+REGEX_PREFIXO_ORIGEM_BUSCA = re.compile(r"^\s*\(Origem da busca: [^)]*\)\s*")
+REGEX_RODAPE_OBSERVACOES = re.compile(r'\n\s*(Observaç(ão|ões)|OBS\.:|Nota:|Recomendo verificar|Além dessas)\s*:')
+VAGA_REJEITADA_NO_CACHE = {"vaga_valida": False}
+TAMANHO_MAXIMO_DESCRICAO_RESUMIDA = 150
+
+REGEX_TITULO_TEMPLATE = re.compile(r"^(?:#{1,4}\s*)?(?:\d+\.\s*)?\*\*(?P<titulo>[^*\n]{3,}?)\*\*:?$")
+REGEX_CAMPO_TEMPLATE = re.compile(r"^(?:[*\-•]\s+)?(?:\*\*)?(?P<rotulo>[A-Za-zÀ-ÿ ]{3,30}?)\s*:(?:\*\*)?\s*(?P<valor>.*)$")
+REGEX_LINK_MARKDOWN = re.compile(r"\[[^\]]*\]\((?P<url>[^)]+)\)")
+CAMPOS_POR_ROTULO_TEMPLATE = {
+    "empresa": "empresa",
+    "localização": "localizacao", "localizacao": "localizacao", "local": "localizacao", "localidade": "localizacao",
+    "descrição": "descricao_resumida", "descricao": "descricao_resumida", "resumo": "descricao_resumida",
+    "data de postagem": "data_postagem_original", "data de publicação": "data_postagem_original",
+    "data": "data_postagem_original", "publicada em": "data_postagem_original",
+    "link": "link", "url": "link",
+    "salário": "salario", "salario": "salario", "remuneração": "salario", "faixa salarial": "salario",
+}
+
+CAMPOS_VAGA_ESTRUTURADA = ("titulo", "empresa", "localizacao", "data_postagem_original", "descricao_resumida", "link", "salario")
+REGEX_INICIO_ARRAY_JSON = re.compile(r"^\s*(?:```(?:json)?\s*)?\[")
+INSTRUCAO_SAIDA_JSON_VAGAS = """
+        FORMATO DA RESPOSTA: responda APENAS com um array JSON, sem texto antes ou depois e sem markdown.
+        Cada elemento do array é um objeto com os campos:
+        - "titulo" (string, obrigatório, o mais específico possível)
+        - "empresa" (string, ou "Não informado")
+        - "localizacao" (string, cidade e estado se possível, obrigatório)
+        - "data_postagem_original" (string, a data como encontrada, ex: "há 2 dias", "25/03/2024", ou "Não informado")
+        - "descricao_resumida" (string, principais requisitos, máximo 150 caracteres)
+        - "link" (string, ou "Não informado")
+        - "salario" (string, omita se não houver)
+        Se não encontrar vagas, responda com [].
+        Exemplo: [{"titulo": "Desenvolvedor Python Pleno", "empresa": "Empresa Exemplo", "localizacao": "Campinas, SP", "data_postagem_original": "há 2 dias", "descricao_resumida": "Django, APIs REST e PostgreSQL.", "link": "https://exemplo.com/vaga"}]
+        """
+
+_metricas_extrator_rapido = {"tentativas": 0, "acertos": 0}
+_metricas_extrator_rapido_lock = threading.Lock()
 
+_cache_parse: CacheEmCamadas | None = None
+_cache_parse_lock = threading.Lock()
+
+@agente_registrado
 def criar_agente_consolidador() -> Agent:
+    from google.adk.agents import Agent
+
     consolidador = Agent(
         name=AGENT_NAME,
         model=DEFAULT_MODEL_ID,
@@ -40,104 +115,476 @@ def criar_agente_consolidador() -> Agent:
     )
     return consolidador
 
-def parsear_vaga_individual(texto_vaga: str, agente_parser: Agent) -> dict | None:
-    if not texto_vaga or not texto_vaga.strip() or len(texto_vaga.strip()) < 20:
+@agente_registrado
+def criar_agente_consolidador_lote() -> Agent:
+    from google.adk.agents import Agent
+
+    consolidador_lote = Agent(
+        name=AGENT_NAME_LOTE,
+        model=DEFAULT_MODEL_ID,
+        instruction=f"""
+        Você é um especialista em processamento de dados de vagas de emprego.
+        Você receberá VÁRIAS descrições textuais de vagas de emprego. Cada descrição começa com uma linha
+        no formato '{MARCADOR_INICIO_VAGA_LOTE} <indice> ===' (ex: '{MARCADOR_INICIO_VAGA_LOTE} 0 ===').
+        Para CADA descrição, extraia as seguintes informações:
+        - "indice" (inteiro, obrigatório, exatamente o número que aparece no marcador da vaga)
+        - "titulo" (string, obrigatório, seja o mais específico possível com o título da vaga)
+        - "empresa" (string, se disponível, senão "Não informado")
+        - "localizacao" (string, cidade e estado se possível, obrigatório)
+        - "data_postagem_original" (string, a data como encontrada no texto, se disponível, ex: "há 2 dias", "25/03/2024", "Publicada hoje")
+        - "descricao_resumida" (string, um breve resumo da vaga ou principais requisitos, máximo 150 caracteres, foque nos aspectos chave)
+        - "link" (string, se disponível)
+        - "salario" (string, se disponível)
+
+        Se uma informação não estiver claramente presente, use "Não informado" ou omita o campo (exceto indice, título e localização).
+        Se uma descrição não parecer ser uma vaga de emprego válida e completa, retorne para ela apenas {{"indice": <indice>, "vaga_valida": false}}.
+        Caso contrário, inclua "vaga_valida": true e os campos extraídos.
+
+        Sua resposta DEVE SER APENAS um array JSON com exatamente um objeto por descrição recebida, sem nenhum texto adicional.
+        Não misture informações de descrições diferentes.
+        """,
+        description="Agente que parseia várias descrições de vagas de emprego em uma única chamada."
+    )
+    return consolidador_lote
+
+def obter_cache_parse() -> CacheEmCamadas:
+    global _cache_parse
+    if _cache_parse is None:
+        with _cache_parse_lock:
+            if _cache_parse is None:
+                disco = None
+                if CACHE_PARSE_SQLITE:
+                    disco = CacheSQLite(os.path.join(CACHE_DIR, "parse_vagas.sqlite3"), max_entradas=CACHE_PARSE_MAX_ENTRADAS_SQLITE)
+                _cache_parse = CacheEmCamadas(CacheMemoria(max_entradas=CACHE_PARSE_MAX_ENTRADAS_MEMORIA), disco)
+    return _cache_parse
+
+def obter_estatisticas_cache_parse() -> dict:
+    return obter_cache_parse().estatisticas()
+
+def _coletar_consultas_cache_parse() -> dict[tuple, float]:
+    estatisticas = obter_estatisticas_cache_parse()
+    return {
+        ("acerto_memoria",): estatisticas["acertos_memoria"],
+        ("acerto_disco",): estatisticas["acertos_disco"],
+        ("falha",): estatisticas["falhas"],
+    }
+
+registro_metricas.coletada(
+    "buscador_vagas_cache_parse_consultas_total",
+    "Consultas ao cache de parse de vagas, por resultado (acerto_memoria, acerto_disco ou falha).",
+    "counter",
+    _coletar_consultas_cache_parse,
+    ("resultado",)
+)
+registro_metricas.coletada(
+    "buscador_vagas_cache_parse_taxa_acerto",
+    "Fração das consultas ao cache de parse de vagas que foram acertos.",
+    "gauge",
+    lambda: {(): obter_estatisticas_cache_parse()["taxa_acerto"]}
+)
+registro_metricas.coletada(
+    "buscador_vagas_cache_parse_entradas",
+    "Entradas no cache de parse de vagas, por camada (memoria ou disco).",
+    "gauge",
+    lambda: {(camada,): obter_estatisticas_cache_parse()[f"entradas_{camada}"] for camada in ("memoria", "disco")},
+    ("camada",)
+)
+
+def chave_cache_parse(texto_vaga: str) -> str:
+    """Hash do texto da vaga normalizado, ignorando o prefixo '(Origem da busca: ...)' adicionado no split."""
+    texto_sem_origem = REGEX_PREFIXO_ORIGEM_BUSCA.sub("", texto_vaga or "", count=1)
+    texto_normalizado = " ".join(texto_sem_origem.lower().split())
+    return hashlib.sha256(texto_normalizado.encode("utf-8")).hexdigest()
+
+def _consultar_cache_parse(texto_vaga: str) -> tuple[bool, dict | None]:
+    dados_em_cache = obter_cache_parse().obter(chave_cache_parse(texto_vaga))
+    if dados_em_cache is None:
+        return False, None
+    if not _vaga_parseada_e_valida(dados_em_cache):
+        return True, None
+    return True, dict(dados_em_cache)
+
+def _registrar_no_cache_parse(texto_vaga: str, dados_vaga: dict | None):
+    obter_cache_parse().definir(chave_cache_parse(texto_vaga), dict(dados_vaga) if dados_vaga else VAGA_REJEITADA_NO_CACHE)
+
+def _limpar_valor_template(valor: str) -> str:
+    valor = valor.strip().strip("*").strip()
+    match_link = REGEX_LINK_MARKDOWN.search(valor)
+    if match_link:
+        valor = match_link.group("url").strip()
+    return valor.strip("<>").strip()
+
+def extrair_vaga_por_template(texto_vaga: str) -> dict | None:
+    """
+    Extrai a vaga sem LLM quando o texto segue o template pedido aos agentes de busca
+    (título em negrito seguido de campos 'Empresa:', 'Localização:', 'Descrição:',
+    'Data de Postagem:' e 'Link:'). Retorna None se qualquer linha fugir do template
+    ou se faltar título, empresa ou localização; nesses casos o parse vai para o LLM.
+    """
+    texto_sem_origem = REGEX_PREFIXO_ORIGEM_BUSCA.sub("", texto_vaga or "", count=1)
+    linhas = [linha.strip() for linha in texto_sem_origem.strip().splitlines() if linha.strip()]
+    if len(linhas) < 3:
         return None
-    
+
+    match_titulo = REGEX_TITULO_TEMPLATE.match(linhas[0])
+    if not match_titulo:
+        return None
+
+    dados_vaga = {"vaga_valida": True, "titulo": match_titulo.group("titulo").strip()}
+    ultimo_campo = None
+    for linha in linhas[1:]:
+        match_campo = REGEX_CAMPO_TEMPLATE.match(linha)
+        campo = CAMPOS_POR_ROTULO_TEMPLATE.get(match_campo.group("rotulo").strip().lower()) if match_campo else None
+        if campo:
+            if campo in dados_vaga:
+                return None
+            dados_vaga[campo] = _limpar_valor_template(match_campo.group("valor"))
+            ultimo_campo = campo
+        elif ultimo_campo == "descricao_resumida" and not linha.startswith(("*", "-", "•")):
+            dados_vaga[ultimo_campo] += " " + linha
+        else:
+            return None
+
+    if not dados_vaga.get("empresa") or not _vaga_parseada_e_valida(dados_vaga):
+        return None
+    return _completar_campos_da_vaga(dados_vaga)
+
+def _completar_campos_da_vaga(dados_vaga: dict) -> dict:
+    descricao = dados_vaga.get("descricao_resumida")
+    if descricao and len(descricao) > TAMANHO_MAXIMO_DESCRICAO_RESUMIDA:
+        dados_vaga["descricao_resumida"] = descricao[:TAMANHO_MAXIMO_DESCRICAO_RESUMIDA - 3].rsplit(" ", 1)[0] + "..."
+    for campo in ("descricao_resumida", "data_postagem_original", "link"):
+        if not dados_vaga.get(campo):
+            dados_vaga[campo] = "Não informado"
+    if "salario" in dados_vaga and not dados_vaga["salario"]:
+        del dados_vaga["salario"]
+    return dados_vaga
+
+def obter_metricas_extrator_rapido() -> dict:
+    with _metricas_extrator_rapido_lock:
+        tentativas = _metricas_extrator_rapido["tentativas"]
+        acertos = _metricas_extrator_rapido["acertos"]
+    return {"tentativas": tentativas, "acertos": acertos, "taxa_acerto": (acertos / tentativas) if tentativas else 0.0}
+
+registro_metricas.coletada(
+    "buscador_vagas_extrator_template_total",
+    "Textos de vaga passados pelo extrator por template, por resultado (tentativa ou acerto).",
+    "counter",
+    lambda: {(resultado,): valor for resultado, valor in obter_metricas_extrator_rapido().items() if resultado != "taxa_acerto"},
+    ("resultado",)
+)
+registro_metricas.coletada(
+    "buscador_vagas_extrator_template_taxa_acerto",
+    "Fração dos textos de vaga extraídos pelo template, sem LLM.",
+    "gauge",
+    lambda: {(): obter_metricas_extrator_rapido()["taxa_acerto"]}
+)
+
+def _resolver_sem_llm(texto_vaga: str) -> tuple[bool, dict | None]:
+    dados_vaga = extrair_vaga_por_template(texto_vaga)
+    with _metricas_extrator_rapido_lock:
+        _metricas_extrator_rapido["tentativas"] += 1
+        if dados_vaga:
+            _metricas_extrator_rapido["acertos"] += 1
+    if dados_vaga:
+        return True, dados_vaga
+    return _consultar_cache_parse(texto_vaga)
+
+def _extrair_json_da_resposta(resposta_str: str):
+    json_str_to_parse = resposta_str
+    if "```json" in resposta_str:
+        json_str_to_parse = resposta_str.split("```json")[1].split("```")[0].strip()
+    elif "```" in resposta_str:
+         json_str_to_parse = resposta_str.split("```")[1].strip()
+    return json.loads(json_str_to_parse)
+
+def _vaga_parseada_e_valida(dados_vaga: dict) -> bool:
+    if not dados_vaga.get("vaga_valida", True):
+        return False
+    if not dados_vaga.get("titulo") or dados_vaga.get("titulo", "não informado").lower() == "não informado" or \
+       not dados_vaga.get("localizacao") or dados_vaga.get("localizacao", "não informado").lower() == "não informado":
+        return False
+    return True
+
+def _resolver_antes_do_llm(texto_vaga: str) -> tuple[bool, dict | None]:
+    """Textos curtos demais são descartados; os demais passam pelo extrator por template e pelo cache de parse."""
+    if not texto_vaga or not texto_vaga.strip() or len(texto_vaga.strip()) < 20:
+        return True, None
+    return _resolver_sem_llm(texto_vaga)
+
+def parsear_vaga_individual(texto_vaga: str, agente_parser: Agent) -> dict | None:
+    resolvida_sem_llm, dados_vaga = _resolver_antes_do_llm(texto_vaga)
+    if resolvida_sem_llm:
+        return dados_vaga
+    return _parsear_vaga_com_llm(texto_vaga, agente_parser)
+
+async def parsear_vaga_individual_async(texto_vaga: str, agente_parser: Agent) -> dict | None:
+    resolvida_sem_llm, dados_vaga = _resolver_antes_do_llm(texto_vaga)
+    if resolvida_sem_llm:
+        return dados_vaga
+    return await _parsear_vaga_com_llm_async(texto_vaga, agente_parser)
+
+def _parsear_vaga_com_llm(texto_vaga: str, agente_parser: Agent) -> dict | None:
     resposta_parser_str = call_agent(agent=agente_parser, message_text=texto_vaga, app_name=f"{AGENT_NAME}_parser_individual")
-    
+    return _interpretar_resposta_parse(texto_vaga, resposta_parser_str)
+
+async def _parsear_vaga_com_llm_async(texto_vaga: str, agente_parser: Agent) -> dict | None:
+    resposta_parser_str = await call_agent_async(agent=agente_parser, message_text=texto_vaga, app_name=f"{AGENT_NAME}_parser_individual")
+    return _interpretar_resposta_parse(texto_vaga, resposta_parser_str)
+
+def _interpretar_resposta_parse(texto_vaga: str, resposta_parser_str: str) -> dict | None:
     if not resposta_parser_str or not resposta_parser_str.strip():
-        time.sleep(0.2) 
         return None
 
     try:
-        json_str_to_parse = resposta_parser_str
-        if "```json" in resposta_parser_str:
-            json_str_to_parse = resposta_parser_str.split("```json")[1].split("```")[0].strip()
-        elif "```" in resposta_parser_str:
-             json_str_to_parse = resposta_parser_str.split("```")[1].strip()
-
-        dados_vaga = json.loads(json_str_to_parse)
+        dados_vaga = _extrair_json_da_resposta(resposta_parser_str)
         
-        if not dados_vaga.get("vaga_valida", True): 
-            time.sleep(0.2)
+        if not isinstance(dados_vaga, dict):
             return None
-        if not dados_vaga.get("titulo") or dados_vaga.get("titulo", "não informado").lower() == "não informado" or \
-           not dados_vaga.get("localizacao") or dados_vaga.get("localizacao", "não informado").lower() == "não informado":
-            time.sleep(0.2)
+        if not _vaga_parseada_e_valida(dados_vaga):
+            _registrar_no_cache_parse(texto_vaga, None)
             return None
 
-        time.sleep(4.1) 
+        _registrar_no_cache_parse(texto_vaga, dados_vaga)
         return dados_vaga
             
     except json.JSONDecodeError:
-        time.sleep(0.2)
         return None
     except Exception:
-        time.sleep(0.2)
-        return None
-
-def normalizar_data(data_str: str | None, data_atual_cenario: datetime) -> datetime | None:
-    if not data_str or data_str.lower() in ["não informado", "n/a", ""]:
         return None
 
-    original_data_str = data_str 
-    data_str_proc = data_str.lower()
-    data_str_proc = data_str_proc.replace("data de publicação:", "").replace("publicada em:", "").replace("atualizada em:", "").strip()
-    data_str_proc = data_str_proc.split('(')[0].strip() 
+def _preparar_lote(textos_vagas: list[str]) -> tuple[list[dict | None], list[int], str]:
+    """Resolve o que dá sem LLM e monta a mensagem do lote com o restante: (resultados, índices pendentes, mensagem)."""
+    resultados: list[dict | None] = [None] * len(textos_vagas)
+    indices_validos = []
+    for i, texto in enumerate(textos_vagas):
+        resolvida_sem_llm, dados_vaga = _resolver_antes_do_llm(texto)
+        if resolvida_sem_llm:
+            resultados[i] = dados_vaga
+        else:
+            indices_validos.append(i)
+    mensagem_lote = "\n\n".join(
+        f"{MARCADOR_INICIO_VAGA_LOTE} {i} ===\n{textos_vagas[i].strip()}" for i in indices_validos
+    )
+    return resultados, indices_validos, mensagem_lote
 
-    parsed_date = None
-    meses_pt = {
-        'janeiro': 'January', 'fevereiro': 'February', 'março': 'March', 'abril': 'April',
-        'maio': 'May', 'junho': 'June', 'julho': 'July', 'agosto': 'August',
-        'setembro': 'September', 'outubro': 'October', 'novembro': 'November', 'dezembro': 'December'
-    }
-    for mes_pt_key, mes_en_val in meses_pt.items():
-        data_str_proc = data_str_proc.replace(mes_pt_key, mes_en_val)
+def _aplicar_resposta_lote(textos_vagas: list[str], resultados: list[dict | None], indices_validos: list[int], resposta_lote_str: str) -> list[int]:
+    """Preenche `resultados` com os itens da resposta do lote e retorna os índices que precisam de parse individual."""
+    itens_por_indice = {}
+    try:
+        if resposta_lote_str and resposta_lote_str.strip():
+            dados_lote = _extrair_json_da_resposta(resposta_lote_str)
+            if isinstance(dados_lote, dict):
+                dados_lote = [dados_lote]
+            if isinstance(dados_lote, list):
+                for item in dados_lote:
+                    if not isinstance(item, dict):
+                        continue
+                    try:
+                        indice_item = int(item.get("indice"))
+                    except (TypeError, ValueError):
+                        continue
+                    itens_por_indice.setdefault(indice_item, item)
+    except json.JSONDecodeError:
+        itens_por_indice = {}
+    except Exception:
+        itens_por_indice = {}
 
-    formatos_data = ["%d/%m/%Y", "%d/%m/%y", "%d de %B de %Y", "%d %B %Y"]
-    for fmt in formatos_data:
+    indices_para_fallback = []
+    for i in indices_validos:
+        item = itens_por_indice.get(i)
+        if item is None:
+            indices_para_fallback.append(i)
+            continue
+        item.pop("indice", None)
+        resultados[i] = item if _vaga_parseada_e_valida(item) else None
+        _registrar_no_cache_parse(textos_vagas[i], resultados[i])
+
+    if indices_para_fallback:
+        print(f"Agente {AGENT_NAME}: {len(indices_para_fallback)} de {len(indices_validos)} vagas do lote sem resposta válida. Parseando individualmente...")
+    return indices_para_fallback
+
+def parsear_vagas_em_lote(textos_vagas: list[str], agente_parser_lote: Agent, agente_parser: Agent) -> list[dict | None]:
+    resultados, indices_validos, mensagem_lote = _preparar_lote(textos_vagas)
+    if not indices_validos:
+        return resultados
+
+    resposta_lote_str = call_agent(agent=agente_parser_lote, message_text=mensagem_lote, app_name=f"{AGENT_NAME}_parser_lote")
+    for i in _aplicar_resposta_lote(textos_vagas, resultados, indices_validos, resposta_lote_str):
+        resultados[i] = _parsear_vaga_com_llm(textos_vagas[i], agente_parser)
+    return resultados
+
+async def parsear_vagas_em_lote_async(textos_vagas: list[str], agente_parser_lote: Agent, agente_parser: Agent) -> list[dict | None]:
+    resultados, indices_validos, mensagem_lote = _preparar_lote(textos_vagas)
+    if not indices_validos:
+        return resultados
+
+    resposta_lote_str = await call_agent_async(agent=agente_parser_lote, message_text=mensagem_lote, app_name=f"{AGENT_NAME}_parser_lote")
+    indices_para_fallback = _aplicar_resposta_lote(textos_vagas, resultados, indices_validos, resposta_lote_str)
+    vagas_fallback = await asyncio.gather(*(_parsear_vaga_com_llm_async(textos_vagas[i], agente_parser) for i in indices_para_fallback))
+    for i, vaga in zip(indices_para_fallback, vagas_fallback):
+        resultados[i] = vaga
+    return resultados
+
+def _validar_vaga_estruturada(item) -> dict | None:
+    if not isinstance(item, dict) or item.get("vaga_valida") is False:
+        return None
+    dados_vaga = {"vaga_valida": True}
+    for campo in CAMPOS_VAGA_ESTRUTURADA:
+        valor = item.get(campo)
+        if isinstance(valor, (str, int, float)) and not isinstance(valor, bool):
+            dados_vaga[campo] = str(valor).strip()
+    if not _vaga_parseada_e_valida(dados_vaga):
+        return None
+    if not dados_vaga.get("empresa"):
+        dados_vaga["empresa"] = "Não informado"
+    return _completar_campos_da_vaga(dados_vaga)
+
+def _recuperar_objetos_json(texto: str) -> list[dict]:
+    """Recupera os objetos JSON completos de um array malformado (truncado, vírgulas sobrando, texto no meio)."""
+    decodificador = json.JSONDecoder()
+    objetos = []
+    posicao = texto.find("{")
+    while posicao != -1:
         try:
-            temp_date = datetime.strptime(data_str_proc, fmt)
-            
-            parsed_date = temp_date
-            return parsed_date
-        except ValueError:
+            objeto, fim = decodificador.raw_decode(texto, posicao)
+        except json.JSONDecodeError:
+            posicao = texto.find("{", posicao + 1)
             continue
-    
+        if isinstance(objeto, dict):
+            objetos.append(objeto)
+        posicao = texto.find("{", fim)
+    return objetos
+
+def extrair_vagas_estruturadas(resposta_bruta: str | None) -> list[dict] | None:
+    """
+    Lê a resposta de um agente de busca no modo estruturado (array JSON no esquema do consolidador).
+    Retorna None se a resposta não for um array JSON, para que o chamador use o split e o parse por vaga.
+    Em arrays malformados, aproveita os objetos completos; itens fora do esquema são descartados.
+    """
+    if not resposta_bruta or not REGEX_INICIO_ARRAY_JSON.match(resposta_bruta):
+        return None
     try:
-        if "hoje" in data_str_proc:
-            return data_atual_cenario.replace(hour=0, minute=0, second=0, microsecond=0)
-        if "ontem" in data_str_proc:
-            return (data_atual_cenario - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        match_dias = re.search(r"há (\d+) dia(s)?", data_str_proc)
-        if match_dias:
-            return (data_atual_cenario - timedelta(days=int(match_dias.group(1)))).replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        match_semanas = re.search(r"há (\d+) semana(s)?", data_str_proc)
-        if match_semanas:
-            return (data_atual_cenario - timedelta(weeks=int(match_semanas.group(1)))).replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        match_horas = re.search(r"há (\d+) hora(s)?", data_str_proc)
-        if match_horas:
-            return data_atual_cenario.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        match_dia_mes = re.match(r"(\d{1,2})/(\d{1,2})", data_str_proc) 
-        if match_dia_mes:
-            dia, mes = int(match_dia_mes.group(1)), int(match_dia_mes.group(2))
-            if 1 <= dia <= 31 and 1 <= mes <= 12:
-                return datetime(data_atual_cenario.year, mes, dia)
-    except Exception:
-        pass
-    
+        itens = _extrair_json_da_resposta(resposta_bruta)
+    except json.JSONDecodeError:
+        itens = _recuperar_objetos_json(resposta_bruta)
+        print(f"Agente {AGENT_NAME}: Array JSON da busca malformado; {len(itens)} objetos recuperados.")
+    if not isinstance(itens, list):
+        return None
+
+    vagas = [vaga for vaga in map(_validar_vaga_estruturada, itens) if vaga]
+    VAGAS_PROCESSADAS.incrementar(len(vagas), resultado="parseadas")
+    VAGAS_PROCESSADAS.incrementar(len(itens) - len(vagas), resultado="rejeitadas")
+    return vagas
+
+def preparar_vagas_estruturadas(resposta_bruta: str | None, cidade_origem_busca: str = "") -> list[tuple[str, dict]] | None:
+    """
+    Versão de `extrair_vagas_estruturadas` no formato da saída do parse: pares (texto_vaga, vaga),
+    em que o texto carrega apenas a origem da busca, usada por `filtrar_e_contextualizar_vaga`.
+    """
+    vagas = extrair_vagas_estruturadas(resposta_bruta)
+    if vagas is None:
+        return None
+    texto_origem = f"(Origem da busca: {cidade_origem_busca})" if cidade_origem_busca else ""
+    return [(texto_origem, vaga) for vaga in vagas]
+
+MESES_PT = {
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'marco': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+    'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+    'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12,
+}
+# Nomes completos em inglês, aceitos pelo antigo strptime('%B') e ainda presentes em algumas respostas.
+MESES_EN = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+MESES_POR_NOME = {**MESES_PT, **MESES_EN}
+DIAS_POR_UNIDADE_RELATIVA = {'minuto': 0, 'hora': 0, 'dia': 1, 'semana': 7, 'mes': 30, 'mês': 30, 'meses': 30, 'ano': 365}
+NUMEROS_POR_EXTENSO = {'um': 1, 'uma': 1, 'dois': 2, 'duas': 2, 'três': 3, 'tres': 3}
+TAMANHO_CACHE_NORMALIZACAO_DATAS = 65536
+
+REGEX_PREFIXOS_DATA = re.compile(r"data de publicação:|publicada em:|atualizada em:")
+REGEX_DATA_NUMERICA = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})")
+REGEX_DATA_POR_EXTENSO = re.compile(r"(\d{1,2})(?:\s+de)?\s+([a-zç]+)\.?,?(?:\s+de)?\s+(\d{4})")
+REGEX_DATA_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[t ][\d:.]+(?:z|[+-]\d{2}:?\d{2})?)?")
+REGEX_DATA_RELATIVA = re.compile(r"há\s+(\d+|um|uma|dois|duas|três|tres)\+?\s*(minuto|hora|dia|semana|meses|mês|mes|ano)")
+REGEX_DIA_MES = re.compile(r"(\d{1,2})/(\d{1,2})")
+
+def _ano_de_dois_digitos(ano: int) -> int:
+    # Mesmo pivô do strptime %y: 69-99 -> 1900, 00-68 -> 2000.
+    return ano + (1900 if ano >= 69 else 2000)
+
+def _criar_data(ano: int, mes: int, dia: int) -> datetime | None:
+    try:
+        return datetime(ano, mes, dia)
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=TAMANHO_CACHE_NORMALIZACAO_DATAS)
+def _normalizar_data_em_cache(data_str: str, dia_referencia: date) -> datetime | None:
+    data_str_proc = REGEX_PREFIXOS_DATA.sub("", data_str.lower()).strip()
+    data_str_proc = data_str_proc.split('(')[0].strip()
+    referencia = datetime(dia_referencia.year, dia_referencia.month, dia_referencia.day)
+
+    match_numerica = REGEX_DATA_NUMERICA.fullmatch(data_str_proc)
+    if match_numerica:
+        dia, mes, ano_str = match_numerica.groups()
+        ano = int(ano_str) if len(ano_str) == 4 else _ano_de_dois_digitos(int(ano_str))
+        data_absoluta = _criar_data(ano, int(mes), int(dia))
+        if data_absoluta:
+            return data_absoluta
+
+    match_extenso = REGEX_DATA_POR_EXTENSO.fullmatch(data_str_proc)
+    if match_extenso and match_extenso.group(2) in MESES_POR_NOME:
+        data_absoluta = _criar_data(int(match_extenso.group(3)), MESES_POR_NOME[match_extenso.group(2)], int(match_extenso.group(1)))
+        if data_absoluta:
+            return data_absoluta
+
+    match_iso = REGEX_DATA_ISO.fullmatch(data_str_proc)
+    if match_iso:
+        data_absoluta = _criar_data(int(match_iso.group(1)), int(match_iso.group(2)), int(match_iso.group(3)))
+        if data_absoluta:
+            return data_absoluta
+
+    if "hoje" in data_str_proc:
+        return referencia
+    if "ontem" in data_str_proc:
+        return referencia - timedelta(days=1)
+
+    match_relativa = REGEX_DATA_RELATIVA.search(data_str_proc)
+    if match_relativa:
+        quantidade_str, unidade = match_relativa.groups()
+        quantidade = NUMEROS_POR_EXTENSO.get(quantidade_str) or int(quantidade_str)
+        return referencia - timedelta(days=quantidade * DIAS_POR_UNIDADE_RELATIVA[unidade])
+
+    match_dia_mes = REGEX_DIA_MES.match(data_str_proc)
+    if match_dia_mes:
+        dia, mes = int(match_dia_mes.group(1)), int(match_dia_mes.group(2))
+        if 1 <= dia <= 31 and 1 <= mes <= 12:
+            return _criar_data(dia_referencia.year, mes, dia)
+
     return None
 
+def normalizar_data(data_str: str | None, data_atual_cenario: datetime) -> datetime | None:
+    """
+    Converte datas de postagem em português (absolutas, relativas como "há 3 dias" / "há 1 mês",
+    ou ISO) para datetime à meia-noite. Os resultados são memorizados por (texto, dia de referência).
+    """
+    if not data_str or data_str.lower() in ["não informado", "n/a", ""]:
+        return None
+    return _normalizar_data_em_cache(data_str, data_atual_cenario.date())
+
+def normalizar_datas(datas_str: list[str | None], data_atual_cenario: datetime) -> list[datetime | None]:
+    """Versão em lote de normalizar_data: cada texto distinto é processado uma única vez."""
+    resultados_por_texto = {texto: normalizar_data(texto, data_atual_cenario) for texto in set(datas_str)}
+    return [resultados_por_texto[texto] for texto in datas_str]
+
 def split_into_individual_vagas(text_block: str | None, cidade_origem_busca: str = "") -> list[str]:
     if not text_block or not text_block.strip():
         return []
 
-    text_block_sem_obs = re.split(r'\n\s*(Observaç(ão|ões)|OBS\.:|Nota:|Recomendo verificar|Além dessas)\s*:', text_block, maxsplit=1)[0].strip()
+    text_block_sem_obs = REGEX_RODAPE_OBSERVACOES.split(text_block, maxsplit=1)[0].strip()
     
     vagas_raw = []
     if DELIMITADOR_FIM_VAGA in text_block_sem_obs:
@@ -162,6 +609,10 @@ def split_into_individual_vagas(text_block: str | None, cidade_origem_busca: str
                 if vaga_candidate and len(vaga_candidate) > 30 :
                     vagas_raw.append(vaga_candidate)
     
+    return _limpar_vagas_divididas(vagas_raw, cidade_origem_busca)
+
+def _limpar_vagas_divididas(vagas_raw: list[str], cidade_origem_busca: str = "") -> list[str]:
+    """Mantém só os blocos que parecem vagas, com o prefixo de origem da busca, e os conta nas métricas."""
     vagas_limpas = []
     for vaga_str in vagas_raw:
         v_strip = vaga_str.strip()
@@ -173,95 +624,302 @@ def split_into_individual_vagas(text_block: str | None, cidade_origem_busca: str
                 vagas_limpas.append(f"(Origem da busca: {cidade_origem_busca}) {v_strip}")
             else:
                 vagas_limpas.append(v_strip)
-            
+
+    VAGAS_PROCESSADAS.incrementar(len(vagas_limpas), resultado="divididas")
     return vagas_limpas
 
-def processar_e_formatar_vagas(
-    resultados_agente1_bruto: str | None, 
-    resultados_agente2_por_cidade: dict[str, str],
-    data_atual_cenario: datetime
-    ) -> list[dict]:
+class DivisorIncrementalDeVagas:
+    """
+    Versão incremental de `split_into_individual_vagas` para respostas que chegam em partes:
+    `adicionar` devolve cada vaga assim que o DELIMITADOR_FIM_VAGA dela aparece (mesmo que o
+    delimitador venha quebrado entre duas partes) e `finalizar` devolve o que sobrou no fim.
+    O rodapé de observações é cortado como no split completo, e nada depois dele vira vaga.
+    Sem nenhum delimitador na resposta, `finalizar` aplica o split heurístico ao texto inteiro.
+    O resultado final é o mesmo do split sobre a resposta completa.
+    """
+
+    def __init__(self, cidade_origem_busca: str = ""):
+        self.cidade_origem_busca = cidade_origem_busca
+        self._pendente = ""
+        self._encontrou_delimitador = False
+        self._encerrado = False
+
+    def adicionar(self, parte: str) -> list[str]:
+        if self._encerrado or not parte:
+            return []
+        self._pendente += parte
+        match_rodape = REGEX_RODAPE_OBSERVACOES.search(self._pendente)
+        if match_rodape:
+            self._pendente = self._pendente[:match_rodape.start()]
+            self._encerrado = True
+
+        vagas_raw = []
+        posicao = self._pendente.find(DELIMITADOR_FIM_VAGA)
+        while posicao != -1:
+            self._encontrou_delimitador = True
+            vaga = self._pendente[:posicao].strip()
+            if len(vaga) > 20:
+                vagas_raw.append(vaga)
+            self._pendente = self._pendente[posicao + len(DELIMITADOR_FIM_VAGA):]
+            posicao = self._pendente.find(DELIMITADOR_FIM_VAGA)
+        return _limpar_vagas_divididas(vagas_raw, self.cidade_origem_busca) if vagas_raw else []
+
+    def finalizar(self) -> list[str]:
+        restante, self._pendente = self._pendente, ""
+        self._encerrado = True
+        if not self._encontrou_delimitador:
+            return split_into_individual_vagas(restante, self.cidade_origem_busca)
+        restante = restante.strip()
+        return _limpar_vagas_divididas([restante], self.cidade_origem_busca) if len(restante) > 20 else []
+
+def submeter_parse_de_textos(
+    executor: ThreadPoolExecutor,
+    textos_vagas: list[str],
+    agente_parser: Agent,
+    agente_parser_lote: Agent | None = None,
+    tamanho_lote: int = TAMANHO_LOTE_PARSE,
+    pos_processamento: Callable[[list[tuple[str, dict | None]]], object] | None = None,
+    detalhamento_tempos: DetalhamentoDeTempos | None = None
+    ) -> list[Future]:
+    """
+    Agenda o parse dos textos no executor. Cada futuro retorna uma lista de
+    (texto_vaga, vaga_parseada_ou_None) na mesma ordem dos textos recebidos,
+    ou o retorno de `pos_processamento` aplicado a essa lista, na mesma thread do parse.
+    O tempo de cada lote é registrado na etapa "parse" das métricas (e em `detalhamento_tempos`).
+    """
+    def parsear_lote(lote: list[str]):
+        with medir_etapa("parse", detalhamento_tempos):
+            if agente_parser_lote and tamanho_lote > 1:
+                resultados = list(zip(lote, parsear_vagas_em_lote(lote, agente_parser_lote, agente_parser)))
+            else:
+                resultados = [(texto, parsear_vaga_individual(texto, agente_parser)) for texto in lote]
+        _contabilizar_resultados_parse(resultados)
+        return pos_processamento(resultados) if pos_processamento else resultados
+
+    passo = tamanho_lote if agente_parser_lote and tamanho_lote > 1 else 1
+    return [executor.submit(parsear_lote, textos_vagas[i:i + passo]) for i in range(0, len(textos_vagas), passo)]
+
+async def parsear_textos_async(
+    textos_vagas: list[str],
+    agente_parser: Agent,
+    agente_parser_lote: Agent | None = None,
+    tamanho_lote: int = TAMANHO_LOTE_PARSE,
+    max_simultaneos: int = MAX_PARSES_SIMULTANEOS_ASYNC,
+    detalhamento_tempos: DetalhamentoDeTempos | None = None
+    ) -> list[tuple[str, dict | None]]:
+    """
+    Versão assíncrona de `submeter_parse_de_textos`: os lotes rodam como corrotinas no event loop
+    atual, até `max_simultaneos` ao mesmo tempo (o ritmo real de chamadas continua sendo o do
+    limitador). Retorna (texto_vaga, vaga_parseada_ou_None) na mesma ordem dos textos recebidos.
+    """
+    semaforo = asyncio.Semaphore(max(1, max_simultaneos))
+    usar_lote = agente_parser_lote is not None and tamanho_lote > 1
+
+    async def parsear_lote(lote: list[str]) -> list[tuple[str, dict | None]]:
+        async with semaforo:
+            with medir_etapa("parse", detalhamento_tempos):
+                if usar_lote:
+                    vagas = await parsear_vagas_em_lote_async(lote, agente_parser_lote, agente_parser)
+                else:
+                    vagas = await asyncio.gather(*(parsear_vaga_individual_async(texto, agente_parser) for texto in lote))
+        resultados = list(zip(lote, vagas))
+        _contabilizar_resultados_parse(resultados)
+        return resultados
+
+    passo = tamanho_lote if usar_lote else 1
+    lotes = await asyncio.gather(*(parsear_lote(textos_vagas[i:i + passo]) for i in range(0, len(textos_vagas), passo)))
+    return [resultado for lote in lotes for resultado in lote]
+
+def _contabilizar_resultados_parse(resultados: list[tuple[str, dict | None]]):
+    parseadas = sum(1 for _, vaga in resultados if vaga)
+    VAGAS_PROCESSADAS.incrementar(parseadas, resultado="parseadas")
+    VAGAS_PROCESSADAS.incrementar(len(resultados) - parseadas, resultado="rejeitadas")
+
+def filtrar_e_contextualizar_vaga(vaga_parseada: dict, texto_vaga: str, data_atual_cenario: datetime) -> Vaga | None:
+    """
+    Normaliza a data, descarta vagas antigas e anota na localização a cidade de origem da busca
+    quando ela não aparece no local parseado. Devolve a vaga aceita como `Vaga`, sem alterar o dict recebido.
+    """
+    data_norm_vaga = normalizar_data(vaga_parseada.get('data_postagem_original'), data_atual_cenario)
     
-    agente_parser = criar_agente_consolidador()
-    vagas_parseadas_lista = []
-    textos_brutos_vagas = []
+    descartar_por_antiguidade = False
+    if data_norm_vaga:
+        if data_atual_cenario.toordinal() - data_norm_vaga.toordinal() > LIMITE_ANTIGUIDADE_VAGA_DIAS:
+            descartar_por_antiguidade = True
+    elif vaga_parseada.get('data_postagem_original','').lower() not in ["não informado", "n/a", ""]:
+        match_ano_antigo = re.search(r"(201\d|202[0-3])", vaga_parseada.get('data_postagem_original', '')) 
+        if match_ano_antigo :
+            ano_vaga = int(match_ano_antigo.group(1))
+            if ano_vaga < data_atual_cenario.year : 
+                data_fim_ano_vaga = datetime(ano_vaga, 12, 31)
+                if (data_atual_cenario - data_fim_ano_vaga).days > LIMITE_ANTIGUIDADE_VAGA_DIAS:
+                    descartar_por_antiguidade = True
+    
+    if descartar_por_antiguidade:
+        VAGAS_PROCESSADAS.incrementar(resultado="antigas")
+        return None
+
+    localizacao = vaga_parseada.get('localizacao')
+    if "(Origem da busca:" in texto_vaga and localizacao:
+         match_origem = re.search(r"\(Origem da busca: ([^)]+)\)", texto_vaga)
+         if match_origem:
+             cidade_origem_ctx = match_origem.group(1).strip()
+             local_parseado = localizacao.lower()
+             if cidade_origem_ctx.lower() not in local_parseado and \
+                (len(cidade_origem_ctx.split()) == 1 or cidade_origem_ctx.lower() not in " ".join(local_parseado.split()[:2])):
+                 localizacao = f"{localizacao} (Contexto da busca: {cidade_origem_ctx})"
+    
+    return Vaga.de_dict(vaga_parseada, localizacao=localizacao, data_normalizada=data_norm_vaga)
+
+def chave_ordenacao_vaga(vaga: Vaga, data_atual_cenario: datetime) -> tuple:
+    """Chave usada para ordenar as vagas (em ordem decrescente: mais recentes primeiro)."""
+    data_norm = vaga.data_normalizada
+    if data_norm and data_norm > data_atual_cenario + timedelta(days=365) : 
+         return (data_atual_cenario - timedelta(days=365*10), vaga.titulo or 'z') 
+    if data_norm:
+        return (data_norm, vaga.titulo or '') 
+    return (data_atual_cenario - timedelta(days=365*20), vaga.titulo or 'z')
+
+def remover_textos_duplicados(textos_vagas: list[str], detector: DetectorDeDuplicatas | None = None) -> list[str]:
+    """
+    Remove textos brutos repetidos ou quase idênticos (ignorando o prefixo de origem da busca)
+    antes do parse, para que a mesma vaga não seja enviada duas vezes ao LLM.
+    Passe o mesmo `detector` em chamadas sucessivas para deduplicar entre buscas diferentes.
+    """
+    if detector is None:
+        detector = criar_detector_de_textos_duplicados()
+    textos_unicos = []
+    for texto in textos_vagas:
+        texto_sem_origem = REGEX_PREFIXO_ORIGEM_BUSCA.sub("", texto, count=1)
+        duplicata_de = detector.encontrar_ou_adicionar(
+            None,
+            shingles_de_palavras(texto_sem_origem),
+            chave_exata=chave_cache_parse(texto)
+        )
+        if duplicata_de is None:
+            textos_unicos.append(texto)
+    if len(textos_unicos) < len(textos_vagas):
+        VAGAS_PROCESSADAS.incrementar(len(textos_vagas) - len(textos_unicos), resultado="duplicadas_texto")
+        print(f"Agente {AGENT_NAME}: {len(textos_vagas) - len(textos_unicos)} textos de vagas duplicados removidos antes do parse.")
+    return textos_unicos
+
+def consolidar_vagas(vagas_parseadas_lista: list[Vaga], data_atual_cenario: datetime) -> list[Vaga]:
+    detector = DetectorDeDuplicatas()
+    vagas_finais: list[Vaga] = []
+    # Posição em vagas_finais de cada vaga que ficou como representante (-1 para as duplicadas).
+    posicao_representante = [-1] * len(vagas_parseadas_lista)
+    for indice_vaga, vaga in enumerate(vagas_parseadas_lista):
+        # A similaridade é só do título; empresa e senioridade são conferidas à parte, para que um
+        # nome de empresa longo não faça "Analista Jr" e "Analista Sr" da mesma empresa passarem do limiar.
+        def mesma_vaga(indice_candidato: int) -> bool:
+            candidata = vagas_parseadas_lista[indice_candidato]
+            return empresas_compativeis(vaga.empresa_normalizada, candidata.empresa_normalizada) \
+                and senioridades_compativeis(vaga.titulo_normalizado, candidata.titulo_normalizado)
+
+        indice_representante = detector.encontrar_ou_adicionar(
+            indice_vaga,
+            set(vaga.titulo_normalizado.split()),
+            bloco=vaga.local_base,
+            chave_exata=(vaga.titulo_normalizado, vaga.empresa_normalizada),
+            link_canonico=canonicalizar_url(vaga.link),
+            verificar_candidato=mesma_vaga
+        )
+        if indice_representante is None:
+            posicao_representante[indice_vaga] = len(vagas_finais)
+            vagas_finais.append(vaga)
+        else:
+            posicao = posicao_representante[indice_representante]
+            data_existente = vagas_finais[posicao].data_normalizada
+            if vaga.data_normalizada and (not data_existente or vaga.data_normalizada > data_existente):
+                vagas_finais[posicao] = vaga 
+    
+    VAGAS_PROCESSADAS.incrementar(len(vagas_parseadas_lista) - len(vagas_finais), resultado="duplicadas")
+    print(f"Agente {AGENT_NAME}: Total de {len(vagas_finais)} vagas únicas.")
 
-    if resultados_agente1_bruto:
-        textos_brutos_vagas.extend(split_into_individual_vagas(resultados_agente1_bruto, "Busca Principal"))
+    vagas_finais.sort(key=lambda vaga: chave_ordenacao_vaga(vaga, data_atual_cenario), reverse=True)
+    return vagas_finais
 
-    for cidade, vagas_str in resultados_agente2_por_cidade.items():
-        textos_brutos_vagas.extend(split_into_individual_vagas(vagas_str, cidade))
+def _separar_respostas_para_parse(
+    resultados_agente1_bruto: str | None,
+    resultados_agente2_por_cidade: dict[str, str]
+    ) -> tuple[list[str], list[tuple[str, dict | None]]]:
+    """Separa as respostas dos agentes em textos brutos a parsear e vagas que já vieram estruturadas."""
+    textos_brutos_vagas = []
+    resultados_parse = []
+
+    respostas_por_origem = [("Busca Principal", resultados_agente1_bruto)] if resultados_agente1_bruto else []
+    respostas_por_origem.extend(resultados_agente2_por_cidade.items())
+    for origem, resposta_bruta in respostas_por_origem:
+        vagas_estruturadas = preparar_vagas_estruturadas(resposta_bruta, origem)
+        if vagas_estruturadas is not None:
+            resultados_parse.extend(vagas_estruturadas)
+        else:
+            textos_brutos_vagas.extend(split_into_individual_vagas(resposta_bruta, origem))
 
-    print(f"\nAgente {AGENT_NAME}: Total de {len(textos_brutos_vagas)} descrições de vagas brutas para parsear (após split).")
-    if not textos_brutos_vagas:
-        return []
+    textos_brutos_vagas = remover_textos_duplicados(textos_brutos_vagas)
 
-    for i, texto_vaga in enumerate(textos_brutos_vagas):
-        vaga_parseada = parsear_vaga_individual(texto_vaga, agente_parser)
+    print(f"\nAgente {AGENT_NAME}: Total de {len(textos_brutos_vagas)} descrições de vagas brutas para parsear (após split), {len(resultados_parse)} vagas já estruturadas.")
+    return textos_brutos_vagas, resultados_parse
+
+def _filtrar_e_consolidar(
+    resultados_parse: list[tuple[str, dict | None]],
+    data_atual_cenario: datetime,
+    detalhamento_tempos: DetalhamentoDeTempos | None = None
+    ) -> list[Vaga]:
+    vagas_parseadas_lista = []
+    for texto_vaga, vaga_parseada in resultados_parse:
         if vaga_parseada:
-            vaga_parseada['data_normalizada'] = normalizar_data(vaga_parseada.get('data_postagem_original'), data_atual_cenario)
-            
-            data_norm_vaga = vaga_parseada.get('data_normalizada')
-            descartar_por_antiguidade = False
-            if data_norm_vaga:
-                if (data_atual_cenario.date() - data_norm_vaga.date()).days > LIMITE_ANTIGUIDADE_VAGA_DIAS:
-                    descartar_por_antiguidade = True
-            elif vaga_parseada.get('data_postagem_original','').lower() not in ["não informado", "n/a", ""]:
-                match_ano_antigo = re.search(r"(201\d|202[0-3])", vaga_parseada.get('data_postagem_original', '')) 
-                if match_ano_antigo :
-                    ano_vaga = int(match_ano_antigo.group(1))
-                    if ano_vaga < data_atual_cenario.year : 
-                        data_fim_ano_vaga = datetime(ano_vaga, 12, 31)
-                        if (data_atual_cenario - data_fim_ano_vaga).days > LIMITE_ANTIGUIDADE_VAGA_DIAS:
-                            descartar_por_antiguidade = True
-            
-            if descartar_por_antiguidade:
-                continue 
-
-            if "(Origem da busca:" in texto_vaga and vaga_parseada.get('localizacao'):
-                 match_origem = re.search(r"\(Origem da busca: ([^)]+)\)", texto_vaga)
-                 if match_origem:
-                     cidade_origem_ctx = match_origem.group(1).strip()
-                     local_parseado = vaga_parseada['localizacao'].lower()
-                     if cidade_origem_ctx.lower() not in local_parseado and \
-                        (len(cidade_origem_ctx.split()) == 1 or cidade_origem_ctx.lower() not in " ".join(local_parseado.split()[:2])):
-                         vaga_parseada['localizacao'] = f"{vaga_parseada['localizacao']} (Contexto da busca: {cidade_origem_ctx})"
-            
-            vagas_parseadas_lista.append(vaga_parseada)
+            vaga_filtrada = filtrar_e_contextualizar_vaga(vaga_parseada, texto_vaga, data_atual_cenario)
+            if vaga_filtrada:
+                vagas_parseadas_lista.append(vaga_filtrada)
     
     print(f"Agente {AGENT_NAME}: Total de {len(vagas_parseadas_lista)} vagas parseadas e que passaram no filtro de antiguidade.")
 
-    vagas_unicas_dict = {}
-    for vaga in vagas_parseadas_lista:
-        titulo_norm = vaga.get('titulo', 's/titulo').lower().strip()
-        empresa_norm = vaga.get('empresa', 's/empresa').lower().strip()
-        local_norm_base = vaga.get('localizacao', 's/local').lower().split(',')[0].split('(')[0].strip()
-        
-        chave_unicidade = (titulo_norm, empresa_norm, local_norm_base)
-        if chave_unicidade not in vagas_unicas_dict:
-            vagas_unicas_dict[chave_unicidade] = vaga
-        else:
-            existente = vagas_unicas_dict[chave_unicidade]
-            data_existente = existente.get('data_normalizada')
-            data_nova = vaga.get('data_normalizada')
-            if data_nova and (not data_existente or data_nova > data_existente):
-                vagas_unicas_dict[chave_unicidade] = vaga 
+    with medir_etapa("consolidacao", detalhamento_tempos):
+        return consolidar_vagas(vagas_parseadas_lista, data_atual_cenario)
+
+def processar_e_formatar_vagas(
+    resultados_agente1_bruto: str | None, 
+    resultados_agente2_por_cidade: dict[str, str],
+    data_atual_cenario: datetime,
+    tamanho_lote: int = TAMANHO_LOTE_PARSE,
+    detalhamento_tempos: DetalhamentoDeTempos | None = None
+    ) -> list[Vaga]:
     
-    vagas_finais = list(vagas_unicas_dict.values())
-    print(f"Agente {AGENT_NAME}: Total de {len(vagas_finais)} vagas únicas.")
+    textos_brutos_vagas, resultados_parse = _separar_respostas_para_parse(resultados_agente1_bruto, resultados_agente2_por_cidade)
+    if not textos_brutos_vagas and not resultados_parse:
+        return []
 
-    def sort_key(vaga):
-        data_norm = vaga.get('data_normalizada')
-        if data_norm and data_norm > data_atual_cenario + timedelta(days=365) : 
-             return (data_atual_cenario - timedelta(days=365*10), vaga.get('titulo','z')) 
-        if data_norm:
-            return (data_norm, vaga.get('titulo','')) 
-        return (data_atual_cenario - timedelta(days=365*20), vaga.get('titulo','z'))
+    agente_parser = criar_agente_consolidador()
+    agente_parser_lote = criar_agente_consolidador_lote() if tamanho_lote > 1 else None
+    with ThreadPoolExecutor(max_workers=MAX_PARSES_SIMULTANEOS) as executor:
+        futuros_parse = submeter_parse_de_textos(
+            executor, textos_brutos_vagas, agente_parser, agente_parser_lote, tamanho_lote, detalhamento_tempos=detalhamento_tempos
+        )
+        for futuro in futuros_parse:
+            resultados_parse.extend(futuro.result())
+    return _filtrar_e_consolidar(resultados_parse, data_atual_cenario, detalhamento_tempos)
 
-    vagas_finais.sort(key=sort_key, reverse=True)
-    return vagas_finais
+async def processar_e_formatar_vagas_async(
+    resultados_agente1_bruto: str | None, 
+    resultados_agente2_por_cidade: dict[str, str],
+    data_atual_cenario: datetime,
+    tamanho_lote: int = TAMANHO_LOTE_PARSE,
+    detalhamento_tempos: DetalhamentoDeTempos | None = None
+    ) -> list[Vaga]:
+    """Versão assíncrona de `processar_e_formatar_vagas`: o parse roda como corrotinas no event loop atual."""
+    textos_brutos_vagas, resultados_parse = _separar_respostas_para_parse(resultados_agente1_bruto, resultados_agente2_por_cidade)
+    if not textos_brutos_vagas and not resultados_parse:
+        return []
+
+    agente_parser = criar_agente_consolidador()
+    agente_parser_lote = criar_agente_consolidador_lote() if tamanho_lote > 1 else None
+    resultados_parse.extend(await parsear_textos_async(
+        textos_brutos_vagas, agente_parser, agente_parser_lote, tamanho_lote, detalhamento_tempos=detalhamento_tempos
+    ))
+    return _filtrar_e_consolidar(resultados_parse, data_atual_cenario, detalhamento_tempos)
 
-def formatar_vaga_para_usuario(vaga: dict, indice: int, data_base_formatacao: datetime) -> str:
+def formatar_vaga_para_usuario(vaga: Vaga, indice: int, data_base_formatacao: datetime) -> str:
     saida = f"\n--- Vaga {indice + 1} ---\n"
     saida += f"🎯 Título: {vaga.get('titulo', 'N/A')}\n"
     saida += f"🏢 Empresa: {vaga.get('empresa', 'N/A')}\n"
@@ -305,7 +963,7 @@ def formatar_vaga_para_usuario(vaga: dict, indice: int, data_base_formatacao: da
     return saida
 
 if __name__ == "__main__":
-    if not GOOGLE_API_KEY:
+    if not LLM_CONFIGURADO:
         print("API Key não carregada para o teste do consolidador.")
     else:
         print("--- Teste do Consolidador (Foco na Normalização de Datas e Filtros) ---")
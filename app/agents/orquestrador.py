@@ -0,0 +1,304 @@
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.core.config import LLM_CONFIGURADO, BUSCA_ESTRUTURADA
+from app.agents.pesquisador_principal import (
+    buscar_vagas_principais,
+    buscar_vagas_principais_async,
+    buscar_vagas_principais_em_partes_async
+)
+from app.agents.pesquisador_proximidade import buscar_vagas_em_proximidades, buscar_vagas_em_proximidades_async
+from app.core.deduplicacao import criar_detector_de_textos_duplicados
+from app.core.metricas import DetalhamentoDeTempos, medir_etapa
+from app.agents.consolidador_formatador import (
+    criar_agente_consolidador,
+    criar_agente_consolidador_lote,
+    split_into_individual_vagas,
+    remover_textos_duplicados,
+    submeter_parse_de_textos,
+    filtrar_e_contextualizar_vaga,
+    preparar_vagas_estruturadas,
+    chave_cache_parse,
+    consolidar_vagas,
+    parsear_textos_async,
+    DivisorIncrementalDeVagas,
+    TAMANHO_LOTE_PARSE,
+    MAX_PARSES_SIMULTANEOS
+)
+from app.core.vaga import Vaga
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
+import asyncio
+import threading
+
+ORIGEM_BUSCA_PRINCIPAL = "Busca Principal"
+
+ETAPA_BUSCANDO = "buscando_vagas"
+ETAPA_PARSEANDO = "parseando_vagas"
+ETAPA_CONSOLIDANDO = "consolidando_vagas"
+
+class ExecucaoIncremental:
+    """
+    Parses da execução anterior de uma mesma consulta, indexados pela impressão digital do texto
+    bruto da vaga (`chave_cache_parse`), e os parses da execução atual. Textos já vistos não voltam
+    ao parse; os parses anteriores cujo texto não apareceu desta vez continuam no resultado
+    enquanto passarem no filtro de antiguidade. Textos cujo parse falhou não são guardados e
+    voltam ao parse na próxima execução.
+    """
+
+    def __init__(self, parses_anteriores: dict[str, tuple[str, dict]] | None = None):
+        self.parses_anteriores = parses_anteriores or {}
+        self._parses_atuais: dict[str, tuple[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, texto_vaga: str, vaga_parseada: dict | None):
+        if not vaga_parseada:
+            return
+        with self._lock:
+            self._parses_atuais[chave_cache_parse(texto_vaga)] = (texto_vaga, dict(vaga_parseada))
+
+    def separar_textos(self, textos_vagas: list[str]) -> tuple[list[str], list[tuple[str, dict]]]:
+        """Divide os textos em (novos, a parsear) e (já conhecidos, com o parse da execução anterior)."""
+        textos_novos = []
+        textos_conhecidos = []
+        for texto in textos_vagas:
+            anterior = self.parses_anteriores.get(chave_cache_parse(texto))
+            if anterior is None:
+                textos_novos.append(texto)
+            else:
+                vaga_anterior = anterior[1]
+                self.registrar(texto, vaga_anterior)
+                textos_conhecidos.append((texto, dict(vaga_anterior)))
+        return textos_novos, textos_conhecidos
+
+    def parses_somente_da_execucao_anterior(self) -> list[tuple[str, dict]]:
+        with self._lock:
+            return [
+                (texto, dict(vaga)) for impressao, (texto, vaga) in self.parses_anteriores.items()
+                if impressao not in self._parses_atuais
+            ]
+
+    def parses_para_salvar(self) -> dict[str, tuple[str, dict]]:
+        with self._lock:
+            return dict(self._parses_atuais)
+
+def executar_busca_em_pipeline(
+    cargo: str,
+    cidade_principal: str,
+    buscar_proximas: bool,
+    data_atual_cenario: datetime,
+    tamanho_lote: int = TAMANHO_LOTE_PARSE,
+    ao_mudar_etapa: Callable[[str], None] | None = None,
+    ao_aceitar_vaga: Callable[[Vaga], None] | None = None,
+    detalhamento_tempos: DetalhamentoDeTempos | None = None,
+    busca_estruturada: bool = BUSCA_ESTRUTURADA,
+    execucao_incremental: ExecucaoIncremental | None = None
+    ) -> list[Vaga]:
+    """
+    Executa a busca principal e a busca por proximidade ao mesmo tempo e envia
+    as vagas de cada busca para o parser assim que ela termina. A deduplicação
+    e a ordenação acontecem no final, sobre todas as vagas na ordem original
+    (busca principal primeiro, depois as cidades próximas).
+
+    `ao_mudar_etapa` recebe cada nova etapa (ETAPA_*) e `ao_aceitar_vaga` recebe
+    cada vaga que passou no parse e no filtro de antiguidade, antes da deduplicação.
+    O tempo de cada etapa vai para as métricas e, se informado, para `detalhamento_tempos`.
+    Com `busca_estruturada`, os agentes de busca devolvem JSON e o parse por vaga é pulado;
+    respostas que não vierem como array JSON seguem pelo split e parse normais.
+    Com `execucao_incremental`, só os textos que não apareceram na execução anterior da consulta
+    são parseados, o resultado é mesclado ao anterior e cada vaga recebe "nova" (True/False).
+    """
+    def mudar_etapa(etapa: str):
+        if ao_mudar_etapa:
+            ao_mudar_etapa(etapa)
+
+    mudar_etapa(ETAPA_BUSCANDO)
+    agente_parser = criar_agente_consolidador()
+    agente_parser_lote = criar_agente_consolidador_lote() if tamanho_lote > 1 else None
+
+    futuros_parse_por_origem = {}
+    detector_textos_duplicados = criar_detector_de_textos_duplicados()
+    lock_futuros = threading.Lock()
+
+    executor_parse = ThreadPoolExecutor(max_workers=MAX_PARSES_SIMULTANEOS)
+    executor_buscas = ThreadPoolExecutor(max_workers=2)
+
+    def filtrar_lote_parseado(resultados_lote: list[tuple[str, dict | None]], nova: bool | None = None) -> tuple[int, list[Vaga]]:
+        vagas_aceitas = []
+        for texto_vaga, vaga_parseada in resultados_lote:
+            if execucao_incremental and nova:
+                execucao_incremental.registrar(texto_vaga, vaga_parseada)
+            if vaga_parseada:
+                vaga_filtrada = filtrar_e_contextualizar_vaga(vaga_parseada, texto_vaga, data_atual_cenario)
+                if vaga_filtrada:
+                    if nova is not None:
+                        vaga_filtrada.nova = nova
+                    vagas_aceitas.append(vaga_filtrada)
+                    if ao_aceitar_vaga:
+                        ao_aceitar_vaga(vaga_filtrada)
+        return len(resultados_lote), vagas_aceitas
+
+    def ao_concluir_busca(origem: str, resultado_bruto: str | None):
+        vagas_estruturadas = preparar_vagas_estruturadas(resultado_bruto, origem) if busca_estruturada else None
+        if vagas_estruturadas is not None:
+            print(f"[Pipeline] '{origem}' concluída: {len(vagas_estruturadas)} vagas estruturadas, sem parse pelo LLM.")
+            mudar_etapa(ETAPA_PARSEANDO)
+            futuro = executor_parse.submit(filtrar_lote_parseado, vagas_estruturadas)
+            with lock_futuros:
+                futuros_parse_por_origem[origem] = [futuro]
+            return
+
+        with medir_etapa("preparacao_textos", detalhamento_tempos):
+            textos_vagas = remover_textos_duplicados(split_into_individual_vagas(resultado_bruto, origem), detector_textos_duplicados)
+        futuros = []
+        pos_processamento = filtrar_lote_parseado
+        if execucao_incremental:
+            textos_vagas, textos_conhecidos = execucao_incremental.separar_textos(textos_vagas)
+            print(f"[Pipeline] '{origem}': {len(textos_conhecidos)} vagas brutas já vistas na execução anterior, reaproveitadas sem parse.")
+            if textos_conhecidos:
+                futuros.append(executor_parse.submit(filtrar_lote_parseado, textos_conhecidos, False))
+            pos_processamento = lambda resultados_lote: filtrar_lote_parseado(resultados_lote, True)
+        print(f"[Pipeline] '{origem}' concluída: {len(textos_vagas)} vagas brutas enviadas para parse.")
+        mudar_etapa(ETAPA_PARSEANDO)
+        futuros.extend(submeter_parse_de_textos(
+            executor_parse, textos_vagas, agente_parser, agente_parser_lote, tamanho_lote,
+            pos_processamento=pos_processamento,
+            detalhamento_tempos=detalhamento_tempos
+        ))
+        with lock_futuros:
+            futuros_parse_por_origem[origem] = futuros
+
+    def etapa_busca_principal() -> str:
+        with medir_etapa("busca_principal", detalhamento_tempos):
+            resultado = buscar_vagas_principais(cargo, cidade_principal, estruturada=busca_estruturada)
+        ao_concluir_busca(ORIGEM_BUSCA_PRINCIPAL, resultado)
+        return resultado
+
+    def etapa_busca_proximidades() -> dict[str, str]:
+        with medir_etapa("busca_proximidades", detalhamento_tempos):
+            return buscar_vagas_em_proximidades(cargo, cidade_principal, ao_concluir_cidade=ao_concluir_busca, estruturada=busca_estruturada)
+
+    try:
+        futuro_principal = executor_buscas.submit(etapa_busca_principal)
+        futuro_proximidades = executor_buscas.submit(etapa_busca_proximidades) if buscar_proximas else None
+
+        futuro_principal.result()
+        cidades_proximas = list(futuro_proximidades.result().keys()) if futuro_proximidades else []
+
+        vagas_parseadas_lista = []
+        total_textos = 0
+        for origem in [ORIGEM_BUSCA_PRINCIPAL] + cidades_proximas:
+            with lock_futuros:
+                futuros = futuros_parse_por_origem.get(origem, [])
+            for futuro in futuros:
+                quantidade_textos, vagas_aceitas = futuro.result()
+                total_textos += quantidade_textos
+                vagas_parseadas_lista.extend(vagas_aceitas)
+
+        if execucao_incremental:
+            for texto_vaga, vaga_anterior in execucao_incremental.parses_somente_da_execucao_anterior():
+                _, vagas_aceitas = filtrar_lote_parseado([(texto_vaga, dict(vaga_anterior))], False)
+                if vagas_aceitas:
+                    execucao_incremental.registrar(texto_vaga, vaga_anterior)
+                    vagas_parseadas_lista.extend(vagas_aceitas)
+    finally:
+        executor_buscas.shutdown(wait=False, cancel_futures=True)
+        executor_parse.shutdown(wait=False, cancel_futures=True)
+
+    print(f"[Pipeline] {total_textos} vagas brutas parseadas, {len(vagas_parseadas_lista)} passaram no filtro de antiguidade.")
+    mudar_etapa(ETAPA_CONSOLIDANDO)
+    with medir_etapa("consolidacao", detalhamento_tempos):
+        return consolidar_vagas(vagas_parseadas_lista, data_atual_cenario)
+
+async def executar_busca_async(
+    cargo: str,
+    cidade_principal: str,
+    buscar_proximas: bool,
+    data_atual_cenario: datetime,
+    tamanho_lote: int = TAMANHO_LOTE_PARSE,
+    detalhamento_tempos: DetalhamentoDeTempos | None = None,
+    busca_estruturada: bool = BUSCA_ESTRUTURADA
+    ) -> list[Vaga]:
+    """
+    Versão assíncrona da busca completa, sem threads: a busca principal e a busca por proximidade
+    rodam juntas no event loop atual. A resposta da busca principal chega em streaming e cada vaga
+    já completa vai para o parse (em lotes de `tamanho_lote`) enquanto o agente ainda gera as
+    seguintes; cada cidade próxima vai para o parse assim que termina. A deduplicação e a
+    ordenação acontecem no final, na mesma ordem de `executar_busca_em_pipeline`.
+    """
+    agente_parser = criar_agente_consolidador()
+    agente_parser_lote = criar_agente_consolidador_lote() if tamanho_lote > 1 else None
+    detector_textos_duplicados = criar_detector_de_textos_duplicados()
+    parses_por_origem: dict[str, list[asyncio.Future]] = {}
+
+    def parsear_em_segundo_plano(origem: str, textos_vagas: list[str]):
+        textos_vagas = remover_textos_duplicados(textos_vagas, detector_textos_duplicados)
+        if textos_vagas:
+            parses_por_origem.setdefault(origem, []).append(asyncio.ensure_future(parsear_textos_async(
+                textos_vagas, agente_parser, agente_parser_lote, tamanho_lote, detalhamento_tempos=detalhamento_tempos
+            )))
+
+    def ao_concluir_busca(origem: str, resultado_bruto: str | None):
+        vagas_estruturadas = preparar_vagas_estruturadas(resultado_bruto, origem) if busca_estruturada else None
+        if vagas_estruturadas is not None:
+            ja_parseadas = asyncio.get_running_loop().create_future()
+            ja_parseadas.set_result(vagas_estruturadas)
+            parses_por_origem.setdefault(origem, []).append(ja_parseadas)
+            return
+        with medir_etapa("preparacao_textos", detalhamento_tempos):
+            textos_vagas = split_into_individual_vagas(resultado_bruto, origem)
+        parsear_em_segundo_plano(origem, textos_vagas)
+
+    async def etapa_busca_principal():
+        with medir_etapa("busca_principal", detalhamento_tempos):
+            if busca_estruturada:
+                ao_concluir_busca(ORIGEM_BUSCA_PRINCIPAL, await buscar_vagas_principais_async(cargo, cidade_principal, estruturada=True))
+                return
+            divisor = DivisorIncrementalDeVagas(ORIGEM_BUSCA_PRINCIPAL)
+            textos_pendentes = []
+            async for parte in buscar_vagas_principais_em_partes_async(cargo, cidade_principal):
+                textos_pendentes.extend(divisor.adicionar(parte))
+                if len(textos_pendentes) >= max(1, tamanho_lote):
+                    parsear_em_segundo_plano(ORIGEM_BUSCA_PRINCIPAL, textos_pendentes)
+                    textos_pendentes = []
+            parsear_em_segundo_plano(ORIGEM_BUSCA_PRINCIPAL, textos_pendentes + divisor.finalizar())
+
+    async def etapa_busca_proximidades() -> list[str]:
+        if not buscar_proximas:
+            return []
+        with medir_etapa("busca_proximidades", detalhamento_tempos):
+            resultados_por_cidade = await buscar_vagas_em_proximidades_async(
+                cargo, cidade_principal, ao_concluir_cidade=ao_concluir_busca, estruturada=busca_estruturada
+            )
+        return list(resultados_por_cidade.keys())
+
+    try:
+        _, cidades_proximas = await asyncio.gather(etapa_busca_principal(), etapa_busca_proximidades())
+        vagas_parseadas_lista = []
+        for origem in [ORIGEM_BUSCA_PRINCIPAL] + cidades_proximas:
+            for resultados_lote in await asyncio.gather(*parses_por_origem.get(origem, [])):
+                for texto_vaga, vaga_parseada in resultados_lote:
+                    if vaga_parseada:
+                        vaga_filtrada = filtrar_e_contextualizar_vaga(vaga_parseada, texto_vaga, data_atual_cenario)
+                        if vaga_filtrada:
+                            vagas_parseadas_lista.append(vaga_filtrada)
+    finally:
+        for tarefas in parses_por_origem.values():
+            for tarefa in tarefas:
+                tarefa.cancel()
+
+    with medir_etapa("consolidacao", detalhamento_tempos):
+        return consolidar_vagas(vagas_parseadas_lista, data_atual_cenario)
+
+if __name__ == "__main__":
+    if not LLM_CONFIGURADO:
+        print("API Key não carregada. Verifique seu .env e a configuração.")
+    else:
+        vagas = executar_busca_em_pipeline("Desenvolvedor Python", "Campinas", True, datetime(2025, 5, 17))
+        print(f"\n--- {len(vagas)} vagas encontradas pelo pipeline ---")
+        for vaga in vagas[:5]:
+            print(f"- {vaga.get('titulo')} | {vaga.get('empresa')} | {vaga.get('localizacao')}")
@@ -1,17 +1,28 @@
+from __future__ import annotations
+
 import sys
 import os
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from google.adk.agents import Agent
-from google.adk.tools import google_search
-from app.core.config import DEFAULT_MODEL_ID, GOOGLE_API_KEY
-from app.agents.utils import call_agent
+from app.core.config import DEFAULT_MODEL_ID, LLM_CONFIGURADO, BUSCA_ESTRUTURADA
+from app.agents.registro_agentes import agente_registrado
+from app.agents.utils import call_agent, call_agent_async, call_agent_em_partes_async
+from typing import TYPE_CHECKING, AsyncIterator
+from app.agents.consolidador_formatador import INSTRUCAO_SAIDA_JSON_VAGAS
+
+if TYPE_CHECKING:
+    from google.adk.agents import Agent
 
 AGENT_NAME = "pesquisador_principal_vagas"
+AGENT_NAME_ESTRUTURADO = "pesquisador_principal_vagas_json"
 
+@agente_registrado
 def criar_agente_pesquisador_principal() -> Agent:
+    from google.adk.agents import Agent
+    from google.adk.tools import google_search
+
     pesquisador = Agent(
         name=AGENT_NAME,
         model=DEFAULT_MODEL_ID,
@@ -48,19 +59,64 @@ def criar_agente_pesquisador_principal() -> Agent:
     )
     return pesquisador
 
-def buscar_vagas_principais(cargo: str, cidade: str) -> str:
+@agente_registrado
+def criar_agente_pesquisador_principal_estruturado() -> Agent:
+    """Variante da busca principal que devolve as vagas como array JSON no esquema do consolidador."""
+    from google.adk.agents import Agent
+    from google.adk.tools import google_search
+
+    return Agent(
+        name=AGENT_NAME_ESTRUTURADO,
+        model=DEFAULT_MODEL_ID,
+        instruction="""
+        Você é um assistente de busca de vagas de emprego altamente eficiente.
+        Sua principal tarefa é encontrar vagas de emprego para um CARGO específico em uma CIDADE_PRINCIPAL.
+        Utilize a ferramenta de busca do Google (google_search) para encontrar essas vagas.
+        Concentre-se apenas nas vagas para o CARGO e CIDADE_PRINCIPAL fornecidos.
+        """ + INSTRUCAO_SAIDA_JSON_VAGAS,
+        description="Agente que busca vagas de emprego em uma cidade principal e as devolve como array JSON.",
+        tools=[google_search]
+    )
+
+def _preparar_busca_principal(cargo: str, cidade: str, estruturada: bool) -> tuple[Agent, str]:
+    agente = criar_agente_pesquisador_principal_estruturado() if estruturada else criar_agente_pesquisador_principal()
+    print(f"Agente {AGENT_NAME}: Buscando vagas para '{cargo}' em '{cidade}' ({'JSON estruturado' if estruturada else 'com delimitador'})...")
+    return agente, f"CARGO: {cargo}\nCIDADE_PRINCIPAL: {cidade}"
+
+def buscar_vagas_principais(cargo: str, cidade: str, estruturada: bool = BUSCA_ESTRUTURADA) -> str:
+    """
+    Retorna a resposta bruta do agente: texto com delimitador ou, com `estruturada`,
+    um array JSON de vagas (tratado pelo consolidador sem o parse por vaga).
+    """
+    agente, entrada_agente = _preparar_busca_principal(cargo, cidade, estruturada)
+    resultados_brutos = call_agent(agent=agente, message_text=entrada_agente, app_name=agente.name)
+    print(f"Agente {AGENT_NAME}: Resposta recebida.")
+    return resultados_brutos
+
+async def buscar_vagas_principais_async(cargo: str, cidade: str, estruturada: bool = BUSCA_ESTRUTURADA) -> str:
+    """Versão assíncrona de `buscar_vagas_principais`, no event loop atual."""
+    agente, entrada_agente = _preparar_busca_principal(cargo, cidade, estruturada)
+    resultados_brutos = await call_agent_async(agent=agente, message_text=entrada_agente, app_name=agente.name)
+    print(f"Agente {AGENT_NAME}: Resposta recebida.")
+    return resultados_brutos
+
+async def buscar_vagas_principais_em_partes_async(cargo: str, cidade: str) -> AsyncIterator[str]:
+    """
+    Resposta bruta (com delimitador) entregue em partes à medida que o agente a gera, para que as
+    vagas já completas possam ir para o parse enquanto a busca continua (ver `DivisorIncrementalDeVagas`).
+    """
     agente = criar_agente_pesquisador_principal()
     entrada_agente = f"CARGO: {cargo}\nCIDADE_PRINCIPAL: {cidade}"
-    
-    print(f"Agente {AGENT_NAME}: Buscando vagas para '{cargo}' em '{cidade}' (com delimitador)...")
-    
-    resultados_brutos = call_agent(agent=agente, message_text=entrada_agente, app_name=AGENT_NAME)
-    
+
+    print(f"Agente {AGENT_NAME}: Buscando vagas para '{cargo}' em '{cidade}' (com delimitador, em streaming)...")
+
+    async for parte in call_agent_em_partes_async(agent=agente, message_text=entrada_agente, app_name=agente.name):
+        yield parte
+
     print(f"Agente {AGENT_NAME}: Resposta recebida.")
-    return resultados_brutos
 
 if __name__ == "__main__":
-    if not GOOGLE_API_KEY:
+    if not LLM_CONFIGURADO:
         print("API Key não carregada. Verifique seu .env e a configuração.")
     else:
         print(f"Teste do {AGENT_NAME} iniciado. Usando modelo: {DEFAULT_MODEL_ID}")
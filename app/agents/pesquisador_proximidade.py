@@ -1,20 +1,45 @@
+from __future__ import annotations
+
 import sys
 import os
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from google.adk.agents import Agent
-from google.adk.tools import google_search
-from app.core.config import DEFAULT_MODEL_ID, GOOGLE_API_KEY
-from app.agents.utils import call_agent
+from app.core.config import DEFAULT_MODEL_ID, LLM_CONFIGURADO, CACHE_DIR, PREAQUECER_CACHE_CIDADES_PROXIMAS, BUSCA_ESTRUTURADA
+from app.core.cache import CacheSQLite, normalizar_chave
+from app.agents.utils import call_agent, call_agent_async
+from app.agents.registro_agentes import agente_registrado
+from app.agents.consolidador_formatador import INSTRUCAO_SAIDA_JSON_VAGAS
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING, Callable
+import asyncio
+import json
 import re
+import threading
+import time
+
+if TYPE_CHECKING:
+    from google.adk.agents import Agent
 
 AGENT_NAME_IDENTIFICADOR_CIDADES = "identificador_cidades_proximas"
 AGENT_NAME_BUSCADOR_PROXIMIDADE = "pesquisador_vagas_proximidade"
+AGENT_NAME_BUSCADOR_PROXIMIDADE_ESTRUTURADO = "pesquisador_vagas_proximidade_json"
 MAX_CIDADES_PROXIMAS_PARA_BUSCA = 3
+MAX_BUSCAS_PROXIMIDADE_SIMULTANEAS = 3
+TIMEOUT_BUSCA_POR_CIDADE_SEGUNDOS = 180
+TTL_CACHE_CIDADES_PROXIMAS_SEGUNDOS = 30 * 24 * 60 * 60
+MAX_ENTRADAS_CACHE_CIDADES_PROXIMAS = 2000
+ARQUIVO_CIDADES_PROXIMAS_PADRAO = os.path.join(project_root, "app", "data", "cidades_proximas.json")
 
+_cache_cidades_proximas: CacheSQLite | None = None
+_cache_cidades_proximas_lock = threading.Lock()
+
+@agente_registrado
 def criar_agente_identificador_cidades() -> Agent:
+    from google.adk.agents import Agent
+    from google.adk.tools import google_search
+
     identificador = Agent(
         name=AGENT_NAME_IDENTIFICADOR_CIDADES,
         model=DEFAULT_MODEL_ID,
@@ -35,7 +60,11 @@ def criar_agente_identificador_cidades() -> Agent:
     )
     return identificador
 
+@agente_registrado
 def criar_agente_buscador_proximidade() -> Agent:
+    from google.adk.agents import Agent
+    from google.adk.tools import google_search
+
     buscador = Agent(
         name=AGENT_NAME_BUSCADOR_PROXIMIDADE,
         model=DEFAULT_MODEL_ID,
@@ -63,12 +92,65 @@ def criar_agente_buscador_proximidade() -> Agent:
     )
     return buscador
 
-def identificar_cidades_proximas(cidade_principal: str) -> list[str]:
-    agente_id_cidades = criar_agente_identificador_cidades()
-    entrada_agente = f"CIDADE_PRINCIPAL: {cidade_principal}"
-    
-    resposta_bruta = call_agent(agent=agente_id_cidades, message_text=entrada_agente, app_name=AGENT_NAME_IDENTIFICADOR_CIDADES)
+@agente_registrado
+def criar_agente_buscador_proximidade_estruturado() -> Agent:
+    """Variante do buscador por proximidade que devolve as vagas como array JSON no esquema do consolidador."""
+    from google.adk.agents import Agent
+    from google.adk.tools import google_search
+
+    return Agent(
+        name=AGENT_NAME_BUSCADOR_PROXIMIDADE_ESTRUTURADO,
+        model=DEFAULT_MODEL_ID,
+        instruction="""
+        Você é um assistente de busca de vagas de emprego.
+        Sua tarefa é encontrar vagas para um CARGO específico em uma CIDADE fornecida.
+        Utilize a ferramenta de busca do Google (google_search).
+        Inclua apenas vagas localizadas na CIDADE fornecida.
+        """ + INSTRUCAO_SAIDA_JSON_VAGAS,
+        description="Agente que busca vagas de emprego em uma cidade específica e as devolve como array JSON.",
+        tools=[google_search]
+    )
+
+def preaquecer_cache_cidades_proximas(cache: CacheSQLite, caminho_arquivo: str = ARQUIVO_CIDADES_PROXIMAS_PADRAO) -> int:
+    """Carrega a lista de cidades próximas das principais cidades brasileiras no cache, sem sobrescrever entradas existentes."""
+    try:
+        with open(caminho_arquivo, encoding="utf-8") as arquivo:
+            cidades_por_cidade = json.load(arquivo)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Não foi possível carregar a lista de cidades próximas padrão: {e}")
+        return 0
+
+    inseridas = 0
+    for cidade, cidades_proximas in cidades_por_cidade.items():
+        chave = normalizar_chave(cidade)
+        if not cache.contem(chave):
+            cache.definir(chave, cidades_proximas)
+            inseridas += 1
+    return inseridas
 
+def obter_cache_cidades_proximas() -> CacheSQLite:
+    global _cache_cidades_proximas
+    if _cache_cidades_proximas is None:
+        with _cache_cidades_proximas_lock:
+            if _cache_cidades_proximas is None:
+                cache = CacheSQLite(
+                    os.path.join(CACHE_DIR, "cidades_proximas.sqlite3"),
+                    ttl_segundos=TTL_CACHE_CIDADES_PROXIMAS_SEGUNDOS,
+                    max_entradas=MAX_ENTRADAS_CACHE_CIDADES_PROXIMAS
+                )
+                if PREAQUECER_CACHE_CIDADES_PROXIMAS:
+                    preaquecer_cache_cidades_proximas(cache)
+                _cache_cidades_proximas = cache
+    return _cache_cidades_proximas
+
+def _cidades_proximas_em_cache(cidade_principal: str) -> list[str] | None:
+    cidades_em_cache = obter_cache_cidades_proximas().obter(normalizar_chave(cidade_principal))
+    if cidades_em_cache:
+        print(f"Agente {AGENT_NAME_IDENTIFICADOR_CIDADES}: Cidades próximas de '{cidade_principal}' encontradas no cache: {cidades_em_cache[:MAX_CIDADES_PROXIMAS_PARA_BUSCA]}")
+        return cidades_em_cache[:MAX_CIDADES_PROXIMAS_PARA_BUSCA]
+    return None
+
+def _registrar_cidades_proximas(cidade_principal: str, resposta_bruta: str) -> list[str]:
     cidades_encontradas = []
     if resposta_bruta and "nenhuma cidade próxima encontrada" not in resposta_bruta.lower():
         cidades_brutas = resposta_bruta.split(',')
@@ -83,11 +165,59 @@ def identificar_cidades_proximas(cidade_principal: str) -> list[str]:
                 cidades_encontradas.append(nome_cidade)
     
     cidades_filtradas = [c for c in cidades_encontradas if c.lower() != cidade_principal.lower()]
+    if cidades_filtradas:
+        obter_cache_cidades_proximas().definir(normalizar_chave(cidade_principal), cidades_filtradas)
     
     print(f"Agente {AGENT_NAME_IDENTIFICADOR_CIDADES}: Cidades próximas para busca: {cidades_filtradas[:MAX_CIDADES_PROXIMAS_PARA_BUSCA]}")
     return cidades_filtradas[:MAX_CIDADES_PROXIMAS_PARA_BUSCA]
 
-def buscar_vagas_em_proximidades(cargo: str, cidade_principal: str) -> dict[str, str]:
+def identificar_cidades_proximas(cidade_principal: str) -> list[str]:
+    cidades_em_cache = _cidades_proximas_em_cache(cidade_principal)
+    if cidades_em_cache:
+        return cidades_em_cache
+
+    agente_id_cidades = criar_agente_identificador_cidades()
+    entrada_agente = f"CIDADE_PRINCIPAL: {cidade_principal}"
+    resposta_bruta = call_agent(agent=agente_id_cidades, message_text=entrada_agente, app_name=AGENT_NAME_IDENTIFICADOR_CIDADES)
+    return _registrar_cidades_proximas(cidade_principal, resposta_bruta)
+
+async def identificar_cidades_proximas_async(cidade_principal: str) -> list[str]:
+    """Versão assíncrona de `identificar_cidades_proximas`, no event loop atual."""
+    cidades_em_cache = _cidades_proximas_em_cache(cidade_principal)
+    if cidades_em_cache:
+        return cidades_em_cache
+
+    agente_id_cidades = criar_agente_identificador_cidades()
+    entrada_agente = f"CIDADE_PRINCIPAL: {cidade_principal}"
+    resposta_bruta = await call_agent_async(agent=agente_id_cidades, message_text=entrada_agente, app_name=AGENT_NAME_IDENTIFICADOR_CIDADES)
+    return _registrar_cidades_proximas(cidade_principal, resposta_bruta)
+
+def _buscar_vagas_em_cidade(agente_buscador: Agent, cargo: str, cidade_prox: str) -> str:
+    print(f"--- Buscando em: {cidade_prox} (com delimitador) ---")
+    entrada_agente_busca = f"CARGO: {cargo}\nCIDADE: {cidade_prox}"
+    return call_agent(
+        agent=agente_buscador, 
+        message_text=entrada_agente_busca, 
+        app_name=agente_buscador.name
+    )
+
+async def _buscar_vagas_em_cidade_async(agente_buscador: Agent, cargo: str, cidade_prox: str) -> str:
+    print(f"--- Buscando em: {cidade_prox} (com delimitador) ---")
+    entrada_agente_busca = f"CARGO: {cargo}\nCIDADE: {cidade_prox}"
+    return await call_agent_async(
+        agent=agente_buscador, 
+        message_text=entrada_agente_busca, 
+        app_name=agente_buscador.name
+    )
+
+def buscar_vagas_em_proximidades(
+    cargo: str, 
+    cidade_principal: str,
+    max_simultaneas: int = MAX_BUSCAS_PROXIMIDADE_SIMULTANEAS,
+    timeout_por_cidade: float = TIMEOUT_BUSCA_POR_CIDADE_SEGUNDOS,
+    ao_concluir_cidade: Callable[[str, str], None] | None = None,
+    estruturada: bool = BUSCA_ESTRUTURADA
+    ) -> dict[str, str]:
     cidades_proximas_para_busca = identificar_cidades_proximas(cidade_principal)
     
     if not cidades_proximas_para_busca:
@@ -95,28 +225,97 @@ def buscar_vagas_em_proximidades(cargo: str, cidade_principal: str) -> dict[str,
 
     print(f"\nAgente {AGENT_NAME_BUSCADOR_PROXIMIDADE}: Buscando vagas para '{cargo}' em: {', '.join(cidades_proximas_para_busca)}")
     
-    agente_buscador = criar_agente_buscador_proximidade()
-    resultados_por_cidade = {}
+    agente_buscador = criar_agente_buscador_proximidade_estruturado() if estruturada else criar_agente_buscador_proximidade()
+    resultados_obtidos = {}
+    inicios_por_cidade = {}
+
+    def registrar_resultado(cidade_prox: str, resultado: str):
+        resultados_obtidos[cidade_prox] = resultado
+        if ao_concluir_cidade:
+            ao_concluir_cidade(cidade_prox, resultado)
+
+    def buscar_cidade(cidade_prox: str) -> str:
+        inicios_por_cidade[cidade_prox] = time.monotonic()
+        return _buscar_vagas_em_cidade(agente_buscador, cargo, cidade_prox)
 
+    # O timeout é contado a partir do início efetivo de cada busca, não do enfileiramento no pool.
+    executor = ThreadPoolExecutor(max_workers=max(1, max_simultaneas))
+    try:
+        futuros = {executor.submit(buscar_cidade, cidade_prox): cidade_prox for cidade_prox in cidades_proximas_para_busca}
+        pendentes = set(futuros)
+        while pendentes:
+            concluidos, pendentes = wait(pendentes, timeout=min(1.0, timeout_por_cidade), return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                cidade_prox = futuros[futuro]
+                try:
+                    resultado_cidade = futuro.result()
+                except Exception as e:
+                    print(f"Erro ao buscar vagas em {cidade_prox}: {e}")
+                    resultado_cidade = f"Erro ao buscar vagas: {e}"
+                registrar_resultado(cidade_prox, resultado_cidade)
+
+            agora = time.monotonic()
+            for futuro in list(pendentes):
+                cidade_prox = futuros[futuro]
+                inicio_cidade = inicios_por_cidade.get(cidade_prox)
+                if inicio_cidade is not None and agora - inicio_cidade > timeout_por_cidade:
+                    print(f"Erro ao buscar vagas em {cidade_prox}: tempo limite de {timeout_por_cidade}s excedido.")
+                    registrar_resultado(cidade_prox, f"Erro ao buscar vagas: tempo limite de {timeout_por_cidade}s excedido")
+                    pendentes.discard(futuro)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    resultados_por_cidade = {}
     for cidade_prox in cidades_proximas_para_busca:
-        print(f"--- Buscando em: {cidade_prox} (com delimitador) ---")
-        entrada_agente_busca = f"CARGO: {cargo}\nCIDADE: {cidade_prox}"
-        try:
-            app_name_chamada = f"{AGENT_NAME_BUSCADOR_PROXIMIDADE}_{cidade_prox.replace(' ','_').replace('/','_')}"
-            resultados_brutos_cidade = call_agent(
-                agent=agente_buscador, 
-                message_text=entrada_agente_busca, 
-                app_name=app_name_chamada
-            )
-            resultados_por_cidade[cidade_prox] = resultados_brutos_cidade
-        except Exception as e:
-            print(f"Erro ao buscar vagas em {cidade_prox}: {e}")
-            resultados_por_cidade[cidade_prox] = f"Erro ao buscar vagas: {e}"
-        
+        resultados_por_cidade[cidade_prox] = resultados_obtidos[cidade_prox]
     return resultados_por_cidade
 
+async def buscar_vagas_em_proximidades_async(
+    cargo: str, 
+    cidade_principal: str,
+    max_simultaneas: int = MAX_BUSCAS_PROXIMIDADE_SIMULTANEAS,
+    timeout_por_cidade: float = TIMEOUT_BUSCA_POR_CIDADE_SEGUNDOS,
+    ao_concluir_cidade: Callable[[str, str], None] | None = None,
+    estruturada: bool = BUSCA_ESTRUTURADA
+    ) -> dict[str, str]:
+    """
+    Versão assíncrona de `buscar_vagas_em_proximidades`: busca vagas nas cidades próximas, até
+    `max_simultaneas` ao mesmo tempo no event loop atual.
+    `ao_concluir_cidade(cidade, resposta)` é chamado assim que cada cidade termina; falhas e
+    estouros de `timeout_por_cidade` viram uma resposta "Erro ao buscar vagas: ...".
+    """
+    cidades_proximas_para_busca = await identificar_cidades_proximas_async(cidade_principal)
+    
+    if not cidades_proximas_para_busca:
+        return {}
+
+    print(f"\nAgente {AGENT_NAME_BUSCADOR_PROXIMIDADE}: Buscando vagas para '{cargo}' em: {', '.join(cidades_proximas_para_busca)}")
+    
+    agente_buscador = criar_agente_buscador_proximidade_estruturado() if estruturada else criar_agente_buscador_proximidade()
+    semaforo = asyncio.Semaphore(max(1, max_simultaneas))
+
+    async def buscar_cidade(cidade_prox: str) -> str:
+        # O timeout é contado a partir do início efetivo de cada busca, não da espera pelo semáforo.
+        async with semaforo:
+            try:
+                resultado_cidade = await asyncio.wait_for(
+                    _buscar_vagas_em_cidade_async(agente_buscador, cargo, cidade_prox), timeout_por_cidade
+                )
+            except asyncio.TimeoutError:
+                print(f"Erro ao buscar vagas em {cidade_prox}: tempo limite de {timeout_por_cidade}s excedido.")
+                resultado_cidade = f"Erro ao buscar vagas: tempo limite de {timeout_por_cidade}s excedido"
+            except Exception as e:
+                print(f"Erro ao buscar vagas em {cidade_prox}: {e}")
+                resultado_cidade = f"Erro ao buscar vagas: {e}"
+        if ao_concluir_cidade:
+            ao_concluir_cidade(cidade_prox, resultado_cidade)
+        return resultado_cidade
+
+    resultados = await asyncio.gather(*(buscar_cidade(cidade_prox) for cidade_prox in cidades_proximas_para_busca))
+    return dict(zip(cidades_proximas_para_busca, resultados))
+
 if __name__ == "__main__":
-    if not GOOGLE_API_KEY:
+    if not LLM_CONFIGURADO:
         print("API Key não carregada. Verifique seu .env e a configuração.")
     else:
         print(f"Teste do {AGENT_NAME_BUSCADOR_PROXIMIDADE} e {AGENT_NAME_IDENTIFICADOR_CIDADES} iniciado.")
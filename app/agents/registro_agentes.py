@@ -0,0 +1,61 @@
+"""
+Registro dos agentes do projeto. Cada `criar_agente_*` decorado com `@agente_registrado` constrói
+o Agent (e importa o google-adk) só na primeira chamada; as seguintes devolvem a mesma instância.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from google.adk.agents import Agent
+
+_fabricas: dict[str, Callable[[], Agent]] = {}
+_agentes: dict[str, Agent] = {}
+_agentes_lock = threading.Lock()
+
+def agente_registrado(fabrica: Callable[[], Agent]) -> Callable[[], Agent]:
+    """Registra a fábrica pelo nome da função e faz cada chamada devolver o agente construído uma única vez."""
+    nome = fabrica.__name__
+    _fabricas[nome] = fabrica
+
+    @functools.wraps(fabrica)
+    def obter() -> Agent:
+        return obter_agente(nome)
+    obter.construir = fabrica
+    return obter
+
+def obter_agente(nome: str) -> Agent:
+    agente = _agentes.get(nome)
+    if agente is None:
+        with _agentes_lock:
+            agente = _agentes.get(nome)
+            if agente is None:
+                agente = _fabricas[nome]()
+                _agentes[nome] = agente
+    return agente
+
+def agentes_registrados() -> list[str]:
+    return list(_fabricas)
+
+def limpar_registro_de_agentes():
+    """Descarta os agentes já construídos (as fábricas continuam registradas)."""
+    with _agentes_lock:
+        _agentes.clear()
+
+def preaquecer_agentes() -> float:
+    """
+    Gancho de aquecimento opcional: constrói todos os agentes registrados e carrega o runtime do
+    backend de LLM, para que a primeira requisição não pague esse custo. Retorna os segundos gastos.
+    """
+    from app.agents.backends_llm import obter_backend_llm
+
+    inicio = time.perf_counter()
+    for nome in agentes_registrados():
+        obter_agente(nome)
+    obter_backend_llm().preaquecer()
+    duracao = time.perf_counter() - inicio
+    print(f"[Agentes] {len(_agentes)} agentes construídos e backend de LLM carregado em {duracao:.2f}s.")
+    return duracao
@@ -1,24 +1,72 @@
-from google.adk.agents import Agent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types as genai_types
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, AsyncIterator
+
+from app.core.rate_limiter import obter_limitador_llm
+from app.core.metricas import DURACAO_CHAMADA_LLM, ESPERA_LIMITADOR
+from app.agents.backends_llm import (
+    USER_ID_PADRAO,
+    obter_backend_llm,
+    obter_runner,
+    limpar_pool_de_runners
+)
+
+if TYPE_CHECKING:
+    from google.adk.agents import Agent
 
 def call_agent(agent: Agent, message_text: str, app_name: str = "gemini_job_search") -> str:
     """
     Envia uma mensagem para um agente e retorna a resposta final como string.
+    A execução fica a cargo do backend configurado em LLM_BACKEND (ver app/agents/backends_llm.py).
+    Chamadas que consomem a cota da API passam antes pelo limitador compartilhado de requisições ao LLM.
+    A espera no limitador e a duração da chamada são registradas em app/core/metricas.py.
+    """
+    backend = obter_backend_llm()
+    if backend.usa_api_real:
+        ESPERA_LIMITADOR.observar(obter_limitador_llm().adquirir())
+
+    inicio = time.perf_counter()
+    status = "erro"
+    try:
+        resposta = backend.responder(agent, message_text, app_name)
+        status = "ok"
+        return resposta
+    finally:
+        DURACAO_CHAMADA_LLM.observar(time.perf_counter() - inicio, agente=agent.name, status=status)
+
+async def call_agent_async(agent: Agent, message_text: str, app_name: str = "gemini_job_search") -> str:
     """
-    session_service = InMemorySessionService()
-    session = session_service.create_session(app_name=app_name, user_id="user_default", session_id="session_default")
-    runner = Runner(agent=agent, app_name=app_name, session_service=session_service)
-
-    content = genai_types.Content(role="user", parts=[genai_types.Part(text=message_text)])
-
-    final_response_text = ""
-    for event in runner.run(user_id="user_default", session_id="session_default", new_message=content):
-        if event.is_final_response():
-            for part in event.content.parts:
-                if part.text is not None:
-                    final_response_text += part.text
-                    if not final_response_text.endswith("\n"):
-                         final_response_text += " "
-    return final_response_text.strip()
\ No newline at end of file
+    Versão assíncrona de `call_agent`: a espera no limitador e a chamada ao backend acontecem no
+    event loop atual, então centenas de chamadas podem ficar em andamento sem uma thread para cada.
+    """
+    backend = obter_backend_llm()
+    if backend.usa_api_real:
+        ESPERA_LIMITADOR.observar(await obter_limitador_llm().adquirir_async())
+
+    inicio = time.perf_counter()
+    status = "erro"
+    try:
+        resposta = await backend.responder_async(agent, message_text, app_name)
+        status = "ok"
+        return resposta
+    finally:
+        DURACAO_CHAMADA_LLM.observar(time.perf_counter() - inicio, agente=agent.name, status=status)
+
+async def call_agent_em_partes_async(agent: Agent, message_text: str, app_name: str = "gemini_job_search") -> AsyncIterator[str]:
+    """
+    Versão em streaming de `call_agent_async`: entrega o texto da resposta em partes, assim que o
+    backend as produz, em vez de esperar a resposta completa. Concatenadas, as partes formam a resposta.
+    """
+    backend = obter_backend_llm()
+    if backend.usa_api_real:
+        ESPERA_LIMITADOR.observar(await obter_limitador_llm().adquirir_async())
+
+    inicio = time.perf_counter()
+    status = "erro"
+    try:
+        async for parte in backend.responder_em_partes_async(agent, message_text, app_name):
+            yield parte
+        status = "ok"
+    finally:
+        DURACAO_CHAMADA_LLM.observar(time.perf_counter() - inicio, agente=agent.name, status=status)
@@ -0,0 +1,293 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+def normalizar_chave(texto: str) -> str:
+    """Normaliza um texto para uso como chave de cache: sem acentos, minúsculo e com espaços colapsados."""
+    sem_acentos = unicodedata.normalize("NFKD", texto or "")
+    sem_acentos = "".join(c for c in sem_acentos if not unicodedata.combining(c))
+    return " ".join(sem_acentos.lower().split())
+
+class CacheSQLite:
+    """
+    Cache chave -> valor (serializado em JSON) persistido em um arquivo SQLite,
+    com expiração por TTL e remoção LRU quando o número de entradas passa de `max_entradas`.
+    """
+
+    def __init__(self, caminho_arquivo: str, ttl_segundos: float | None = None, max_entradas: int = 1000):
+        diretorio = os.path.dirname(os.path.abspath(caminho_arquivo))
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho_arquivo = caminho_arquivo
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho_arquivo, check_same_thread=False)
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "chave TEXT PRIMARY KEY, valor TEXT NOT NULL, criado_em REAL NOT NULL, ultimo_acesso REAL NOT NULL)"
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_cache_ultimo_acesso ON cache (ultimo_acesso)")
+
+    def _expirado(self, criado_em: float, agora: float) -> bool:
+        return self.ttl_segundos is not None and agora - criado_em > self.ttl_segundos
+
+    def obter(self, chave: str):
+        agora = time.time()
+        with self._lock, self._conexao:
+            linha = self._conexao.execute("SELECT valor, criado_em FROM cache WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                return None
+            valor, criado_em = linha
+            if self._expirado(criado_em, agora):
+                self._conexao.execute("DELETE FROM cache WHERE chave = ?", (chave,))
+                return None
+            self._conexao.execute("UPDATE cache SET ultimo_acesso = ? WHERE chave = ?", (agora, chave))
+        return json.loads(valor)
+
+    def contem(self, chave: str) -> bool:
+        with self._lock:
+            linha = self._conexao.execute("SELECT criado_em FROM cache WHERE chave = ?", (chave,)).fetchone()
+        return linha is not None and not self._expirado(linha[0], time.time())
+
+    def definir(self, chave: str, valor):
+        agora = time.time()
+        valor_json = json.dumps(valor, ensure_ascii=False)
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO cache (chave, valor, criado_em, ultimo_acesso) VALUES (?, ?, ?, ?)",
+                (chave, valor_json, agora, agora)
+            )
+            total = self._conexao.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if total > self.max_entradas:
+                self._conexao.execute(
+                    "DELETE FROM cache WHERE chave IN (SELECT chave FROM cache ORDER BY ultimo_acesso ASC LIMIT ?)",
+                    (total - self.max_entradas,)
+                )
+
+    def remover_expirados(self) -> int:
+        if self.ttl_segundos is None:
+            return 0
+        with self._lock, self._conexao:
+            cursor = self._conexao.execute("DELETE FROM cache WHERE criado_em < ?", (time.time() - self.ttl_segundos,))
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+class CacheMemoria:
+    """Cache LRU em memória, thread-safe, com TTL opcional."""
+
+    def __init__(self, max_entradas: int = 1000, ttl_segundos: float | None = None):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._entradas: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            criado_em, valor = entrada
+            if self.ttl_segundos is not None and time.monotonic() - criado_em > self.ttl_segundos:
+                del self._entradas[chave]
+                return None
+            self._entradas.move_to_end(chave)
+            return valor
+
+    def definir(self, chave: str, valor):
+        with self._lock:
+            self._entradas[chave] = (time.monotonic(), valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+class CacheEmCamadas:
+    """
+    Combina um CacheMemoria com um CacheSQLite opcional. Acertos no disco são
+    promovidos para a memória. Mantém contadores de acertos e falhas.
+    """
+
+    def __init__(self, memoria: CacheMemoria, disco: CacheSQLite | None = None):
+        self.memoria = memoria
+        self.disco = disco
+        self._lock_contadores = threading.Lock()
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+
+    def obter(self, chave: str):
+        valor = self.memoria.obter(chave)
+        if valor is not None:
+            with self._lock_contadores:
+                self.acertos_memoria += 1
+            return valor
+        if self.disco is not None:
+            valor = self.disco.obter(chave)
+            if valor is not None:
+                self.memoria.definir(chave, valor)
+                with self._lock_contadores:
+                    self.acertos_disco += 1
+                return valor
+        with self._lock_contadores:
+            self.falhas += 1
+        return None
+
+    def definir(self, chave: str, valor):
+        self.memoria.definir(chave, valor)
+        if self.disco is not None:
+            self.disco.definir(chave, valor)
+
+    def estatisticas(self) -> dict:
+        with self._lock_contadores:
+            acertos = self.acertos_memoria + self.acertos_disco
+            total = acertos + self.falhas
+            return {
+                "acertos": acertos,
+                "acertos_memoria": self.acertos_memoria,
+                "acertos_disco": self.acertos_disco,
+                "falhas": self.falhas,
+                "taxa_acerto": (acertos / total) if total else 0.0,
+                "entradas_memoria": len(self.memoria),
+                "entradas_disco": len(self.disco) if self.disco is not None else 0,
+            }
+
+class CalculoEmAndamento:
+    """
+    Future de um cálculo do `CacheComRevalidacao` e o progresso que ele publica. Quem aguarda o
+    cálculo recebe os eventos já publicados e os seguintes, na ordem em que foram publicados.
+    """
+
+    def __init__(self):
+        self.futuro = Future()
+        self._eventos: list = []
+        self._ouvintes: list[Callable[[object], None]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _notificar(ouvinte: Callable[[object], None], evento):
+        try:
+            ouvinte(evento)
+        except Exception as e:
+            print(f"[Cache] Erro ao repassar o progresso de um cálculo: {e}")
+
+    def publicar(self, evento):
+        with self._lock:
+            self._eventos.append(evento)
+            for ouvinte in self._ouvintes:
+                self._notificar(ouvinte, evento)
+
+    def acompanhar(self, ouvinte: Callable[[object], None]):
+        with self._lock:
+            for evento in self._eventos:
+                self._notificar(ouvinte, evento)
+            self._ouvintes.append(ouvinte)
+
+    def deixar_de_acompanhar(self, ouvinte: Callable[[object], None]):
+        with self._lock:
+            if ouvinte in self._ouvintes:
+                self._ouvintes.remove(ouvinte)
+
+class CacheComRevalidacao:
+    """
+    Cache em memória para resultados caros de calcular, com stale-while-revalidate:
+    - até `ttl_segundos`, o valor é servido direto ("fresco");
+    - até `ttl_segundos + janela_stale_segundos`, o valor antigo é servido na hora ("stale")
+      e um recálculo é disparado em background;
+    - depois disso (ou sem valor), o cálculo roda na thread que chamou ("calculado").
+    Chamadas simultâneas para a mesma chave aguardam um único cálculo ("coalescido").
+
+    `calcular` recebe a função `publicar(evento)` do próprio cálculo e não deve depender de quem
+    o pediu: o mesmo cálculo atende chamadas coalescidas e pode rodar em background. Quem passa
+    `ouvinte` recebe o progresso do cálculo que aguarda ("calculado" ou "coalescido").
+    """
+
+    def __init__(self, ttl_segundos: float, janela_stale_segundos: float = 0, max_entradas: int = 200, max_revalidacoes_simultaneas: int = 2):
+        self.ttl_segundos = ttl_segundos
+        self.janela_stale_segundos = janela_stale_segundos
+        self.max_entradas = max_entradas
+        self._entradas: OrderedDict[object, tuple[float, object]] = OrderedDict()
+        self._em_andamento: dict[object, CalculoEmAndamento] = {}
+        self._lock = threading.Lock()
+        self._executor_revalidacao = ThreadPoolExecutor(max_workers=max_revalidacoes_simultaneas, thread_name_prefix="revalidacao-cache")
+
+    def _armazenar(self, chave, valor):
+        with self._lock:
+            self._entradas[chave] = (time.monotonic(), valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def _executar_calculo(self, chave, calcular: Callable[[Callable[[object], None]], object], calculo: CalculoEmAndamento):
+        try:
+            valor = calcular(calculo.publicar)
+        except BaseException as e:
+            calculo.futuro.set_exception(e)
+            raise
+        else:
+            self._armazenar(chave, valor)
+            calculo.futuro.set_result(valor)
+            return valor
+        finally:
+            with self._lock:
+                if self._em_andamento.get(chave) is calculo:
+                    del self._em_andamento[chave]
+
+    def _revalidar_em_background(self, chave, calcular: Callable[[Callable[[object], None]], object], calculo: CalculoEmAndamento):
+        try:
+            self._executar_calculo(chave, calcular, calculo)
+        except Exception as e:
+            print(f"[Cache] Falha ao revalidar a chave {chave!r} em background: {e}")
+
+    def obter_ou_calcular(self, chave, calcular: Callable[[Callable[[object], None]], object],
+                          ouvinte: Callable[[object], None] | None = None) -> tuple[object, str]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                criado_em, valor = entrada
+                idade = time.monotonic() - criado_em
+                if idade <= self.ttl_segundos:
+                    self._entradas.move_to_end(chave)
+                    return valor, "fresco"
+                if idade <= self.ttl_segundos + self.janela_stale_segundos:
+                    if chave not in self._em_andamento:
+                        calculo_revalidacao = CalculoEmAndamento()
+                        self._em_andamento[chave] = calculo_revalidacao
+                        self._executor_revalidacao.submit(self._revalidar_em_background, chave, calcular, calculo_revalidacao)
+                    return valor, "stale"
+                del self._entradas[chave]
+
+            calculo = self._em_andamento.get(chave)
+            responsavel_pelo_calculo = calculo is None
+            if responsavel_pelo_calculo:
+                calculo = CalculoEmAndamento()
+                self._em_andamento[chave] = calculo
+            if ouvinte is not None:
+                calculo.acompanhar(ouvinte)
+
+        try:
+            if responsavel_pelo_calculo:
+                return self._executar_calculo(chave, calcular, calculo), "calculado"
+            return calculo.futuro.result(), "coalescido"
+        finally:
+            if ouvinte is not None:
+                calculo.deixar_de_acompanhar(ouvinte)
+
+    def invalidar(self, chave):
+        with self._lock:
+            self._entradas.pop(chave, None)
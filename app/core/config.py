@@ -5,8 +5,61 @@ load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-if not GOOGLE_API_KEY:
-    raise ValueError("A variável de ambiente GOOGLE_API_KEY não foi configurada. "
-                     "Por favor, crie um arquivo .env e adicione GOOGLE_API_KEY=SUA_CHAVE_AQUI")
+DEFAULT_MODEL_ID = "gemini-2.0-flash"
 
-DEFAULT_MODEL_ID = "gemini-2.0-flash"
\ No newline at end of file
+# Orçamento compartilhado de chamadas ao LLM (free tier do Gemini: ~15 requisições por minuto).
+LLM_REQUISICOES_POR_MINUTO = float(os.getenv("LLM_REQUISICOES_POR_MINUTO", "14"))
+LLM_RAJADA_MAXIMA = int(os.getenv("LLM_RAJADA_MAXIMA", "1"))
+# Lotes de parse enviados ao LLM ao mesmo tempo no caminho síncrono (threads).
+MAX_PARSES_SIMULTANEOS = int(os.getenv("MAX_PARSES_SIMULTANEOS", "4"))
+
+# Diretório dos caches persistentes em disco (cidades próximas, parse de vagas etc.).
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache"))
+PREAQUECER_CACHE_CIDADES_PROXIMAS = os.getenv("PREAQUECER_CACHE_CIDADES_PROXIMAS", "1") == "1"
+
+# Cache do parse de vagas: camada em memória sempre ativa, camada SQLite opcional.
+CACHE_PARSE_MAX_ENTRADAS_MEMORIA = int(os.getenv("CACHE_PARSE_MAX_ENTRADAS_MEMORIA", "5000"))
+CACHE_PARSE_SQLITE = os.getenv("CACHE_PARSE_SQLITE", "0") == "1"
+CACHE_PARSE_MAX_ENTRADAS_SQLITE = int(os.getenv("CACHE_PARSE_MAX_ENTRADAS_SQLITE", "50000"))
+
+# Cache de respostas de /api/buscar-vagas (stale-while-revalidate).
+CACHE_CONSULTAS_TTL_SEGUNDOS = float(os.getenv("CACHE_CONSULTAS_TTL_SEGUNDOS", "900"))
+CACHE_CONSULTAS_JANELA_STALE_SEGUNDOS = float(os.getenv("CACHE_CONSULTAS_JANELA_STALE_SEGUNDOS", "3600"))
+
+# API de jobs assíncronos (/api/jobs).
+MAX_WORKERS_JOBS = int(os.getenv("MAX_WORKERS_JOBS", "4"))
+MAX_JOBS_NA_FILA = int(os.getenv("MAX_JOBS_NA_FILA", "20"))
+TTL_JOBS_FINALIZADOS_SEGUNDOS = float(os.getenv("TTL_JOBS_FINALIZADOS_SEGUNDOS", "3600"))
+
+# Backend das chamadas ao LLM: "adk" (API real), "stub" (respostas locais determinísticas),
+# "gravar" (API real, salvando as respostas em disco) ou "replay" (reproduz as respostas gravadas).
+LLM_BACKEND = os.getenv("LLM_BACKEND", "adk").strip().lower()
+LLM_GRAVACOES_DIR = os.getenv("LLM_GRAVACOES_DIR", os.path.join(CACHE_DIR, "gravacoes_llm"))
+LLM_STUB_LATENCIA_SEGUNDOS = float(os.getenv("LLM_STUB_LATENCIA_SEGUNDOS", "0"))
+LLM_STUB_VARIACAO_LATENCIA_SEGUNDOS = float(os.getenv("LLM_STUB_VARIACAO_LATENCIA_SEGUNDOS", "0"))
+LLM_STUB_TAXA_FALHAS = float(os.getenv("LLM_STUB_TAXA_FALHAS", "0"))
+LLM_STUB_SEMENTE = int(os.getenv("LLM_STUB_SEMENTE", "42"))
+
+# A GOOGLE_API_KEY só é exigida pelos backends que chamam a API real.
+LLM_CONFIGURADO = bool(GOOGLE_API_KEY) or LLM_BACKEND in ("stub", "replay")
+
+# Constrói os agentes e carrega o google-adk na subida do servidor, e não na primeira requisição.
+PREAQUECER_AGENTES = os.getenv("PREAQUECER_AGENTES", "0") == "1"
+
+# Busca estruturada: os agentes de busca já devolvem um array JSON no esquema do consolidador,
+# dispensando o split heurístico e o parse de cada vaga pelo LLM.
+BUSCA_ESTRUTURADA = os.getenv("BUSCA_ESTRUTURADA", "0") == "1"
+
+# Índice local de vagas (SQLite + FTS5): responde consultas sem chamar os agentes quando possível.
+INDICE_VAGAS_ATIVO = os.getenv("INDICE_VAGAS_ATIVO", "1") == "1"
+INDICE_VAGAS_INTERVALO_BUSCA_AO_VIVO_SEGUNDOS = float(os.getenv("INDICE_VAGAS_INTERVALO_BUSCA_AO_VIVO_SEGUNDOS", "21600"))
+
+# Paginação por cursor dos resultados (limit/cursor em /api/buscar-vagas, /api/jobs e /api/resultados).
+PAGINACAO_LIMITE_PADRAO = int(os.getenv("PAGINACAO_LIMITE_PADRAO", "20"))
+PAGINACAO_LIMITE_MAXIMO = int(os.getenv("PAGINACAO_LIMITE_MAXIMO", "100"))
+RESULTADOS_PAGINADOS_TTL_SEGUNDOS = float(os.getenv("RESULTADOS_PAGINADOS_TTL_SEGUNDOS", "3600"))
+RESULTADOS_PAGINADOS_MAX = int(os.getenv("RESULTADOS_PAGINADOS_MAX", "200"))
+
+# Busca em lote (matriz de cargos × cidades em /api/buscar-vagas/lote e em `python -m app.main --cargos ... --cidades ...`).
+BUSCA_LOTE_MAX_COMBINACOES = int(os.getenv("BUSCA_LOTE_MAX_COMBINACOES", "500"))
+BUSCA_LOTE_MAX_COMBINACOES_SIMULTANEAS = int(os.getenv("BUSCA_LOTE_MAX_COMBINACOES_SIMULTANEAS", "8"))
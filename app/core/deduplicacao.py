@@ -0,0 +1,199 @@
+import random
+import re
+import threading
+import zlib
+from typing import Callable
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from app.core.cache import normalizar_chave
+
+# Sinônimos de senioridade e abreviações comuns em títulos de vagas.
+SINONIMOS_TITULO = {
+    "sr": "senior", "senior": "senior",
+    "jr": "junior", "junior": "junior",
+    "pl": "pleno", "pleno": "pleno",
+    "dev": "desenvolvedor", "desenvolvedora": "desenvolvedor",
+    "analista": "analista", "eng": "engenheiro", "engenheira": "engenheiro",
+}
+# Níveis de senioridade (já normalizados por SINONIMOS_TITULO): títulos com níveis diferentes são vagas diferentes.
+NIVEIS_SENIORIDADE = {
+    "estagio": "estagio", "estagiario": "estagio", "trainee": "trainee",
+    "junior": "junior", "pleno": "pleno", "senior": "senior",
+}
+SUFIXOS_EMPRESA = {"ltda", "sa", "s a", "me", "mei", "eireli", "epp", "inc", "ltd", "llc", "cia", "grupo"}
+PALAVRAS_IGNORADAS = {"de", "da", "do", "das", "dos", "e", "em", "para", "a", "o", "com", "vaga"}
+PARAMETROS_RASTREAMENTO_URL = {
+    "gclid", "fbclid", "msclkid", "ref", "refid", "ref_id", "trackingid", "tracking_id", "trk", "src",
+    "source", "origin", "from", "campaign", "mc_cid", "mc_eid", "si", "share", "shared_from",
+}
+# Páginas de busca de agregadores (ex.: indeed.com/jobs?q=..., linkedin.com/jobs/search?...) não identificam
+# uma vaga: só contam como link da vaga se tiverem um destes parâmetros com o id dela.
+SEGMENTOS_DE_BUSCA_URL = {"search", "busca", "buscar", "pesquisa", "jobs", "vagas", "empregos", "results", "resultados"}
+PARAMETROS_ID_VAGA_URL = {"jk", "vjk", "currentjobid", "jobid", "job_id", "vagaid", "vaga_id", "gh_jid", "id"}
+REGEX_NAO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+PRIMO_MINHASH = (1 << 61) - 1
+MAX_TOKENS_EM_CACHE_MINHASH = 200_000
+
+def tokens_normalizados(texto: str | None) -> list[str]:
+    return [t for t in REGEX_NAO_ALFANUMERICO.split(normalizar_chave(texto or "")) if t]
+
+def normalizar_titulo(titulo: str | None) -> str:
+    tokens = [SINONIMOS_TITULO.get(t, t) for t in tokens_normalizados(titulo)]
+    return " ".join(t for t in tokens if t not in PALAVRAS_IGNORADAS)
+
+def normalizar_empresa(empresa: str | None) -> str:
+    texto = " ".join(tokens_normalizados(empresa))
+    texto = re.sub(r"\bs a\b", "", texto)
+    return " ".join(t for t in texto.split() if t not in SUFIXOS_EMPRESA)
+
+def canonicalizar_url(url: str | None) -> str | None:
+    """
+    Canonicaliza um link de vaga (host sem 'www.', sem fragmento, sem parâmetros de rastreamento,
+    parâmetros ordenados). Retorna None para links ausentes ou genéricos demais para identificar
+    uma vaga (ex.: só o domínio de um agregador, ou uma página de busca sem o id de uma vaga).
+    """
+    if not url or "." not in url:
+        return None
+    url = url.strip().strip("<>")
+    if "://" not in url:
+        url = "https://" + url
+    try:
+        partes = urlsplit(url)
+    except ValueError:
+        return None
+    host = (partes.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    caminho = re.sub(r"/+", "/", partes.path).rstrip("/")
+    parametros = sorted(
+        (chave, valor) for chave, valor in parse_qsl(partes.query, keep_blank_values=False)
+        if not chave.lower().startswith("utm_") and chave.lower() not in PARAMETROS_RASTREAMENTO_URL
+    )
+    segmentos = [s for s in caminho.split("/") if s]
+    if len(segmentos) < 2 and not parametros:
+        return None
+    pagina_de_busca = any(s.lower() in SEGMENTOS_DE_BUSCA_URL for s in segmentos) \
+        and not any(c.isdigit() for s in segmentos for c in s)
+    if pagina_de_busca:
+        # Os demais parâmetros são os filtros da busca (cargo, cidade...), que variam para a mesma vaga.
+        parametros = [(chave, valor) for chave, valor in parametros if chave.lower() in PARAMETROS_ID_VAGA_URL]
+        if not parametros:
+            return None
+    return f"{host}{caminho}" + (f"?{urlencode(parametros)}" if parametros else "")
+
+def shingles_de_palavras(texto: str | None, tamanho: int = 3) -> set[str]:
+    tokens = tokens_normalizados(texto)
+    if len(tokens) <= tamanho:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + tamanho]) for i in range(len(tokens) - tamanho + 1)}
+
+def similaridade_jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def niveis_de_senioridade(titulo_normalizado: str) -> frozenset[str]:
+    return frozenset(NIVEIS_SENIORIDADE[t] for t in titulo_normalizado.split() if t in NIVEIS_SENIORIDADE)
+
+def senioridades_compativeis(titulo_a: str, titulo_b: str) -> bool:
+    """Falso só quando os dois títulos normalizados informam a senioridade e ela difere (ex.: junior × senior)."""
+    niveis_a, niveis_b = niveis_de_senioridade(titulo_a), niveis_de_senioridade(titulo_b)
+    return not niveis_a or not niveis_b or niveis_a == niveis_b
+
+def empresas_compativeis(empresa_a: str, empresa_b: str) -> bool:
+    """Empresas normalizadas iguais, ausentes em uma das vagas ou com o nome de uma contido no da outra."""
+    tokens_a, tokens_b = set(empresa_a.split()), set(empresa_b.split())
+    return tokens_a <= tokens_b or tokens_b <= tokens_a
+
+class DetectorDeDuplicatas:
+    """
+    Detecta quase-duplicatas em tempo sub-quadrático: cada item é identificado por um
+    conjunto de tokens, e só os candidatos que colidem em alguma banda do MinHash (LSH)
+    têm a similaridade de Jaccard calculada. Itens com a mesma chave exata ou o mesmo
+    link canônico são duplicatas diretas. Itens só são comparados dentro do mesmo `bloco`,
+    e `verificar_candidato`, se informado, confirma cada candidato acima do limiar ou com o mesmo link.
+    """
+
+    def __init__(self, limiar_similaridade: float = 0.8, num_permutacoes: int = 32, bandas: int = 8, semente: int = 42):
+        if num_permutacoes % bandas != 0:
+            raise ValueError("num_permutacoes deve ser múltiplo de bandas.")
+        self.limiar_similaridade = limiar_similaridade
+        self.bandas = bandas
+        self.linhas_por_banda = num_permutacoes // bandas
+        gerador = random.Random(semente)
+        self._permutacoes = [(gerador.randrange(1, PRIMO_MINHASH), gerador.randrange(0, PRIMO_MINHASH)) for _ in range(num_permutacoes)]
+        self._tokens_por_item: dict[object, frozenset] = {}
+        self._itens_por_chave_exata: dict[object, object] = {}
+        self._itens_por_link: dict[str, object] = {}
+        self._itens_por_balde: dict[tuple, list] = {}
+        self._vetores_por_token: dict[str, tuple[int, ...]] = {}
+        self._proximo_id_automatico = 0
+        self._lock = threading.Lock()
+
+    def _vetor_do_token(self, token: str) -> tuple[int, ...]:
+        # O vocabulário de títulos e descrições se repete muito; guardar o vetor de hashes
+        # permutados por token faz a assinatura virar um mínimo elemento a elemento.
+        vetor = self._vetores_por_token.get(token)
+        if vetor is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            vetor = tuple((a * h + b) % PRIMO_MINHASH for a, b in self._permutacoes)
+            if len(self._vetores_por_token) >= MAX_TOKENS_EM_CACHE_MINHASH:
+                self._vetores_por_token.clear()
+            self._vetores_por_token[token] = vetor
+        return vetor
+
+    def _assinatura(self, tokens: frozenset) -> list[int]:
+        if not tokens:
+            return list(self._vetor_do_token(""))
+        return list(map(min, *[self._vetor_do_token(t) for t in tokens])) if len(tokens) > 1 else list(self._vetor_do_token(next(iter(tokens))))
+
+    def _baldes(self, bloco, assinatura: list[int]) -> list[tuple]:
+        r = self.linhas_por_banda
+        return [(bloco, i, tuple(assinatura[i * r:(i + 1) * r])) for i in range(self.bandas)]
+
+    def encontrar_ou_adicionar(self, id_item, tokens: set[str], bloco=None, chave_exata=None, link_canonico: str | None = None,
+                               verificar_candidato: Callable[[object], bool] | None = None):
+        """
+        Retorna o id do item já registrado do qual `id_item` é duplicata, ou registra `id_item` e retorna None.
+        Com `id_item=None`, o detector atribui ao item um id sequencial próprio, sob o seu lock.
+        """
+        tokens = frozenset(tokens)
+        with self._lock:
+            if chave_exata is not None and (bloco, chave_exata) in self._itens_por_chave_exata:
+                return self._itens_por_chave_exata[(bloco, chave_exata)]
+            if link_canonico and link_canonico in self._itens_por_link:
+                candidato = self._itens_por_link[link_canonico]
+                if verificar_candidato is None or verificar_candidato(candidato):
+                    return candidato
+
+            baldes = self._baldes(bloco, self._assinatura(tokens))
+            candidatos_verificados = set()
+            for balde in baldes:
+                for candidato in self._itens_por_balde.get(balde, ()):
+                    if candidato in candidatos_verificados:
+                        continue
+                    candidatos_verificados.add(candidato)
+                    if similaridade_jaccard(tokens, self._tokens_por_item[candidato]) >= self.limiar_similaridade \
+                            and (verificar_candidato is None or verificar_candidato(candidato)):
+                        return candidato
+
+            if id_item is None:
+                id_item = ("auto", self._proximo_id_automatico)
+                self._proximo_id_automatico += 1
+            self._tokens_por_item[id_item] = tokens
+            if chave_exata is not None:
+                self._itens_por_chave_exata[(bloco, chave_exata)] = id_item
+            if link_canonico:
+                self._itens_por_link.setdefault(link_canonico, id_item)
+            for balde in baldes:
+                self._itens_por_balde.setdefault(balde, []).append(id_item)
+            return None
+
+    def __len__(self) -> int:
+        return len(self._tokens_por_item)
+
+def criar_detector_de_textos_duplicados(limiar_similaridade: float = 0.9) -> DetectorDeDuplicatas:
+    """Detector para textos brutos de vagas (antes do parse), comparando shingles de 3 palavras."""
+    return DetectorDeDuplicatas(limiar_similaridade=limiar_similaridade)
@@ -0,0 +1,214 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.core.config import CACHE_DIR
+from app.core.cache import normalizar_chave
+from app.core.deduplicacao import canonicalizar_url
+from app.core.vaga import Vaga, normalizar_local_base
+
+PALAVRAS_IGNORADAS_NA_CONSULTA = {"de", "da", "do", "das", "dos", "e", "em", "para", "a", "o"}
+
+def chave_vaga_no_indice(vaga: Vaga) -> str:
+    """
+    Identidade da vaga no índice: (título, empresa, cidade base) normalizados, como na consolidação,
+    mais o link canônico quando ele identifica a vaga (links de busca de agregadores são ignorados).
+    """
+    chave = "|".join((vaga.titulo_normalizado, vaga.empresa_normalizada, vaga.local_base))
+    link_canonico = canonicalizar_url(vaga.link)
+    return f"{chave}|{link_canonico}" if link_canonico else chave
+
+def chave_consulta_no_indice(cargo: str, cidade_principal: str, buscar_proximas: bool) -> str:
+    return f"{normalizar_chave(cargo)}|{normalizar_chave(cidade_principal)}|{int(bool(buscar_proximas))}"
+
+def _consulta_fts_por_cargo(cargo: str) -> str | None:
+    termos = [termo for termo in normalizar_chave(cargo).replace('"', ' ').split() if termo not in PALAVRAS_IGNORADAS_NA_CONSULTA]
+    if not termos:
+        return None
+    return "{titulo descricao_resumida} : (" + " OR ".join(f'"{termo}"' for termo in termos) + ")"
+
+class IndiceDeVagas:
+    """
+    Armazena em SQLite as vagas já processadas, com índice FTS5 sobre título, empresa e descrição,
+    a data normalizada, a cidade e quando cada vaga foi vista pela primeira e pela última vez.
+    Também registra quando cada consulta (cargo, cidade, próximas) foi buscada ao vivo pela última vez,
+    para decidir se uma nova busca pelos agentes ainda é necessária.
+    """
+
+    def __init__(self, caminho_arquivo: str):
+        diretorio = os.path.dirname(os.path.abspath(caminho_arquivo))
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho_arquivo = caminho_arquivo
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho_arquivo, check_same_thread=False)
+        with self._lock, self._conexao:
+            self._conexao.executescript("""
+                CREATE TABLE IF NOT EXISTS vagas (
+                    id INTEGER PRIMARY KEY,
+                    chave TEXT NOT NULL UNIQUE,
+                    titulo TEXT NOT NULL,
+                    empresa TEXT,
+                    descricao_resumida TEXT,
+                    localizacao TEXT,
+                    local_normalizado TEXT NOT NULL,
+                    data_normalizada TEXT,
+                    dados TEXT NOT NULL,
+                    primeira_vez_vista REAL NOT NULL,
+                    ultima_vez_vista REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_vagas_local ON vagas (local_normalizado);
+                CREATE INDEX IF NOT EXISTS idx_vagas_data ON vagas (data_normalizada);
+                CREATE VIRTUAL TABLE IF NOT EXISTS vagas_fts USING fts5(
+                    titulo, empresa, descricao_resumida,
+                    content='vagas', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                );
+                CREATE TRIGGER IF NOT EXISTS vagas_ai AFTER INSERT ON vagas BEGIN
+                    INSERT INTO vagas_fts(rowid, titulo, empresa, descricao_resumida)
+                    VALUES (new.id, new.titulo, new.empresa, new.descricao_resumida);
+                END;
+                CREATE TRIGGER IF NOT EXISTS vagas_ad AFTER DELETE ON vagas BEGIN
+                    INSERT INTO vagas_fts(vagas_fts, rowid, titulo, empresa, descricao_resumida)
+                    VALUES ('delete', old.id, old.titulo, old.empresa, old.descricao_resumida);
+                END;
+                CREATE TRIGGER IF NOT EXISTS vagas_au AFTER UPDATE ON vagas BEGIN
+                    INSERT INTO vagas_fts(vagas_fts, rowid, titulo, empresa, descricao_resumida)
+                    VALUES ('delete', old.id, old.titulo, old.empresa, old.descricao_resumida);
+                    INSERT INTO vagas_fts(rowid, titulo, empresa, descricao_resumida)
+                    VALUES (new.id, new.titulo, new.empresa, new.descricao_resumida);
+                END;
+                CREATE TABLE IF NOT EXISTS parses_execucoes (
+                    chave_consulta TEXT NOT NULL,
+                    impressao TEXT NOT NULL,
+                    texto TEXT NOT NULL,
+                    vaga TEXT NOT NULL,
+                    PRIMARY KEY (chave_consulta, impressao)
+                );
+                CREATE TABLE IF NOT EXISTS consultas (
+                    chave TEXT PRIMARY KEY,
+                    ultima_busca_ao_vivo REAL NOT NULL,
+                    total_vagas INTEGER NOT NULL
+                );
+            """)
+
+    def registrar_vagas(self, vagas: list[Vaga], agora: float | None = None) -> int:
+        """Insere ou atualiza as vagas (mantendo a data em que cada uma foi vista pela primeira vez). Retorna quantas eram novas."""
+        agora = time.time() if agora is None else agora
+        novas = 0
+        with self._lock, self._conexao:
+            for vaga in vagas:
+                dados = vaga.para_dict()
+                dados.pop('nova', None)
+                dados['data_normalizada'] = vaga.data_normalizada.isoformat() if vaga.data_normalizada else None
+                cursor = self._conexao.execute(
+                    "INSERT INTO vagas (chave, titulo, empresa, descricao_resumida, localizacao, local_normalizado, "
+                    "data_normalizada, dados, primeira_vez_vista, ultima_vez_vista) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(chave) DO UPDATE SET titulo = excluded.titulo, empresa = excluded.empresa, "
+                    "descricao_resumida = excluded.descricao_resumida, localizacao = excluded.localizacao, "
+                    "local_normalizado = excluded.local_normalizado, dados = excluded.dados, "
+                    "data_normalizada = COALESCE(excluded.data_normalizada, vagas.data_normalizada), "
+                    "ultima_vez_vista = excluded.ultima_vez_vista "
+                    "RETURNING primeira_vez_vista",
+                    (
+                        chave_vaga_no_indice(vaga), vaga.titulo, vaga.empresa, vaga.descricao_resumida,
+                        vaga.localizacao, vaga.local_base, dados['data_normalizada'],
+                        json.dumps(dados, ensure_ascii=False), agora, agora
+                    )
+                )
+                if cursor.fetchone()[0] == agora:
+                    novas += 1
+        return novas
+
+    def registrar_busca_ao_vivo(self, cargo: str, cidade_principal: str, buscar_proximas: bool, total_vagas: int, agora: float | None = None):
+        agora = time.time() if agora is None else agora
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO consultas (chave, ultima_busca_ao_vivo, total_vagas) VALUES (?, ?, ?)",
+                (chave_consulta_no_indice(cargo, cidade_principal, buscar_proximas), agora, total_vagas)
+            )
+
+    def segundos_desde_ultima_busca_ao_vivo(self, cargo: str, cidade_principal: str, buscar_proximas: bool) -> float | None:
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT ultima_busca_ao_vivo FROM consultas WHERE chave = ?",
+                (chave_consulta_no_indice(cargo, cidade_principal, buscar_proximas),)
+            ).fetchone()
+        return None if linha is None else time.time() - linha[0]
+
+    def obter_parses_da_ultima_execucao(self, cargo: str, cidade_principal: str, buscar_proximas: bool) -> dict[str, tuple[str, dict]]:
+        """Parses da última execução ao vivo da consulta: impressão digital do texto bruto -> (texto, vaga parseada)."""
+        with self._lock:
+            linhas = self._conexao.execute(
+                "SELECT impressao, texto, vaga FROM parses_execucoes WHERE chave_consulta = ?",
+                (chave_consulta_no_indice(cargo, cidade_principal, buscar_proximas),)
+            ).fetchall()
+        return {impressao: (texto, json.loads(vaga)) for impressao, texto, vaga in linhas}
+
+    def salvar_parses_da_execucao(self, cargo: str, cidade_principal: str, buscar_proximas: bool, parses: dict[str, tuple[str, dict]]):
+        """Substitui os parses guardados da consulta pelos da execução atual."""
+        chave_consulta = chave_consulta_no_indice(cargo, cidade_principal, buscar_proximas)
+        with self._lock, self._conexao:
+            self._conexao.execute("DELETE FROM parses_execucoes WHERE chave_consulta = ?", (chave_consulta,))
+            self._conexao.executemany(
+                "INSERT INTO parses_execucoes (chave_consulta, impressao, texto, vaga) VALUES (?, ?, ?, ?)",
+                [
+                    (chave_consulta, impressao, texto, json.dumps(vaga, ensure_ascii=False))
+                    for impressao, (texto, vaga) in parses.items()
+                ]
+            )
+
+    def buscar(self, cargo: str, cidades: list[str], limite: int = 200) -> list[Vaga]:
+        """
+        Vagas com algum termo do cargo no título ou na descrição, localizadas em uma das cidades,
+        mais recentes primeiro (a busca ao vivo também traz vagas que não repetem o cargo inteiro no título).
+        """
+        consulta_fts = _consulta_fts_por_cargo(cargo)
+        locais = sorted({normalizar_local_base(cidade) for cidade in cidades if cidade})
+        if not consulta_fts or not locais:
+            return []
+        marcadores = ", ".join("?" for _ in locais)
+        with self._lock:
+            linhas = self._conexao.execute(
+                "SELECT vagas.dados FROM vagas_fts JOIN vagas ON vagas.id = vagas_fts.rowid "
+                f"WHERE vagas_fts MATCH ? AND vagas.local_normalizado IN ({marcadores}) "
+                "ORDER BY vagas.data_normalizada IS NULL, vagas.data_normalizada DESC, vagas.ultima_vez_vista DESC LIMIT ?",
+                (consulta_fts, *locais, limite)
+            ).fetchall()
+        vagas = []
+        for (dados,) in linhas:
+            dados_vaga = json.loads(dados)
+            data_normalizada = dados_vaga.get('data_normalizada')
+            vagas.append(Vaga.de_dict(dados_vaga, data_normalizada=datetime.fromisoformat(data_normalizada) if data_normalizada else None))
+        return vagas
+
+    def remover_antigas(self, data_referencia: datetime, limite_dias: int) -> int:
+        """
+        Remove vagas com data normalizada anterior a `limite_dias` antes de `data_referencia` e,
+        entre as sem data, as que não são vistas em uma busca há mais de `limite_dias`.
+        """
+        data_limite = (data_referencia - timedelta(days=limite_dias)).isoformat()
+        visto_limite = time.time() - limite_dias * 24 * 60 * 60
+        with self._lock, self._conexao:
+            cursor = self._conexao.execute(
+                "DELETE FROM vagas WHERE (data_normalizada IS NOT NULL AND data_normalizada < ?) "
+                "OR (data_normalizada IS NULL AND ultima_vez_vista < ?)",
+                (data_limite, visto_limite)
+            )
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM vagas").fetchone()[0]
+
+_indice_vagas: IndiceDeVagas | None = None
+_indice_vagas_lock = threading.Lock()
+
+def obter_indice_vagas() -> IndiceDeVagas:
+    global _indice_vagas
+    if _indice_vagas is None:
+        with _indice_vagas_lock:
+            if _indice_vagas is None:
+                _indice_vagas = IndiceDeVagas(os.path.join(CACHE_DIR, "vagas.sqlite3"))
+    return _indice_vagas
@@ -0,0 +1,172 @@
+import bisect
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from app.core.vaga import Vaga
+
+STATUS_NA_FILA = "na_fila"
+STATUS_EXECUTANDO = "executando"
+STATUS_CONCLUIDO = "concluido"
+STATUS_ERRO = "erro"
+
+EVENTO_ETAPA = "etapa"
+EVENTO_VAGA = "vaga"
+EVENTO_FINAL = "final"
+EVENTO_ERRO = "erro"
+
+class FilaDeJobsCheiaError(Exception):
+    pass
+
+class Job:
+    """
+    Estado de uma busca em background. Além do estado atual, o job guarda a
+    sequência de eventos (etapa, vaga, final/erro) para quem acompanha por streaming.
+    Se `chave_ordenacao` for informada, cada vaga parcial recebe um rank provisório
+    (0 = primeira posição) considerando ordem decrescente dessa chave.
+    """
+
+    def __init__(self, parametros: dict, chave_ordenacao: Callable[[Vaga], object] | None = None):
+        self.id = uuid.uuid4().hex
+        self.parametros = parametros
+        self.status = STATUS_NA_FILA
+        self.etapa = None
+        self.vagas_parciais: list[Vaga] = []
+        self.vagas: list[Vaga] | None = None
+        self.mensagem = None
+        self.erro = None
+        self.criado_em = time.time()
+        self.atualizado_em = self.criado_em
+        self.eventos: list[tuple[str, dict]] = []
+        self._chave_ordenacao = chave_ordenacao
+        self._chaves_parciais_ordenadas: list = []
+        self._lock = threading.Condition()
+
+    def _registrar_evento(self, tipo: str, dados: dict):
+        # Deve ser chamado com self._lock adquirido.
+        self.eventos.append((tipo, dados))
+        self.atualizado_em = time.time()
+        self._lock.notify_all()
+
+    def atualizar_etapa(self, etapa: str):
+        with self._lock:
+            if etapa == self.etapa:
+                return
+            self.etapa = etapa
+            self._registrar_evento(EVENTO_ETAPA, {"etapa": etapa})
+
+    def adicionar_vaga_parcial(self, vaga: Vaga):
+        with self._lock:
+            self.vagas_parciais.append(vaga)
+            rank_provisorio = len(self.vagas_parciais) - 1
+            if self._chave_ordenacao:
+                chave = self._chave_ordenacao(vaga)
+                posicao = bisect.bisect_right(self._chaves_parciais_ordenadas, chave)
+                rank_provisorio = len(self._chaves_parciais_ordenadas) - posicao
+                self._chaves_parciais_ordenadas.insert(posicao, chave)
+            self._registrar_evento(EVENTO_VAGA, {
+                "vaga": vaga,
+                "rank_provisorio": rank_provisorio,
+                "total_vagas_parciais": len(self.vagas_parciais)
+            })
+
+    def concluir(self, mensagem: str, vagas: list[Vaga]):
+        with self._lock:
+            self.mensagem = mensagem
+            self.vagas = vagas
+            self.status = STATUS_CONCLUIDO
+            self._registrar_evento(EVENTO_FINAL, {"mensagem": mensagem, "vagas": vagas})
+
+    def falhar(self, erro: str):
+        with self._lock:
+            self.erro = erro
+            self.status = STATUS_ERRO
+            self._registrar_evento(EVENTO_ERRO, {"erro": erro})
+
+    def aguardar_eventos(self, a_partir_de: int, timeout: float) -> list[tuple[int, str, dict]]:
+        """Retorna os eventos com índice >= `a_partir_de`, esperando até `timeout` segundos se ainda não houver nenhum."""
+        with self._lock:
+            if len(self.eventos) <= a_partir_de and not self.finalizado():
+                self._lock.wait(timeout)
+            return [(i, tipo, dados) for i, (tipo, dados) in enumerate(self.eventos[a_partir_de:], start=a_partir_de)]
+
+    def finalizado(self) -> bool:
+        return self.status in (STATUS_CONCLUIDO, STATUS_ERRO)
+
+    def para_dict(self, incluir_parciais: bool = True) -> dict:
+        with self._lock:
+            dados = {
+                "id": self.id,
+                "status": self.status,
+                "etapa": self.etapa,
+                "parametros": self.parametros,
+                "total_vagas_parciais": len(self.vagas_parciais),
+                "criado_em": self.criado_em,
+                "atualizado_em": self.atualizado_em,
+            }
+            if incluir_parciais and self.vagas is None:
+                dados["vagas_parciais"] = list(self.vagas_parciais)
+            if self.vagas is not None:
+                dados["vagas"] = self.vagas
+            if self.mensagem:
+                dados["mensagem"] = self.mensagem
+            if self.erro:
+                dados["erro"] = self.erro
+            return dados
+
+class GerenciadorDeJobs:
+    """
+    Executa jobs em um pool de threads limitado. Quando já há `max_workers + max_fila`
+    jobs pendentes, novas submissões são recusadas com FilaDeJobsCheiaError.
+    Jobs finalizados são descartados depois de `ttl_jobs_finalizados_segundos`.
+    """
+
+    def __init__(self, max_workers: int, max_fila: int, ttl_jobs_finalizados_segundos: float):
+        self.max_workers = max_workers
+        self.max_fila = max_fila
+        self.ttl_jobs_finalizados_segundos = ttl_jobs_finalizados_segundos
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-busca")
+        self._jobs: dict[str, Job] = {}
+        self._pendentes = 0
+        self._lock = threading.Lock()
+
+    def _remover_jobs_expirados(self):
+        limite = time.time() - self.ttl_jobs_finalizados_segundos
+        for job_id in [j.id for j in self._jobs.values() if j.finalizado() and j.atualizado_em < limite]:
+            del self._jobs[job_id]
+
+    def submeter(self, parametros: dict, funcao: Callable[[Job], tuple[str, list[Vaga]]], chave_ordenacao: Callable[[Vaga], object] | None = None) -> Job:
+        """`funcao` recebe o Job (para reportar progresso) e retorna (mensagem, vagas)."""
+        with self._lock:
+            self._remover_jobs_expirados()
+            if self._pendentes >= self.max_workers + self.max_fila:
+                raise FilaDeJobsCheiaError(f"Limite de {self.max_workers + self.max_fila} buscas pendentes atingido.")
+            job = Job(parametros, chave_ordenacao)
+            self._jobs[job.id] = job
+            self._pendentes += 1
+        self._executor.submit(self._executar, job, funcao)
+        return job
+
+    def _executar(self, job: Job, funcao: Callable[[Job], tuple[str, list[Vaga]]]):
+        job.status = STATUS_EXECUTANDO
+        try:
+            mensagem, vagas = funcao(job)
+            job.concluir(mensagem, vagas)
+        except Exception as e:
+            print(f"[Jobs] Erro no job {job.id}: {type(e).__name__}: {e}")
+            print(traceback.format_exc())
+            job.falhar("Ocorreu um erro interno no servidor ao processar sua busca.")
+        finally:
+            with self._lock:
+                self._pendentes -= 1
+
+    def obter(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def total_pendentes(self) -> int:
+        with self._lock:
+            return self._pendentes
@@ -0,0 +1,197 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+BUCKETS_DURACAO_PADRAO = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+def _escapar_valor_rotulo(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatar_rotulos(nomes: tuple[str, ...], valores: tuple, extras: tuple[tuple[str, str], ...] = ()) -> str:
+    pares = list(zip(nomes, valores)) + list(extras)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nome}="{_escapar_valor_rotulo(valor)}"' for nome, valor in pares) + "}"
+
+def _formatar_numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+class Contador:
+    """Contador monotônico com rótulos, exportado no formato texto do Prometheus."""
+
+    def __init__(self, nome: str, descricao: str, rotulos: tuple[str, ...] = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self._valores: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def incrementar(self, valor: float = 1, **rotulos):
+        if valor < 0:
+            raise ValueError("Contadores só podem ser incrementados com valores não negativos.")
+        chave = tuple(rotulos.get(nome, "") for nome in self.rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos) -> float:
+        chave = tuple(rotulos.get(nome, "") for nome in self.rotulos)
+        with self._lock:
+            return self._valores.get(chave, 0)
+
+    def exportar(self) -> list[str]:
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} counter"]
+        with self._lock:
+            for chave, valor in sorted(self._valores.items()):
+                linhas.append(f"{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(valor)}")
+        return linhas
+
+class Histograma:
+    """Histograma com buckets fixos e rótulos, exportado no formato texto do Prometheus."""
+
+    def __init__(self, nome: str, descricao: str, rotulos: tuple[str, ...] = (), buckets: tuple[float, ...] = BUCKETS_DURACAO_PADRAO):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, **rotulos):
+        chave = tuple(rotulos.get(nome, "") for nome in self.rotulos)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = [[0] * len(self.buckets), 0.0, 0]
+                self._series[chave] = serie
+            contagens = serie[0]
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    contagens[i] += 1
+                    break
+            serie[1] += valor
+            serie[2] += 1
+
+    def exportar(self) -> list[str]:
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} histogram"]
+        with self._lock:
+            for chave, (contagens, soma, total) in sorted(self._series.items()):
+                acumulado = 0
+                for limite, contagem in zip(self.buckets, contagens):
+                    acumulado += contagem
+                    rotulos = _formatar_rotulos(self.rotulos, chave, (("le", _formatar_numero(limite)),))
+                    linhas.append(f"{self.nome}_bucket{rotulos} {acumulado}")
+                rotulos = _formatar_rotulos(self.rotulos, chave)
+                linhas.append(f"{self.nome}_sum{rotulos} {_formatar_numero(soma)}")
+                linhas.append(f"{self.nome}_count{rotulos} {total}")
+        return linhas
+
+class MetricaColetada:
+    """
+    Métrica cujos valores são lidos de uma função no momento da exportação, para expor
+    contadores mantidos fora do registro (como os de um cache). `coletar` devolve um dict
+    de tupla de valores de rótulos para o valor.
+    """
+
+    def __init__(self, nome: str, descricao: str, tipo: str, coletar: Callable[[], dict[tuple, float]], rotulos: tuple[str, ...] = ()):
+        if tipo not in ("counter", "gauge"):
+            raise ValueError("Métricas coletadas devem ser do tipo 'counter' ou 'gauge'.")
+        self.nome = nome
+        self.descricao = descricao
+        self.tipo = tipo
+        self.rotulos = rotulos
+        self._coletar = coletar
+
+    def exportar(self) -> list[str]:
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} {self.tipo}"]
+        try:
+            valores = self._coletar()
+        except Exception as e:
+            print(f"[Métricas] Erro ao coletar '{self.nome}': {e}")
+            return linhas
+        for chave, valor in sorted(valores.items()):
+            linhas.append(f"{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(valor)}")
+        return linhas
+
+class RegistroDeMetricas:
+    def __init__(self):
+        self._metricas: dict[str, Contador | Histograma | MetricaColetada] = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, metrica):
+        with self._lock:
+            existente = self._metricas.get(metrica.nome)
+            if existente is not None:
+                return existente
+            self._metricas[metrica.nome] = metrica
+            return metrica
+
+    def contador(self, nome: str, descricao: str, rotulos: tuple[str, ...] = ()) -> Contador:
+        return self._registrar(Contador(nome, descricao, rotulos))
+
+    def histograma(self, nome: str, descricao: str, rotulos: tuple[str, ...] = (), buckets: tuple[float, ...] = BUCKETS_DURACAO_PADRAO) -> Histograma:
+        return self._registrar(Histograma(nome, descricao, rotulos, buckets))
+
+    def coletada(self, nome: str, descricao: str, tipo: str, coletar: Callable[[], dict[tuple, float]], rotulos: tuple[str, ...] = ()) -> MetricaColetada:
+        return self._registrar(MetricaColetada(nome, descricao, tipo, coletar, rotulos))
+
+    def exportar_prometheus(self) -> str:
+        with self._lock:
+            metricas = list(self._metricas.values())
+        linhas = []
+        for metrica in metricas:
+            linhas.extend(metrica.exportar())
+        return "\n".join(linhas) + "\n"
+
+registro_metricas = RegistroDeMetricas()
+
+DURACAO_ETAPA = registro_metricas.histograma(
+    "buscador_vagas_etapa_duracao_segundos", "Duração de cada etapa do pipeline de busca.", ("etapa",)
+)
+DURACAO_REQUISICAO = registro_metricas.histograma(
+    "buscador_vagas_requisicao_duracao_segundos", "Duração das requisições de busca na API.", ("endpoint", "cache")
+)
+DURACAO_CHAMADA_LLM = registro_metricas.histograma(
+    "buscador_vagas_llm_chamada_duracao_segundos", "Duração de cada chamada a um agente (sem a espera do limitador).", ("agente", "status")
+)
+ESPERA_LIMITADOR = registro_metricas.histograma(
+    "buscador_vagas_limitador_espera_segundos", "Tempo de espera no limitador de requisições ao LLM antes de cada chamada.",
+    buckets=(0.0, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+VAGAS_PROCESSADAS = registro_metricas.contador(
+    "buscador_vagas_vagas_total",
+    "Vagas por resultado: divididas (split), duplicadas_texto, parseadas, rejeitadas, antigas e duplicadas.",
+    ("resultado",)
+)
+
+class DetalhamentoDeTempos:
+    """
+    Soma, por etapa, o tempo gasto em uma única requisição. Etapas executadas em paralelo
+    (como os lotes de parse) têm os tempos somados, então o total pode passar do tempo de relógio.
+    """
+
+    def __init__(self):
+        self._segundos_por_etapa: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, etapa: str, segundos: float):
+        with self._lock:
+            self._segundos_por_etapa[etapa] = self._segundos_por_etapa.get(etapa, 0.0) + segundos
+
+    def para_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {etapa: round(segundos, 4) for etapa, segundos in self._segundos_por_etapa.items()}
+
+@contextmanager
+def medir_etapa(etapa: str, detalhamento: DetalhamentoDeTempos | None = None):
+    """Mede o bloco no histograma de etapas e, se informado, no detalhamento da requisição."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        DURACAO_ETAPA.observar(duracao, etapa=etapa)
+        if detalhamento is not None:
+            detalhamento.registrar(etapa, duracao)
@@ -0,0 +1,70 @@
+import base64
+import binascii
+import uuid
+
+from app.core.cache import CacheMemoria
+from app.core.vaga import serializar_valor
+
+class CursorInvalidoError(ValueError):
+    pass
+
+def codificar_cursor(resultado_id: str, posicao: int) -> str:
+    return base64.urlsafe_b64encode(f"{resultado_id}:{posicao}".encode()).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str) -> tuple[str, int]:
+    """Retorna (id do resultado, posição da próxima vaga). Levanta CursorInvalidoError se o cursor não for reconhecido."""
+    try:
+        texto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        resultado_id, posicao = texto.rsplit(":", 1)
+        posicao = int(posicao)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise CursorInvalidoError(f"Cursor inválido: {cursor!r}")
+    if not resultado_id or posicao < 0:
+        raise CursorInvalidoError(f"Cursor inválido: {cursor!r}")
+    return resultado_id, posicao
+
+def ler_campos(texto: str | None) -> tuple[str, ...] | None:
+    """Converte 'titulo,empresa,link' na projeção de campos; vazio ou ausente devolve todos os campos."""
+    campos = tuple(campo.strip() for campo in (texto or "").split(",") if campo.strip())
+    return campos or None
+
+def projetar_vaga(vaga: dict, campos: tuple[str, ...] | None = None) -> dict:
+    """Serializa só os campos pedidos da vaga, com as datas no mesmo formato da resposta sem paginação."""
+    itens = vaga.items() if campos is None else ((campo, vaga[campo]) for campo in campos if campo in vaga)
+    return {campo: serializar_valor(valor) for campo, valor in itens}
+
+class ArmazemDeResultados:
+    """
+    Guarda listas de vagas já ordenadas para paginação por cursor. Cada página é
+    serializada apenas quando pedida, então o tamanho da resposta e o tempo até a
+    primeira página não dependem do total de vagas. Resultados expiram por TTL e,
+    acima de `max_resultados`, os menos usados são descartados.
+    """
+
+    def __init__(self, ttl_segundos: float | None, max_resultados: int = 200):
+        self._resultados = CacheMemoria(max_entradas=max_resultados, ttl_segundos=ttl_segundos)
+
+    def guardar(self, vagas: list[dict], resultado_id: str | None = None) -> str:
+        resultado_id = resultado_id or uuid.uuid4().hex
+        self._resultados.definir(resultado_id, list(vagas))
+        return resultado_id
+
+    def fatia(self, resultado_id: str, posicao: int, limite: int) -> tuple[list, int, str | None] | None:
+        """(vagas sem serializar, total de vagas, próximo cursor) da página, ou None se o resultado expirou."""
+        vagas = self._resultados.obter(resultado_id)
+        if vagas is None:
+            return None
+        fim = posicao + limite
+        return vagas[posicao:fim], len(vagas), codificar_cursor(resultado_id, fim) if fim < len(vagas) else None
+
+    def pagina(self, resultado_id: str, posicao: int, limite: int, campos: tuple[str, ...] | None = None) -> dict | None:
+        """Página com até `limite` vagas a partir de `posicao`, ou None se o resultado expirou."""
+        fatia = self.fatia(resultado_id, posicao, limite)
+        if fatia is None:
+            return None
+        vagas_da_pagina, total_vagas, proximo_cursor = fatia
+        return {
+            "vagas": [projetar_vaga(vaga, campos) for vaga in vagas_da_pagina],
+            "total_vagas": total_vagas,
+            "proximo_cursor": proximo_cursor
+        }
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+
+from app.core.config import LLM_REQUISICOES_POR_MINUTO, LLM_RAJADA_MAXIMA
+
+class LimitadorTokenBucket:
+    """
+    Token bucket thread-safe configurado em requisições por minuto.
+    Cada chamada a `adquirir` (ou `adquirir_async`) reserva um token; se o balde estiver vazio,
+    a thread (ou a corrotina) dorme apenas o tempo necessário até a sua vez.
+    """
+
+    def __init__(self, requisicoes_por_minuto: float, capacidade: int = 1):
+        if requisicoes_por_minuto <= 0:
+            raise ValueError("requisicoes_por_minuto deve ser maior que zero.")
+        self.requisicoes_por_minuto = requisicoes_por_minuto
+        self.capacidade = max(1, int(capacidade))
+        self._tokens_por_segundo = requisicoes_por_minuto / 60.0
+        self._tokens = float(self.capacidade)
+        self._ultima_reposicao = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reservar(self) -> float:
+        with self._lock:
+            agora = time.monotonic()
+            decorrido = agora - self._ultima_reposicao
+            self._tokens = min(float(self.capacidade), self._tokens + decorrido * self._tokens_por_segundo)
+            self._ultima_reposicao = agora
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._tokens_por_segundo
+
+    def adquirir(self) -> float:
+        """Bloqueia até haver um token disponível e retorna o tempo esperado, em segundos."""
+        espera = self._reservar()
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    async def adquirir_async(self) -> float:
+        """Como `adquirir`, mas espera com asyncio.sleep, sem bloquear o event loop."""
+        espera = self._reservar()
+        if espera > 0:
+            await asyncio.sleep(espera)
+        return espera
+
+_limitador_llm: LimitadorTokenBucket | None = None
+_limitador_llm_lock = threading.Lock()
+
+def obter_limitador_llm() -> LimitadorTokenBucket:
+    global _limitador_llm
+    if _limitador_llm is None:
+        with _limitador_llm_lock:
+            if _limitador_llm is None:
+                _limitador_llm = LimitadorTokenBucket(LLM_REQUISICOES_POR_MINUTO, LLM_RAJADA_MAXIMA)
+    return _limitador_llm
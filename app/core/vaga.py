@@ -0,0 +1,142 @@
+import re
+from datetime import date, datetime
+
+from werkzeug.http import http_date
+
+from app.core.cache import normalizar_chave
+from app.core.deduplicacao import normalizar_empresa, normalizar_titulo
+
+CAMPOS_VAGA = (
+    "titulo", "empresa", "localizacao", "data_postagem_original", "descricao_resumida",
+    "link", "salario", "vaga_valida", "data_normalizada", "nova"
+)
+CAMPOS_QUE_DEFINEM_CHAVES = ("titulo", "empresa", "localizacao", "data_normalizada")
+# Separadores entre cidade, bairro, estado e modalidade ("Campinas - Cambuí", "Campinas/SP", "Remoto (Campinas)").
+# O hífen só separa com espaços em volta, para não quebrar nomes como "Embu-Guaçu".
+REGEX_SEPARADORES_LOCAL = re.compile(r"\s+[-–—|]\s+|[,/|()]")
+MODALIDADES_DE_TRABALHO = {"remoto", "100 remoto", "home office", "hibrido", "presencial", "teletrabalho"}
+
+def normalizar_local_base(localizacao: str | None) -> str:
+    """
+    Cidade base da localização: o primeiro trecho que não é modalidade de trabalho, sem bairro,
+    estado nem anotações entre parênteses. Sem cidade, a própria modalidade (ex.: "remoto").
+    """
+    trechos = [normalizar_chave(trecho.replace("%", "")) for trecho in REGEX_SEPARADORES_LOCAL.split(localizacao or "")]
+    trechos = [trecho for trecho in trechos if trecho]
+    return next((trecho for trecho in trechos if trecho not in MODALIDADES_DE_TRABALHO), trechos[0] if trechos else "")
+
+def serializar_valor(valor):
+    """Valor de campo no formato das respostas da API: datas como HTTP-date, como no provedor JSON do Flask."""
+    return http_date(valor) if isinstance(valor, date) else valor
+
+def serializar_para_json(o):
+    """Hook `default` do json.dumps usado por todas as respostas: `Vaga` como dict e datas como HTTP-date."""
+    if isinstance(o, Vaga):
+        return o.para_dict()
+    if isinstance(o, date):
+        return http_date(o)
+    raise TypeError(f"Objeto do tipo {type(o).__name__} não é serializável em JSON.")
+
+class Vaga:
+    """
+    Vaga parseada e aceita pelo filtro de antiguidade. Os campos do esquema ficam em `__slots__`,
+    e as chaves usadas na deduplicação, na ordenação e no índice local (título, empresa e cidade
+    normalizados, data como ordinal) são calculadas uma única vez. Campos fora do esquema
+    devolvidos pelo LLM ficam em `extras`.
+
+    Aceita o acesso de dicionário (`vaga['titulo']`, `vaga.get('link')`, `'salario' in vaga`)
+    e `para_dict()` devolve o mesmo formato dos dicts usados antes na API.
+    """
+    __slots__ = CAMPOS_VAGA + ("extras", "titulo_normalizado", "empresa_normalizada", "local_base", "data_ordinal")
+
+    def __init__(self, titulo: str = "", empresa: str | None = None, localizacao: str | None = None,
+                 data_postagem_original: str | None = None, descricao_resumida: str | None = None,
+                 link: str | None = None, salario: str | None = None, vaga_valida: bool | None = None,
+                 data_normalizada: datetime | None = None, nova: bool | None = None, extras: dict | None = None):
+        self.titulo = titulo
+        self.empresa = empresa
+        self.localizacao = localizacao
+        self.data_postagem_original = data_postagem_original
+        self.descricao_resumida = descricao_resumida
+        self.link = link
+        self.salario = salario
+        self.vaga_valida = vaga_valida
+        self.data_normalizada = data_normalizada
+        self.nova = nova
+        self.extras = extras or None
+        self._calcular_chaves()
+
+    @classmethod
+    def de_dict(cls, dados: dict, **substituicoes) -> "Vaga":
+        """Cria a vaga a partir de um dict parseado (ou serializado), com `substituicoes` sobrepondo os campos do dict."""
+        campos = {campo: dados[campo] for campo in CAMPOS_VAGA if campo in dados}
+        campos.update(substituicoes)
+        extras = {campo: valor for campo, valor in dados.items() if campo not in CAMPOS_VAGA}
+        return cls(**campos, extras=extras)
+
+    def _calcular_chaves(self):
+        self.titulo_normalizado = normalizar_titulo(self.titulo or "")
+        self.empresa_normalizada = normalizar_empresa(self.empresa or "")
+        self.local_base = normalizar_local_base(self.localizacao)
+        self.data_ordinal = self.data_normalizada.toordinal() if self.data_normalizada else None
+
+    def para_dict(self) -> dict:
+        """Campos preenchidos da vaga (e `data_normalizada`, mesmo vazia), no formato da API."""
+        dados = dict(self.extras) if self.extras else {}
+        for campo in CAMPOS_VAGA:
+            valor = getattr(self, campo)
+            if valor is not None or campo == "data_normalizada":
+                dados[campo] = valor
+        return dados
+
+    def __getitem__(self, campo: str):
+        if campo in CAMPOS_VAGA:
+            valor = getattr(self, campo)
+            if valor is None and campo != "data_normalizada":
+                raise KeyError(campo)
+            return valor
+        if self.extras and campo in self.extras:
+            return self.extras[campo]
+        raise KeyError(campo)
+
+    def __setitem__(self, campo: str, valor):
+        if campo in CAMPOS_VAGA:
+            setattr(self, campo, valor)
+            if campo in CAMPOS_QUE_DEFINEM_CHAVES:
+                self._calcular_chaves()
+        else:
+            self.extras = {**(self.extras or {}), campo: valor}
+
+    def __contains__(self, campo: str) -> bool:
+        try:
+            self[campo]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, campo: str, padrao=None):
+        try:
+            return self[campo]
+        except KeyError:
+            return padrao
+
+    def keys(self):
+        return self.para_dict().keys()
+
+    def items(self):
+        return self.para_dict().items()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __eq__(self, outra) -> bool:
+        if isinstance(outra, Vaga):
+            return self.para_dict() == outra.para_dict()
+        if isinstance(outra, dict):
+            return self.para_dict() == outra
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Vaga(titulo={self.titulo!r}, empresa={self.empresa!r}, localizacao={self.localizacao!r}, data_normalizada={self.data_normalizada!r})"
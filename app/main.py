@@ -11,11 +11,16 @@ from app.agents.consolidador_formatador import (
     formatar_vaga_para_usuario,
     VAGAS_POR_PAGINA
 )
-from app.core.config import GOOGLE_API_KEY
+from app.core.config import LLM_CONFIGURADO, INDICE_VAGAS_ATIVO
+from app.core.indice_vagas import obter_indice_vagas
+from app.core.paginacao import ArmazemDeResultados, decodificar_cursor
+from app.agents.busca_em_lote import ler_matriz_de_busca, iterar_busca_em_lote, evento_para_ndjson
 from datetime import datetime
+import argparse
+import contextlib
 
 def run_job_search_app():
-    if not GOOGLE_API_KEY:
+    if not LLM_CONFIGURADO:
         print("ERRO: GOOGLE_API_KEY não encontrada. Verifique seu arquivo .env e app/core/config.py.")
         return
 
@@ -74,32 +79,77 @@ def run_job_search_app():
         resultados_agente2_por_cidade,
         data_referencia_cenario_gemini 
     )
+    if INDICE_VAGAS_ATIVO and vagas_processadas:
+        novas = obter_indice_vagas().registrar_vagas(vagas_processadas)
+        print(f"(Índice local de vagas: {novas} vagas novas registradas)")
 
     if not vagas_processadas:
         print("\n😕 Nenhuma vaga relevante encontrada ou processada após consolidação e filtros.")
     else:
         print(f"\n✨ Total de {len(vagas_processadas)} vagas relevantes encontradas! ✨")
         
-        indice_atual = 0
-        mostrar_mais = True
-        while mostrar_mais and indice_atual < len(vagas_processadas):
-            print(f"\n--- Mostrando vagas {indice_atual + 1} a {min(indice_atual + VAGAS_POR_PAGINA, len(vagas_processadas))} (de {len(vagas_processadas)}) ---")
-            for _ in range(VAGAS_POR_PAGINA):
-                if indice_atual < len(vagas_processadas):
-                    print(formatar_vaga_para_usuario(vagas_processadas[indice_atual], indice_atual, data_hoje_real))
-                    indice_atual += 1
-                else:
-                    break 
-            
-            if indice_atual < len(vagas_processadas):
-                ver_mais_input = input(f"Mostrar mais vagas? (total restante: {len(vagas_processadas) - indice_atual}) (s/n): ").strip().lower()
-                if ver_mais_input != 's':
-                    mostrar_mais = False
-            else:
+        # Mesma paginação por cursor da API: cada página só é formatada quando o usuário pede para vê-la.
+        armazem = ArmazemDeResultados(ttl_segundos=None, max_resultados=1)
+        resultado_id = armazem.guardar(vagas_processadas)
+        posicao = 0
+        while True:
+            vagas_da_pagina, total_vagas, proximo_cursor = armazem.fatia(resultado_id, posicao, VAGAS_POR_PAGINA)
+            fim_pagina = posicao + len(vagas_da_pagina)
+            print(f"\n--- Mostrando vagas {posicao + 1} a {fim_pagina} (de {total_vagas}) ---")
+            for indice_vaga, vaga in enumerate(vagas_da_pagina, start=posicao):
+                print(formatar_vaga_para_usuario(vaga, indice_vaga, data_hoje_real))
+
+            if proximo_cursor is None:
                 print("\nFim de todas as vagas encontradas.")
-                mostrar_mais = False
+                break
+            ver_mais_input = input(f"Mostrar mais vagas? (total restante: {total_vagas - fim_pagina}) (s/n): ").strip().lower()
+            if ver_mais_input != 's':
+                break
+            _, posicao = decodificar_cursor(proximo_cursor)
     
     print("\n✅ Busca e apresentação concluídas.")
 
+def executar_busca_em_lote_cli(cargos: list[str], cidades: list[str], buscar_proximas: bool, caminho_saida: str | None = None) -> int:
+    """
+    Busca a matriz de cargos × cidades sem interação e escreve uma linha NDJSON por combinação,
+    assim que ela termina, e um resumo final. Os logs dos agentes vão para o stderr.
+    """
+    if not LLM_CONFIGURADO:
+        print("ERRO: GOOGLE_API_KEY não encontrada. Verifique seu arquivo .env e app/core/config.py.", file=sys.stderr)
+        return 1
+    try:
+        cargos, cidades = ler_matriz_de_busca({"cargos": cargos, "cidades": cidades})
+    except ValueError as e:
+        print(f"ERRO: {e}", file=sys.stderr)
+        return 2
+
+    data_referencia_cenario_gemini = datetime(2025, 5, 17)
+    saida = open(caminho_saida, "w", encoding="utf-8") if caminho_saida else sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr), \
+                contextlib.closing(iterar_busca_em_lote(cargos, cidades, buscar_proximas, data_referencia_cenario_gemini)) as eventos:
+            for evento in eventos:
+                saida.write(evento_para_ndjson(evento))
+                saida.flush()
+    finally:
+        if caminho_saida:
+            saida.close()
+    return 0
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Gemini Job Search Agent. Sem argumentos, roda a busca interativa.")
+    parser.add_argument("--cargos", nargs="+", help="Cargos da busca em lote (não interativa).")
+    parser.add_argument("--cidades", nargs="+", help="Cidades da busca em lote (não interativa).")
+    parser.add_argument("--proximas", action="store_true", help="Busca também nas cidades próximas de cada cidade.")
+    parser.add_argument("--saida", help="Arquivo NDJSON de saída da busca em lote (padrão: stdout).")
+    args = parser.parse_args(argv)
+
+    if not args.cargos and not args.cidades:
+        run_job_search_app()
+        return
+    if not args.cargos or not args.cidades:
+        parser.error("a busca em lote exige --cargos e --cidades.")
+    sys.exit(executar_busca_em_lote_cli(args.cargos, args.cidades, args.proximas, args.saida))
+
 if __name__ == "__main__":
-    run_job_search_app()
\ No newline at end of file
+    main()
\ No newline at end of file
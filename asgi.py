@@ -0,0 +1,143 @@
+"""
+Entrada ASGI da busca de vagas, servida pelo pipeline assíncrono (sem uma thread por chamada ao LLM):
+
+    uvicorn asgi:app --port 5000
+
+Atende POST /api/buscar-vagas e POST /api/buscar-vagas/lote com o mesmo payload e o mesmo
+formato de resposta de api.py.
+Cache de consultas, índice local, jobs e paginação continuam na API Flask.
+"""
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+import contextlib
+import json
+import os
+import sys
+import time
+import traceback
+
+project_root_directory = os.path.dirname(os.path.abspath(__file__))
+if project_root_directory not in sys.path:
+    sys.path.insert(0, project_root_directory)
+
+from app.agents.orquestrador import executar_busca_async
+from app.agents.busca_em_lote import BuscaEmLote, ler_matriz_de_busca, evento_para_ndjson
+from app.agents.registro_agentes import preaquecer_agentes
+from app.core.config import LLM_CONFIGURADO, PREAQUECER_AGENTES
+from app.core.metricas import DetalhamentoDeTempos, DURACAO_REQUISICAO
+from app.core.vaga import Vaga, serializar_para_json
+from datetime import datetime
+
+DATA_REFERENCIA_CENARIO_GEMINI = datetime(2025, 5, 17)
+
+class RespostaJSON(JSONResponse):
+    def render(self, content) -> bytes:
+        return json.dumps(content, ensure_ascii=False, default=serializar_para_json).encode("utf-8")
+
+def _mensagem_resultado(vagas: list[Vaga]) -> str:
+    if not vagas:
+        return "Nenhuma vaga relevante encontrada após processamento."
+    return f"{len(vagas)} vagas encontradas e processadas."
+
+async def api_buscar_vagas(request: Request):
+    print("[ASGI] Nova requisição recebida para /api/buscar-vagas")
+    if not LLM_CONFIGURADO:
+        print("[ASGI] ERRO: GOOGLE_API_KEY não configurada (e LLM_BACKEND exige a API real).")
+        return RespostaJSON({"erro": "Configuração da API Key do Google ausente no servidor."}, status_code=500)
+
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not data or not isinstance(data, dict):
+        print("[ASGI] ERRO: Payload JSON ausente ou inválido.")
+        return RespostaJSON({"erro": "Payload da requisição ausente ou inválido."}, status_code=400)
+
+    cargo = data.get('cargo')
+    cidade_principal = data.get('cidade_principal')
+    buscar_proximas = bool(data.get('buscar_proximas', False))
+    if not cargo or not cidade_principal:
+        print("[ASGI] ERRO: Campos 'cargo' ou 'cidade_principal' ausentes.")
+        return RespostaJSON({"erro": "Os campos 'cargo' e 'cidade_principal' são obrigatórios."}, status_code=400)
+
+    print(f"[ASGI] Buscando por Cargo: '{cargo}', Cidade: '{cidade_principal}', Próximas: {buscar_proximas}")
+    incluir_tempos = request.query_params.get('tempos', '').lower() in ('1', 'true', 'sim')
+    inicio = time.perf_counter()
+    detalhamento_tempos = DetalhamentoDeTempos()
+    try:
+        vagas = await executar_busca_async(
+            cargo, cidade_principal, buscar_proximas, DATA_REFERENCIA_CENARIO_GEMINI, detalhamento_tempos=detalhamento_tempos
+        )
+    except Exception as e:
+        print(f"[ASGI] !!!! ERRO INESPERADO DURANTE O PROCESSAMENTO: {type(e).__name__}: {e}")
+        print(traceback.format_exc())
+        return RespostaJSON({"erro": "Ocorreu um erro interno no servidor ao processar sua busca. Por favor, verifique os logs do servidor."}, status_code=500)
+
+    duracao_total = time.perf_counter() - inicio
+    DURACAO_REQUISICAO.observar(duracao_total, endpoint="/api/buscar-vagas", cache="calculado")
+    print(f"[ASGI] Busca concluída em {duracao_total:.2f}s ({len(vagas)} vagas). Tempo por etapa: {detalhamento_tempos.para_dict()}")
+    resposta = {"mensagem": _mensagem_resultado(vagas), "vagas": vagas, "cache": "calculado"}
+    if incluir_tempos:
+        resposta["tempos"] = {"total_segundos": round(duracao_total, 4), "etapas": detalhamento_tempos.para_dict()}
+    return RespostaJSON(resposta)
+
+async def api_buscar_vagas_em_lote(request: Request):
+    """Matriz de cargos × cidades transmitida em NDJSON, como em api.py, direto no event loop do servidor."""
+    print("[ASGI] Nova requisição recebida para /api/buscar-vagas/lote")
+    if not LLM_CONFIGURADO:
+        print("[ASGI] ERRO: GOOGLE_API_KEY não configurada (e LLM_BACKEND exige a API real).")
+        return RespostaJSON({"erro": "Configuração da API Key do Google ausente no servidor."}, status_code=500)
+
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not data or not isinstance(data, dict):
+        print("[ASGI] ERRO: Payload JSON ausente ou inválido.")
+        return RespostaJSON({"erro": "Payload da requisição ausente ou inválido."}, status_code=400)
+    try:
+        cargos, cidades = ler_matriz_de_busca(data)
+    except ValueError as e:
+        print(f"[ASGI] ERRO: Matriz de busca inválida: {e}")
+        return RespostaJSON({"erro": str(e)}, status_code=400)
+
+    busca_em_lote = BuscaEmLote(bool(data.get('buscar_proximas', False)), DATA_REFERENCIA_CENARIO_GEMINI)
+    print(f"[ASGI] Busca em lote: {len(cargos)} cargos × {len(cidades)} cidades, Próximas: {busca_em_lote.buscar_proximas}")
+
+    async def gerar():
+        inicio = time.perf_counter()
+        try:
+            async for evento in busca_em_lote.executar(cargos, cidades):
+                yield evento_para_ndjson(evento)
+        except Exception as e:
+            print(f"[ASGI] !!!! ERRO INESPERADO DURANTE A BUSCA EM LOTE: {type(e).__name__}: {e}")
+            print(traceback.format_exc())
+            yield evento_para_ndjson({"tipo": "erro", "erro": "Ocorreu um erro interno no servidor ao processar a busca em lote."})
+        finally:
+            DURACAO_REQUISICAO.observar(time.perf_counter() - inicio, endpoint="/api/buscar-vagas/lote", cache="calculado")
+
+    return StreamingResponse(gerar(), media_type='application/x-ndjson')
+
+@contextlib.asynccontextmanager
+async def ciclo_de_vida(app: Starlette):
+    if PREAQUECER_AGENTES:
+        preaquecer_agentes()
+    yield
+
+app = Starlette(
+    routes=[
+        Route('/api/buscar-vagas', api_buscar_vagas, methods=['POST']),
+        Route('/api/buscar-vagas/lote', api_buscar_vagas_em_lote, methods=['POST'])
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=ciclo_de_vida
+)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=5000)
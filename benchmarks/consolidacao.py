@@ -0,0 +1,149 @@
+"""
+Benchmark por estágio do consolidador (split, deduplicação dos textos, parse, filtro de
+antiguidade, consolidação/ordenação e formatação) sobre respostas sintéticas de agentes.
+O parse é substituído por um stub sem LLM: o extrator por template e, para os trechos que
+ele não reconhece, uma vaga mínima montada a partir da primeira linha.
+
+Emite um JSON com tempo e pico de memória (tracemalloc) de cada estágio, por formato e tamanho.
+
+Uso: python -m benchmarks.consolidacao [--tamanhos 10 100 1000] [--formatos delimitado] [--saida resultados.json]
+"""
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-sem-chamadas-ao-llm")
+
+import argparse
+import contextlib
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.agents.consolidador_formatador import (
+    split_into_individual_vagas,
+    remover_textos_duplicados,
+    extrair_vaga_por_template,
+    filtrar_e_contextualizar_vaga,
+    consolidar_vagas,
+    formatar_vaga_para_usuario,
+    REGEX_PREFIXO_ORIGEM_BUSCA,
+    _normalizar_data_em_cache
+)
+from benchmarks.geradores import FORMATOS_SAIDA_AGENTE, gerar_saidas_agentes
+
+DATA_REFERENCIA = datetime(2025, 5, 17, 15, 30)
+TAMANHOS_PADRAO = [10, 100, 1000, 10000, 100000]
+
+def parsear_vaga_stub(texto_vaga: str) -> dict:
+    """Substitui o LLM: usa o extrator por template e, se ele recusar o trecho, devolve uma vaga mínima."""
+    vaga = extrair_vaga_por_template(texto_vaga)
+    if vaga:
+        return vaga
+    primeira_linha = REGEX_PREFIXO_ORIGEM_BUSCA.sub("", texto_vaga, count=1).strip().splitlines()[0]
+    return {
+        "vaga_valida": True,
+        "titulo": primeira_linha.strip("*-•0123456789. ")[:80] or "Não informado",
+        "empresa": "Não informado",
+        "localizacao": "Não informado",
+        "descricao_resumida": "Não informado",
+        "data_postagem_original": "Não informado",
+        "link": "Não informado",
+    }
+
+def _estagios(resposta_principal: str, respostas_por_cidade: dict[str, str]):
+    """Sequência de (nome do estágio, função que recebe a saída do estágio anterior)."""
+    def split(_):
+        textos = split_into_individual_vagas(resposta_principal, "Busca Principal")
+        for cidade, resposta in respostas_por_cidade.items():
+            textos.extend(split_into_individual_vagas(resposta, cidade))
+        return textos
+
+    def filtrar(parseadas):
+        vagas = []
+        for texto_vaga, vaga in parseadas:
+            vaga_filtrada = filtrar_e_contextualizar_vaga(vaga, texto_vaga, DATA_REFERENCIA)
+            if vaga_filtrada:
+                vagas.append(vaga_filtrada)
+        return vagas
+
+    return [
+        ("split", split),
+        ("deduplicacao_textos", remover_textos_duplicados),
+        ("parse_stub", lambda textos: [(texto, parsear_vaga_stub(texto)) for texto in textos]),
+        ("filtro_antiguidade", filtrar),
+        ("consolidacao", lambda vagas: consolidar_vagas(vagas, DATA_REFERENCIA)),
+        ("formatacao", lambda vagas: [formatar_vaga_para_usuario(vaga, i, DATA_REFERENCIA) for i, vaga in enumerate(vagas)]),
+    ]
+
+def _executar_estagios(resposta_principal: str, respostas_por_cidade: dict[str, str], medir_memoria: bool) -> dict:
+    _normalizar_data_em_cache.cache_clear()
+    metricas = {}
+    saida = None
+    for nome, funcao in _estagios(resposta_principal, respostas_por_cidade):
+        if medir_memoria:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            saida = funcao(saida)
+        duracao = time.perf_counter() - inicio
+        metricas[nome] = {"itens_saida": len(saida)}
+        if medir_memoria:
+            metricas[nome]["pico_memoria_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            metricas[nome]["segundos"] = round(duracao, 6)
+    return metricas
+
+def executar_benchmark(tamanho: int, formato: str, medir_memoria: bool = True) -> dict:
+    """
+    Roda os estágios duas vezes sobre o mesmo corpus: uma para os tempos e, se pedido,
+    outra sob tracemalloc para o pico de memória, já que o rastreamento distorce os tempos.
+    """
+    resposta_principal, respostas_por_cidade = gerar_saidas_agentes(tamanho, formato)
+    estagios = _executar_estagios(resposta_principal, respostas_por_cidade, medir_memoria=False)
+    if medir_memoria:
+        memoria = _executar_estagios(resposta_principal, respostas_por_cidade, medir_memoria=True)
+        for nome, metricas in memoria.items():
+            estagios[nome]["pico_memoria_bytes"] = metricas["pico_memoria_bytes"]
+    return {
+        "formato": formato,
+        "vagas_geradas": tamanho,
+        "segundos_total": round(sum(metricas["segundos"] for metricas in estagios.values()), 6),
+        "estagios": estagios,
+    }
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark por estágio do consolidador de vagas (sem LLM).")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO)
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS_SAIDA_AGENTE, default=list(FORMATOS_SAIDA_AGENTE))
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória (mais rápido).")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout).")
+    args = parser.parse_args(argv)
+
+    resultados = []
+    for formato in args.formatos:
+        for tamanho in args.tamanhos:
+            print(f"Executando: formato={formato} tamanho={tamanho}", file=sys.stderr)
+            resultados.append(executar_benchmark(tamanho, formato, medir_memoria=not args.sem_memoria))
+
+    relatorio = {
+        "benchmark": "consolidacao",
+        "executado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    conteudo = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo + "\n")
+    else:
+        print(conteudo)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Geradores determinísticos de dados sintéticos no formato devolvido pelos agentes de busca,
+usados pelos benchmarks para exercitar o consolidador sem chamar o LLM.
+"""
+import random
+
+FORMATO_DELIMITADO = "delimitado"
+FORMATO_SEM_DELIMITADOR = "sem_delimitador"
+FORMATO_COM_RODAPE = "com_rodape"
+FORMATOS_SAIDA_AGENTE = (FORMATO_DELIMITADO, FORMATO_SEM_DELIMITADOR, FORMATO_COM_RODAPE)
+
+DELIMITADOR_FIM_VAGA = "---FIM_DA_VAGA---"
+
+CARGOS = ["Desenvolvedor Python", "Analista de Dados", "Engenheiro de Software", "Desenvolvedor Backend Java",
+          "Analista de Suporte", "Cientista de Dados", "Desenvolvedor Frontend", "Engenheiro DevOps",
+          "Analista de Sistemas", "Product Owner", "QA Analyst", "Arquiteto de Soluções"]
+NIVEIS = ["Júnior", "Pleno", "Sênior", "Jr", "Pl", "Sr", "Especialista", ""]
+EMPRESAS = ["TechNova", "Banco Horizonte", "Varejo Brasil", "DataCorp", "Nuvem Sistemas", "Saúde Digital",
+            "Logística Ágil", "EducaMais", "AgroTech", "Fintech Prisma", "Consultoria Alfa", "Mercado Fácil"]
+SUFIXOS_EMPRESA = ["", " Ltda", " S.A.", " Tecnologia"]
+CIDADES = ["São Paulo, SP", "Campinas, SP", "Rio de Janeiro, RJ", "Belo Horizonte, MG", "Curitiba, PR",
+           "Porto Alegre, RS", "Recife, PE", "Salvador, BA", "Florianópolis, SC", "Remoto"]
+MESES = ["janeiro", "fevereiro", "março", "abril", "maio", "junho",
+         "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
+PORTAIS = ["https://www.linkedin.com/jobs/view/{id}", "https://www.vagas.com.br/vagas/v{id}/{slug}",
+           "https://br.indeed.com/viewjob?jk={id}", "https://www.catho.com.br/vagas/{slug}/{id}/"]
+RODAPES = [
+    "Observações: Algumas vagas podem ter sido encerradas. Recomendo verificar diretamente nos sites.",
+    "Nota: As datas de postagem são aproximadas e foram extraídas dos resultados da busca.",
+    "OBS.: Vagas remotas aceitam candidatos de todo o Brasil.",
+]
+
+def gerar_datas_postagem(quantidade: int, semente: int = 42) -> list[str | None]:
+    """Datas de postagem nos formatos absolutos, relativos e vazios vistos nas respostas dos agentes."""
+    rng = random.Random(semente)
+    geradores = [
+        lambda: f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025",
+        lambda: f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/25",
+        lambda: f"Publicada em: {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025",
+        lambda: f"Atualizada em: {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}",
+        lambda: f"{rng.randint(1, 28)} de {rng.choice(MESES)} de 2025",
+        lambda: f"{rng.randint(1, 28)} {rng.choice(MESES)[:3]} 2025",
+        lambda: f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        lambda: f"há {rng.randint(1, 30)} dias",
+        lambda: f"Há {rng.randint(1, 4)} semanas",
+        lambda: f"há {rng.randint(1, 23)} horas",
+        lambda: f"há {rng.randint(1, 6)} meses",
+        lambda: rng.choice(["hoje", "Publicada hoje", "ontem", "ontem às 10h"]),
+        lambda: rng.choice(["Não informado", "Data não informada", "n/a", None]),
+    ]
+    return [rng.choice(geradores)() for _ in range(quantidade)]
+
+def gerar_vagas_sinteticas(quantidade: int, fracao_duplicatas: float = 0.1, semente: int = 42) -> list[dict]:
+    """
+    Gera vagas com os campos do JSON do consolidador. Uma fração delas repete uma vaga anterior
+    com pequenas variações (nível abreviado, sufixo da empresa, link de rastreamento, outra data),
+    como acontece quando a mesma vaga aparece em portais ou buscas diferentes.
+    """
+    rng = random.Random(semente)
+    datas = gerar_datas_postagem(quantidade, semente)
+    vagas = []
+    for indice in range(quantidade):
+        if vagas and rng.random() < fracao_duplicatas:
+            original = rng.choice(vagas)
+            vaga = dict(original)
+            vaga["titulo"] = original["titulo"].replace("Sênior", "Sr").replace("Pleno", "Pl").replace("Júnior", "Jr")
+            vaga["empresa"] = original["empresa"] + rng.choice(SUFIXOS_EMPRESA)
+            vaga["link"] = original["link"] + "?utm_source=busca"
+        else:
+            cargo = f"{rng.choice(CARGOS)} {rng.choice(NIVEIS)}".strip()
+            slug = cargo.lower().replace(" ", "-")
+            vaga = {
+                "titulo": cargo,
+                "empresa": rng.choice(EMPRESAS),
+                "localizacao": rng.choice(CIDADES),
+                "descricao_resumida": f"Atuação com {rng.choice(CARGOS).lower()} em time de produto. "
+                                      f"Experiência de {rng.randint(1, 8)} anos desejável.",
+                "link": rng.choice(PORTAIS).format(id=100000 + indice, slug=slug),
+            }
+            if rng.random() < 0.3:
+                vaga["salario"] = f"R$ {rng.randint(3, 20)}.000,00"
+        vaga["data_postagem_original"] = datas[indice] or "Não informado"
+        vagas.append(vaga)
+    return vagas
+
+def _formatar_vaga_no_template(vaga: dict, numero: int | None = None) -> str:
+    prefixo = f"{numero}. " if numero is not None else ""
+    linhas = [
+        f"{prefixo}**{vaga['titulo']}**",
+        f"*   Empresa: {vaga['empresa']}",
+        f"*   Localização: {vaga['localizacao']}",
+        f"*   Descrição: {vaga['descricao_resumida']}",
+    ]
+    if vaga.get("salario"):
+        linhas.append(f"*   Salário: {vaga['salario']}")
+    linhas.append(f"*   Data de Postagem: {vaga['data_postagem_original']}")
+    linhas.append(f"*   Link: {vaga['link']}")
+    return "\n".join(linhas)
+
+def formatar_saida_agente(vagas: list[dict], formato: str, semente: int = 42) -> str:
+    """Monta o texto bruto que um agente de busca devolveria para as vagas, no formato pedido."""
+    if formato not in FORMATOS_SAIDA_AGENTE:
+        raise ValueError(f"Formato de saída desconhecido: {formato}")
+    introducao = "Aqui estão as vagas encontradas:\n\n"
+    if formato == FORMATO_SEM_DELIMITADOR:
+        return introducao + "\n\n".join(_formatar_vaga_no_template(vaga, i + 1) for i, vaga in enumerate(vagas))
+
+    texto = introducao + "".join(f"{_formatar_vaga_no_template(vaga)}\n{DELIMITADOR_FIM_VAGA}\n\n" for vaga in vagas)
+    if formato == FORMATO_COM_RODAPE:
+        texto += "\n" + random.Random(semente + len(vagas)).choice(RODAPES) + "\n"
+    return texto
+
+def gerar_saidas_agentes(quantidade_vagas: int, formato: str, vagas_por_resposta: int = 8, semente: int = 42) -> tuple[str, dict[str, str]]:
+    """
+    Distribui `quantidade_vagas` em respostas de agente com até `vagas_por_resposta` vagas cada,
+    no formato esperado por `processar_e_formatar_vagas`: (resposta da busca principal, respostas por cidade).
+    """
+    vagas = gerar_vagas_sinteticas(quantidade_vagas, semente=semente)
+    respostas = [
+        formatar_saida_agente(vagas[i:i + vagas_por_resposta], formato, semente + i)
+        for i in range(0, len(vagas), vagas_por_resposta)
+    ]
+    if not respostas:
+        return "", {}
+    return respostas[0], {f"Cidade Vizinha {i}": resposta for i, resposta in enumerate(respostas[1:], start=1)}
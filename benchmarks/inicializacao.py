@@ -0,0 +1,129 @@
+"""
+Benchmark de partida a frio da API: cada execução roda em um processo Python novo, com o backend
+stub (sem rede), e mede o tempo até `api.py` estar importado e até a primeira resposta de
+POST /api/buscar-vagas. O `python -X importtime` do mesmo processo indica os módulos mais caros
+e se o google-adk foi carregado já na importação.
+
+Emite um JSON com a mediana e as execuções individuais, com e sem PREAQUECER_AGENTES.
+
+Uso: python -m benchmarks.inicializacao [--execucoes 5] [--saida resultados.json]
+"""
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+
+MODULOS_MAIS_CAROS = 10
+
+MARCA_FIM_DA_IMPORTACAO = "--fim-da-importacao--"
+
+# Executado no processo filho: importa a API e faz a primeira requisição pelo cliente de teste do Flask.
+# A marca em stderr separa o relatório do importtime da importação dos módulos carregados depois.
+SCRIPT_PRIMEIRA_REQUISICAO = f"""
+import json, sys, time
+inicio = time.perf_counter()
+import api
+importado = time.perf_counter()
+google_adk_carregado = any(modulo.startswith("google.adk") for modulo in sys.modules)
+sys.stderr.write("{MARCA_FIM_DA_IMPORTACAO}\\n")
+resposta = api.app.test_client().post('/api/buscar-vagas', json={{"cargo": "Dev Python", "cidade_principal": "Campinas"}})
+respondido = time.perf_counter()
+print(json.dumps({{
+    "status": resposta.status_code,
+    "importacao_segundos": importado - inicio,
+    "primeira_requisicao_segundos": respondido - importado,
+    "ate_primeira_resposta_segundos": respondido - inicio,
+    "google_adk_carregado_na_importacao": google_adk_carregado,
+}}))
+"""
+
+def _ler_importtime(saida_erro: str) -> dict[str, int]:
+    """Tempo cumulativo (µs) de cada módulo no relatório de `python -X importtime`."""
+    cumulativos = {}
+    for linha in saida_erro.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, modulo = linha[len("import time:"):].split("|")
+        cumulativos[modulo.strip()] = int(cumulativo)
+    return cumulativos
+
+def executar_partida(preaquecer_agentes: bool, diretorio_cache: str) -> dict:
+    ambiente = {
+        **os.environ,
+        "LLM_BACKEND": "stub",
+        "LLM_STUB_LATENCIA_SEGUNDOS": "0",
+        "CACHE_DIR": diretorio_cache,
+        "INDICE_VAGAS_ATIVO": "0",
+        "PREAQUECER_CACHE_CIDADES_PROXIMAS": "0",
+        "PREAQUECER_AGENTES": "1" if preaquecer_agentes else "0",
+        "PYTHONPATH": project_root,
+    }
+    ambiente.pop("GOOGLE_API_KEY", None)
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT_PRIMEIRA_REQUISICAO],
+        cwd=project_root, env=ambiente, capture_output=True, text=True, check=True
+    )
+    resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+    cumulativos = _ler_importtime(processo.stderr.split(MARCA_FIM_DA_IMPORTACAO)[0])
+    resultado["modulos_mais_caros_ms"] = {
+        modulo: round(micros / 1000, 1)
+        for modulo, micros in sorted(cumulativos.items(), key=lambda item: item[1], reverse=True)[:MODULOS_MAIS_CAROS]
+    }
+    return resultado
+
+def executar_benchmark(execucoes: int, preaquecer_agentes: bool) -> dict:
+    partidas = []
+    for _ in range(execucoes):
+        with tempfile.TemporaryDirectory(prefix="benchmark-inicializacao-") as diretorio_cache:
+            partidas.append(executar_partida(preaquecer_agentes, diretorio_cache))
+    resumo = {
+        campo: round(statistics.median(partida[campo] for partida in partidas), 4)
+        for campo in ("importacao_segundos", "primeira_requisicao_segundos", "ate_primeira_resposta_segundos")
+    }
+    return {
+        "preaquecer_agentes": preaquecer_agentes,
+        "mediana": resumo,
+        "google_adk_carregado_na_importacao": partidas[0]["google_adk_carregado_na_importacao"],
+        "modulos_mais_caros_ms": partidas[0]["modulos_mais_caros_ms"],
+        "execucoes": [
+            {campo: round(valor, 4) if isinstance(valor, float) else valor for campo, valor in partida.items() if campo != "modulos_mais_caros_ms"}
+            for partida in partidas
+        ],
+    }
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark de partida a frio: importação da API e primeira requisição.")
+    parser.add_argument("--execucoes", type=int, default=5, help="Processos novos por configuração (a mediana é reportada).")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout).")
+    args = parser.parse_args(argv)
+
+    resultados = []
+    for preaquecer_agentes in (False, True):
+        print(f"Executando: preaquecer_agentes={preaquecer_agentes} execucoes={args.execucoes}", file=sys.stderr)
+        resultados.append(executar_benchmark(args.execucoes, preaquecer_agentes))
+
+    relatorio = {
+        "benchmark": "inicializacao",
+        "executado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    conteudo = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo + "\n")
+    else:
+        print(conteudo)
+
+if __name__ == "__main__":
+    main()
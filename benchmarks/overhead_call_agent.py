@@ -0,0 +1,68 @@
+"""
+Micro-benchmark do custo de preparação de cada chamada a `call_agent`
+(criação de session service, sessão e Runner), sem chamar o LLM.
+
+Uso: python benchmarks/overhead_call_agent.py [iteracoes]
+"""
+import sys
+import os
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-sem-chamadas-ao-llm")
+
+import time
+import uuid
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from app.agents.consolidador_formatador import criar_agente_consolidador, AGENT_NAME
+from app.agents.backends_llm import (
+    obter_runner,
+    limpar_pool_de_runners,
+    USER_ID_PADRAO,
+    _resolver_se_awaitable,
+    _agendar_remocao_sessao
+)
+
+APP_NAME = f"{AGENT_NAME}_benchmark"
+
+def preparar_chamada_sem_pool(agente):
+    session_service = InMemorySessionService()
+    _resolver_se_awaitable(session_service.create_session(app_name=APP_NAME, user_id="user_default", session_id="session_default"))
+    return Runner(agent=agente, app_name=APP_NAME, session_service=session_service)
+
+def preparar_chamada_com_pool(agente):
+    runner = obter_runner(agente, APP_NAME)
+    session_id = uuid.uuid4().hex
+    _resolver_se_awaitable(runner.session_service.create_session(app_name=APP_NAME, user_id=USER_ID_PADRAO, session_id=session_id))
+    _agendar_remocao_sessao(runner.session_service, APP_NAME, session_id)
+    return runner
+
+def medir(funcao, agente, iteracoes: int) -> float:
+    funcao(agente)
+    inicio = time.perf_counter()
+    for _ in range(iteracoes):
+        funcao(agente)
+    return (time.perf_counter() - inicio) / iteracoes
+
+if __name__ == "__main__":
+    iteracoes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    agente = criar_agente_consolidador()
+    limpar_pool_de_runners()
+
+    por_chamada_sem_pool = medir(preparar_chamada_sem_pool, agente, iteracoes)
+    por_chamada_com_pool = medir(preparar_chamada_com_pool, agente, iteracoes)
+
+    print(f"Iterações: {iteracoes}")
+    print(f"Sem pool (Runner + session service novos a cada chamada): {por_chamada_sem_pool * 1e6:.1f} µs/chamada")
+    print(f"Com pool (Runner em cache + sessão única por chamada):    {por_chamada_com_pool * 1e6:.1f} µs/chamada")
+    if por_chamada_com_pool > 0:
+        print(f"Razão sem pool / com pool: {por_chamada_sem_pool / por_chamada_com_pool:.2f}x")
+
+    time.sleep(0.5)
+    sessoes_restantes = _resolver_se_awaitable(
+        obter_runner(agente, APP_NAME).session_service.list_sessions(app_name=APP_NAME, user_id=USER_ID_PADRAO)
+    )
+    print(f"Sessões ainda em memória no Runner em cache após o benchmark: {len(sessoes_restantes.sessions)}")
@@ -9,8 +9,18 @@ document.addEventListener('DOMContentLoaded', () => {
 
     const API_BASE_URL = 'http://127.0.0.1:5000'; // URL da sua API Flask
     const VAGAS_POR_PAGINA_FRONTEND = 3; // Igual ao VAGAS_POR_PAGINA no backend para consistência inicial
-
-    let todasAsVagasRecebidas = [];
+    // Campos usados na renderização; o resultado final é pedido ao servidor página a página, só com eles.
+    const CAMPOS_VAGA = 'titulo,empresa,localizacao,salario,data_postagem_original,descricao_resumida,link';
+    const PARAMETROS_PAGINACAO = `limit=${VAGAS_POR_PAGINA_FRONTEND}&campos=${CAMPOS_VAGA}`;
+    const INTERVALO_CONSULTA_JOB_MS = 2000;
+    const DESCRICAO_ETAPAS_JOB = {
+        buscando_vagas: 'Buscando vagas',
+        parseando_vagas: 'Processando as vagas encontradas',
+        consolidando_vagas: 'Consolidando resultados',
+    };
+
+    let todasAsVagasRecebidas = []; // Vagas parciais, enquanto o job ainda está rodando
+    let resultadoFinal = null; // { totalVagas, paginas: [[vagas]], cursores: [cursor da página i] }
     let paginaAtual = 0;
 
     btnBuscar.addEventListener('click', async () => {
@@ -29,11 +39,12 @@ document.addEventListener('DOMContentLoaded', () => {
         resultadosVagasDiv.innerHTML = ''; // Limpa resultados anteriores
         paginationControlsDiv.innerHTML = ''; // Limpa paginação anterior
         todasAsVagasRecebidas = [];
+        resultadoFinal = null;
         paginaAtual = 0;
         btnBuscar.disabled = true;
 
         try {
-            const response = await fetch(`${API_BASE_URL}/api/buscar-vagas`, {
+            const response = await fetch(`${API_BASE_URL}/api/jobs`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -45,19 +56,32 @@ document.addEventListener('DOMContentLoaded', () => {
                 }),
             });
 
-            const data = await response.json();
+            const job = await response.json();
+
+            if (!response.ok) {
+                statusMessageDiv.textContent = `Erro: ${job.erro || 'Ocorreu um erro na API.'}`;
+                statusMessageDiv.style.color = 'red';
+                return;
+            }
+
+            const jobFinal = await acompanharJobPorEventos(job.id);
 
-            if (response.ok) {
-                statusMessageDiv.textContent = data.mensagem || 'Busca concluída.';
+            if (jobFinal.status === 'concluido') {
+                statusMessageDiv.textContent = jobFinal.mensagem || 'Busca concluída.';
                 statusMessageDiv.style.color = 'green';
-                todasAsVagasRecebidas = data.vagas || [];
-                if (todasAsVagasRecebidas.length > 0) {
+                resultadoFinal = {
+                    totalVagas: jobFinal.total_vagas || 0,
+                    paginas: [jobFinal.vagas || []],
+                    cursores: [null, jobFinal.proximo_cursor],
+                };
+                paginaAtual = 0;
+                if (resultadoFinal.totalVagas > 0) {
                     mostrarPaginaDeVagas();
                 } else {
                     resultadosVagasDiv.innerHTML = '<p>Nenhuma vaga encontrada com os critérios informados.</p>';
                 }
             } else {
-                statusMessageDiv.textContent = `Erro: ${data.erro || 'Ocorreu um erro na API.'}`;
+                statusMessageDiv.textContent = `Erro: ${jobFinal.erro || 'Ocorreu um erro na API.'}`;
                 statusMessageDiv.style.color = 'red';
             }
         } catch (error) {
@@ -69,11 +93,104 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    // Acompanha o job via Server-Sent Events, renderizando cada vaga assim que ela é processada.
+    // Se o navegador não suportar EventSource ou a conexão cair, volta para a consulta periódica.
+    function acompanharJobPorEventos(jobId) {
+        if (!window.EventSource) {
+            return acompanharJob(jobId);
+        }
+
+        return new Promise((resolve) => {
+            const fonteEventos = new EventSource(`${API_BASE_URL}/api/jobs/${jobId}/eventos?${PARAMETROS_PAGINACAO}`);
+
+            fonteEventos.addEventListener('etapa', (evento) => {
+                const dados = JSON.parse(evento.data);
+                const descricaoEtapa = DESCRICAO_ETAPAS_JOB[dados.etapa] || 'Na fila';
+                statusMessageDiv.textContent = `${descricaoEtapa}... ${todasAsVagasRecebidas.length} vagas encontradas até agora.`;
+            });
+
+            fonteEventos.addEventListener('vaga', (evento) => {
+                const dados = JSON.parse(evento.data);
+                todasAsVagasRecebidas.splice(dados.rank_provisorio, 0, dados.vaga);
+                statusMessageDiv.textContent = `${dados.total_vagas_parciais} vagas encontradas até agora (resultado provisório, a busca continua)...`;
+                mostrarPaginaDeVagas();
+            });
+
+            fonteEventos.addEventListener('final', (evento) => {
+                fonteEventos.close();
+                const dados = JSON.parse(evento.data);
+                resolve({ status: 'concluido', ...dados });
+            });
+
+            fonteEventos.addEventListener('erro', (evento) => {
+                fonteEventos.close();
+                const dados = JSON.parse(evento.data);
+                resolve({ status: 'erro', erro: dados.erro });
+            });
+
+            fonteEventos.onerror = () => {
+                fonteEventos.close();
+                acompanharJob(jobId).then(resolve);
+            };
+        });
+    }
+
+    // Consulta o job periodicamente até ele terminar, mostrando a etapa atual no status.
+    async function acompanharJob(jobId) {
+        while (true) {
+            const response = await fetch(`${API_BASE_URL}/api/jobs/${jobId}?${PARAMETROS_PAGINACAO}`);
+            const job = await response.json();
+
+            if (!response.ok) {
+                return { status: 'erro', erro: job.erro };
+            }
+            if (job.status === 'concluido' || job.status === 'erro') {
+                return job;
+            }
+
+            const descricaoEtapa = DESCRICAO_ETAPAS_JOB[job.etapa] || 'Na fila';
+            statusMessageDiv.textContent = `${descricaoEtapa}... ${job.total_vagas_parciais} vagas processadas até agora.`;
+            await new Promise(resolve => setTimeout(resolve, INTERVALO_CONSULTA_JOB_MS));
+        }
+    }
+
+    // Busca no servidor a página indicada do resultado final, usando o cursor devolvido pela página anterior.
+    async function carregarPagina(indicePagina) {
+        if (resultadoFinal.paginas[indicePagina]) return true;
+        const cursor = resultadoFinal.cursores[indicePagina];
+        if (!cursor) return false;
+
+        const response = await fetch(`${API_BASE_URL}/api/resultados?cursor=${encodeURIComponent(cursor)}&${PARAMETROS_PAGINACAO}`);
+        const pagina = await response.json();
+        if (!response.ok) {
+            statusMessageDiv.textContent = `Erro: ${pagina.erro || 'Não foi possível carregar a página.'}`;
+            statusMessageDiv.style.color = 'red';
+            return false;
+        }
+        resultadoFinal.paginas[indicePagina] = pagina.vagas;
+        resultadoFinal.cursores[indicePagina + 1] = pagina.proximo_cursor;
+        return true;
+    }
+
+    async function irParaPagina(indicePagina) {
+        if (resultadoFinal && !(await carregarPagina(indicePagina))) return;
+        paginaAtual = indicePagina;
+        mostrarPaginaDeVagas();
+    }
+
+    function totalDeVagas() {
+        return resultadoFinal ? resultadoFinal.totalVagas : todasAsVagasRecebidas.length;
+    }
+
     function mostrarPaginaDeVagas() {
         resultadosVagasDiv.innerHTML = ''; // Limpa para nova página
-        const inicio = paginaAtual * VAGAS_POR_PAGINA_FRONTEND;
-        const fim = inicio + VAGAS_POR_PAGINA_FRONTEND;
-        const vagasDaPagina = todasAsVagasRecebidas.slice(inicio, fim);
+        let vagasDaPagina;
+        if (resultadoFinal) {
+            vagasDaPagina = resultadoFinal.paginas[paginaAtual] || [];
+        } else {
+            const inicio = paginaAtual * VAGAS_POR_PAGINA_FRONTEND;
+            vagasDaPagina = todasAsVagasRecebidas.slice(inicio, inicio + VAGAS_POR_PAGINA_FRONTEND);
+        }
 
         if (vagasDaPagina.length === 0 && paginaAtual === 0) {
             resultadosVagasDiv.innerHTML = '<p>Nenhuma vaga encontrada.</p>';
@@ -103,7 +220,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     function renderizarControlesDePaginacao() {
         paginationControlsDiv.innerHTML = '';
-        const totalPaginas = Math.ceil(todasAsVagasRecebidas.length / VAGAS_POR_PAGINA_FRONTEND);
+        const totalPaginas = Math.ceil(totalDeVagas() / VAGAS_POR_PAGINA_FRONTEND);
 
         if (totalPaginas <= 1) return; // Não precisa de controles se for 1 página ou menos
 
@@ -111,10 +228,7 @@ document.addEventListener('DOMContentLoaded', () => {
         if (paginaAtual > 0) {
             const btnAnterior = document.createElement('button');
             btnAnterior.textContent = '⬅️ Anterior';
-            btnAnterior.addEventListener('click', () => {
-                paginaAtual--;
-                mostrarPaginaDeVagas();
-            });
+            btnAnterior.addEventListener('click', () => irParaPagina(paginaAtual - 1));
             paginationControlsDiv.appendChild(btnAnterior);
         }
 
@@ -128,10 +242,7 @@ document.addEventListener('DOMContentLoaded', () => {
         if ((paginaAtual + 1) < totalPaginas) {
             const btnProxima = document.createElement('button');
             btnProxima.textContent = 'Próxima ➡️';
-            btnProxima.addEventListener('click', () => {
-                paginaAtual++;
-                mostrarPaginaDeVagas();
-            });
+            btnProxima.addEventListener('click', () => irParaPagina(paginaAtual + 1));
             paginationControlsDiv.appendChild(btnProxima);
         }
     }
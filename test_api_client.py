@@ -1,7 +1,12 @@
 import requests
 import json
+import time
 
-API_URL = "http://127.0.0.1:5000/api/buscar-vagas"
+API_URL = "http://127.0.0.1:5000/api/jobs"
+API_RESULTADOS_URL = "http://127.0.0.1:5000/api/resultados"
+VAGAS_POR_PAGINA = 3
+INTERVALO_CONSULTA_SEGUNDOS = 2
+TEMPO_MAXIMO_ESPERA_SEGUNDOS = 600
 
 payload_vaga_simples = {
     "cargo": "Analista de Sistemas",
@@ -22,25 +27,52 @@ print(f"Enviando requisição para: {API_URL}")
 print(f"Com payload: {json.dumps(payload_para_testar, indent=2)}")
 
 try:
-    response = requests.post(API_URL, json=payload_para_testar, timeout=240)
+    response = requests.post(API_URL, json=payload_para_testar, timeout=10)
 
     if response.ok:
-        print("\nRequisição bem-sucedida!")
-        data_resposta = response.json()
+        job_id = response.json()["id"]
+        print(f"\nJob criado: {job_id}. Acompanhando o progresso...")
+        inicio = time.time()
+        while True:
+            response = requests.get(f"{API_URL}/{job_id}", params={"limit": VAGAS_POR_PAGINA}, timeout=10)
+            response.raise_for_status()
+            data_resposta = response.json()
+            if data_resposta.get("status") in ("concluido", "erro"):
+                break
+            if time.time() - inicio > TEMPO_MAXIMO_ESPERA_SEGUNDOS:
+                raise requests.exceptions.Timeout()
+            print(f"  Status: {data_resposta.get('status')} | Etapa: {data_resposta.get('etapa')} | Vagas parciais: {data_resposta.get('total_vagas_parciais')}")
+            time.sleep(INTERVALO_CONSULTA_SEGUNDOS)
+
+        if data_resposta.get("status") == "erro":
+            print(f"\nO job terminou com erro: {data_resposta.get('erro')}")
+            raise SystemExit(1)
+
+        print("\nBusca concluída!")
         
         print(f"Mensagem da API: {data_resposta.get('mensagem')}")
         
         vagas_recebidas = data_resposta.get('vagas', [])
         if vagas_recebidas:
-            print(f"\n--- {len(vagas_recebidas)} Vagas Recebidas (mostrando as 3 primeiras) ---")
-            for i, vaga in enumerate(vagas_recebidas[:3]):
-                print(f"\n--- Vaga {i+1} (da API) ---")
-                print(f"  Título: {vaga.get('titulo')}")
-                print(f"  Empresa: {vaga.get('empresa')}")
-                print(f"  Localização: {vaga.get('localizacao')}")
-                print(f"  Data Original: {vaga.get('data_postagem_original')}")
-            if len(vagas_recebidas) > 3:
-                print("\n... e mais vagas.")
+            total_vagas = data_resposta.get('total_vagas', len(vagas_recebidas))
+            print(f"\n--- {total_vagas} Vagas Recebidas (paginadas de {VAGAS_POR_PAGINA} em {VAGAS_POR_PAGINA}) ---")
+            posicao = 0
+            proximo_cursor = data_resposta.get('proximo_cursor')
+            while True:
+                for vaga in vagas_recebidas:
+                    posicao += 1
+                    print(f"\n--- Vaga {posicao} (da API) ---")
+                    print(f"  Título: {vaga.get('titulo')}")
+                    print(f"  Empresa: {vaga.get('empresa')}")
+                    print(f"  Localização: {vaga.get('localizacao')}")
+                    print(f"  Data Original: {vaga.get('data_postagem_original')}")
+                if not proximo_cursor or input("\nBuscar a próxima página? (s/n): ").strip().lower() != 's':
+                    break
+                response = requests.get(API_RESULTADOS_URL, params={"cursor": proximo_cursor, "limit": VAGAS_POR_PAGINA}, timeout=10)
+                response.raise_for_status()
+                pagina = response.json()
+                vagas_recebidas = pagina.get('vagas', [])
+                proximo_cursor = pagina.get('proximo_cursor')
         else:
             print("Nenhuma vaga retornada na resposta da API.")
 
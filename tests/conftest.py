@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+# Os módulos do app leem a configuração na importação: os testes rodam com o backend stub,
+# sem chamadas à API, e com caches em um diretório temporário.
+os.environ["LLM_BACKEND"] = "stub"
+os.environ["LLM_STUB_LATENCIA_SEGUNDOS"] = "0"
+os.environ["PREAQUECER_CACHE_CIDADES_PROXIMAS"] = "0"
+os.environ["PREAQUECER_AGENTES"] = "0"
+os.environ["CACHE_DIR"] = tempfile.mkdtemp(prefix="testes-buscador-vagas-")
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
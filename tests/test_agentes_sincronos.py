@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime
+
+from app.agents.consolidador_formatador import processar_e_formatar_vagas, processar_e_formatar_vagas_async
+from app.agents.pesquisador_principal import buscar_vagas_principais, buscar_vagas_principais_async
+from app.agents.pesquisador_proximidade import buscar_vagas_em_proximidades, buscar_vagas_em_proximidades_async
+
+DATA_REFERENCIA = datetime(2025, 5, 17)
+
+def _buscar_e_consolidar_sincrono() -> tuple[str, dict[str, str], list]:
+    resposta_principal = buscar_vagas_principais("Desenvolvedor Python", "Campinas", estruturada=False)
+    respostas_por_cidade = buscar_vagas_em_proximidades("Desenvolvedor Python", "Campinas", estruturada=False)
+    vagas = processar_e_formatar_vagas(resposta_principal, respostas_por_cidade, DATA_REFERENCIA)
+    return resposta_principal, respostas_por_cidade, vagas
+
+def test_versoes_sincronas_funcionam_dentro_de_um_event_loop_em_execucao():
+    async def chamar_de_dentro_do_loop():
+        return _buscar_e_consolidar_sincrono()
+
+    resposta_principal, respostas_por_cidade, vagas = asyncio.run(chamar_de_dentro_do_loop())
+    assert "---FIM_DA_VAGA---" in resposta_principal
+    assert respostas_por_cidade
+    assert vagas
+
+def test_versoes_sincronas_e_assincronas_produzem_o_mesmo_resultado():
+    _, _, vagas_sincronas = _buscar_e_consolidar_sincrono()
+
+    async def buscar_e_consolidar():
+        resposta_principal = await buscar_vagas_principais_async("Desenvolvedor Python", "Campinas", estruturada=False)
+        respostas_por_cidade = await buscar_vagas_em_proximidades_async("Desenvolvedor Python", "Campinas", estruturada=False)
+        return await processar_e_formatar_vagas_async(resposta_principal, respostas_por_cidade, DATA_REFERENCIA)
+
+    vagas_assincronas = asyncio.run(buscar_e_consolidar())
+    assert [vaga.para_dict() for vaga in vagas_assincronas] == [vaga.para_dict() for vaga in vagas_sincronas]
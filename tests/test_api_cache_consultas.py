@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pytest
+
+import api
+from app.agents.orquestrador import ETAPA_BUSCANDO
+from app.core.cache import CacheComRevalidacao
+from app.core.metricas import DetalhamentoDeTempos
+from app.core.vaga import Vaga
+
+class JobFalso:
+    def __init__(self):
+        self.etapas = []
+        self.vagas = []
+
+def _vaga(titulo: str) -> Vaga:
+    return Vaga(titulo=titulo, empresa="ACME", localizacao="Campinas, SP", data_normalizada=datetime(2025, 5, 13))
+
+@pytest.fixture
+def pipeline_falso(monkeypatch):
+    """Substitui o pipeline e a persistência da execução incremental, contando as chamadas."""
+    chamadas = {"pipeline": 0, "salvos": []}
+
+    def executar_busca_em_pipeline(cargo, cidade, buscar_proximas, data, ao_mudar_etapa=None, ao_aceitar_vaga=None, detalhamento_tempos=None, execucao_incremental=None):
+        chamadas["pipeline"] += 1
+        vagas = [_vaga(f"Dev {chamadas['pipeline']}")]
+        ao_mudar_etapa(ETAPA_BUSCANDO)
+        for vaga in vagas:
+            ao_aceitar_vaga(vaga)
+        detalhamento_tempos.registrar("busca_principal", 0.5)
+        if execucao_incremental is not None:
+            execucao_incremental.registrar(f"texto {chamadas['pipeline']}", {"titulo": vagas[0].titulo})
+        return vagas
+
+    monkeypatch.setattr(api, "executar_busca_em_pipeline", executar_busca_em_pipeline)
+    monkeypatch.setattr(api, "INDICE_VAGAS_ATIVO", False)
+    monkeypatch.setattr(api, "_carregar_execucao_incremental", lambda *args: api.ExecucaoIncremental({}))
+    monkeypatch.setattr(api, "_salvar_execucao_incremental", lambda cargo, cidade, proximas, parses: chamadas["salvos"].append(parses))
+    return chamadas
+
+def _buscar(job: JobFalso | None = None, detalhamento_tempos: DetalhamentoDeTempos | None = None, incremental: bool = False):
+    return api._buscar_vagas_com_cache(
+        "Dev", "Campinas", False,
+        ao_mudar_etapa=job.etapas.append if job else None,
+        ao_aceitar_vaga=job.vagas.append if job else None,
+        detalhamento_tempos=detalhamento_tempos,
+        incremental=incremental
+    )
+
+def test_resultado_do_cache_e_repassado_a_cada_job(monkeypatch, pipeline_falso):
+    monkeypatch.setattr(api, "cache_consultas", CacheComRevalidacao(ttl_segundos=60))
+    primeiro, segundo = JobFalso(), JobFalso()
+
+    vagas, estado = _buscar(primeiro)
+    assert estado == "calculado"
+    assert primeiro.etapas == [ETAPA_BUSCANDO] and primeiro.vagas == vagas
+
+    vagas_fresco, estado = _buscar(segundo)
+    assert estado == "fresco" and vagas_fresco == vagas
+    assert segundo.vagas == vagas
+    assert primeiro.vagas == vagas
+
+def test_revalidacao_stale_nao_escreve_no_job_anterior(monkeypatch, pipeline_falso):
+    cache = CacheComRevalidacao(ttl_segundos=0, janela_stale_segundos=60)
+    monkeypatch.setattr(api, "cache_consultas", cache)
+    primeiro, segundo = JobFalso(), JobFalso()
+
+    _buscar(primeiro)
+    vagas_stale, estado = _buscar(segundo)
+    cache._executor_revalidacao.shutdown(wait=True)
+
+    assert estado == "stale"
+    assert pipeline_falso["pipeline"] == 2
+    assert [vaga.titulo for vaga in primeiro.vagas] == ["Dev 1"]
+    assert segundo.vagas == vagas_stale
+
+def test_tempos_por_etapa_sao_da_requisicao(monkeypatch, pipeline_falso):
+    monkeypatch.setattr(api, "cache_consultas", CacheComRevalidacao(ttl_segundos=60))
+    tempos_calculado, tempos_fresco = DetalhamentoDeTempos(), DetalhamentoDeTempos()
+
+    _buscar(detalhamento_tempos=tempos_calculado)
+    _buscar(detalhamento_tempos=tempos_fresco)
+
+    assert tempos_calculado.para_dict() == {"busca_principal": 0.5}
+    assert tempos_fresco.para_dict() == {}
+
+def test_base_incremental_e_salva_por_quem_recebe_o_resultado(monkeypatch, pipeline_falso):
+    cache = CacheComRevalidacao(ttl_segundos=0, janela_stale_segundos=60)
+    monkeypatch.setattr(api, "cache_consultas", cache)
+
+    _buscar(incremental=True)
+    assert len(pipeline_falso["salvos"]) == 1
+
+    # O stale entrega a execução 1, já salva; a revalidação em background (execução 2) não salva nada.
+    _, estado = _buscar(incremental=True)
+    cache._executor_revalidacao.shutdown(wait=True)
+    assert estado == "stale"
+    assert pipeline_falso["pipeline"] == 2
+    assert len(pipeline_falso["salvos"]) == 1
+
+    # A execução 2 só vira base quando é entregue a alguém, e uma única vez.
+    cache.ttl_segundos = 60
+    _buscar(incremental=True)
+    _buscar(incremental=True)
+    assert len(pipeline_falso["salvos"]) == 2
+    assert pipeline_falso["salvos"][0] != pipeline_falso["salvos"][1]
@@ -0,0 +1,42 @@
+"""
+Benchmarks de vazão de `normalizar_data` / `normalizar_datas` sobre um corpus sintético de datas de
+postagem no formato em que os agentes de busca costumam devolvê-las (pytest-benchmark).
+
+Uso: python -m pytest tests/test_benchmark_normalizacao_datas.py --benchmark-only
+"""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.agents.consolidador_formatador import _normalizar_data_em_cache, normalizar_data, normalizar_datas
+from benchmarks.geradores import gerar_datas_postagem
+
+DATA_REFERENCIA = datetime(2025, 5, 17, 15, 30)
+TAMANHO_CORPUS = 20_000
+RODADAS = 5
+
+@pytest.fixture(scope="module")
+def corpus() -> list[str | None]:
+    return gerar_datas_postagem(TAMANHO_CORPUS)
+
+def _normalizar_uma_a_uma(corpus: list[str | None]) -> list[datetime | None]:
+    return [normalizar_data(texto, DATA_REFERENCIA) for texto in corpus]
+
+def test_normalizar_data_cache_frio(benchmark, corpus):
+    resultado = benchmark.pedantic(
+        _normalizar_uma_a_uma, args=(corpus,), setup=_normalizar_data_em_cache.cache_clear, rounds=RODADAS
+    )
+    assert any(resultado)
+
+def test_normalizar_data_cache_quente(benchmark, corpus):
+    _normalizar_uma_a_uma(corpus)
+    resultado = benchmark.pedantic(_normalizar_uma_a_uma, args=(corpus,), rounds=RODADAS)
+    assert any(resultado)
+
+def test_normalizar_datas_em_lote_cache_frio(benchmark, corpus):
+    resultado = benchmark.pedantic(
+        normalizar_datas, args=(corpus, DATA_REFERENCIA), setup=_normalizar_data_em_cache.cache_clear, rounds=RODADAS
+    )
+    assert resultado == _normalizar_uma_a_uma(corpus)
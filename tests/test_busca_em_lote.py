@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from app.agents import busca_em_lote
+from app.agents.busca_em_lote import BuscaEmLote, iterar_busca_em_lote, ler_matriz_de_busca
+
+DATA_REFERENCIA = datetime(2025, 5, 17)
+
+@pytest.fixture
+def combinacoes_falsas(monkeypatch):
+    """Cada combinação leva 20ms e não devolve vagas; conta as combinações iniciadas."""
+    iniciadas = []
+
+    async def buscar_combinacao(self, cargo, cidade):
+        iniciadas.append((cargo, cidade))
+        await asyncio.sleep(0.02)
+        return []
+
+    monkeypatch.setattr(BuscaEmLote, "buscar_combinacao", buscar_combinacao)
+    return iniciadas
+
+def _threads_do_lote() -> list[threading.Thread]:
+    return [thread for thread in threading.enumerate() if thread.name == "busca-em-lote"]
+
+def test_ler_matriz_remove_repeticoes_e_valida_limites():
+    assert ler_matriz_de_busca({"cargos": ["Dev", "dev ", "Analista"], "cidades": ["São Paulo", "sao paulo"]}) == (["Dev", "Analista"], ["São Paulo"])
+    with pytest.raises(ValueError):
+        ler_matriz_de_busca({"cargos": "Dev", "cidades": ["Campinas"]})
+    with pytest.raises(ValueError):
+        ler_matriz_de_busca({"cargos": [" "], "cidades": ["Campinas"]})
+    with pytest.raises(ValueError):
+        ler_matriz_de_busca({"cargos": ["A", "B"], "cidades": ["X", "Y"]}, max_combinacoes=3)
+
+def test_matriz_completa_termina_com_resumo(combinacoes_falsas):
+    eventos = list(iterar_busca_em_lote(["A", "B"], ["X", "Y", "Z"], False, DATA_REFERENCIA))
+    assert [evento["tipo"] for evento in eventos] == ["resultado"] * 6 + ["resumo"]
+    assert eventos[-1]["combinacoes"] == 6
+    assert not _threads_do_lote()
+
+def test_fechar_o_gerador_cancela_o_restante_da_matriz(combinacoes_falsas):
+    cargos = [f"Cargo {i}" for i in range(20)]
+    cidades = [f"Cidade {i}" for i in range(20)]
+    eventos = iterar_busca_em_lote(cargos, cidades, False, DATA_REFERENCIA, max_combinacoes_simultaneas=2)
+
+    assert next(eventos)["tipo"] == "resultado"
+    eventos.close()
+
+    assert not _threads_do_lote()
+    iniciadas_ao_fechar = len(combinacoes_falsas)
+    time.sleep(0.1)
+    assert len(combinacoes_falsas) == iniciadas_ao_fechar < len(cargos) * len(cidades)
+
+def test_fila_limitada_segura_a_busca_enquanto_ninguem_consome(monkeypatch, combinacoes_falsas):
+    monkeypatch.setattr(busca_em_lote, "MAX_EVENTOS_PENDENTES_LOTE", 2)
+    eventos = iterar_busca_em_lote([f"Cargo {i}" for i in range(10)], ["X", "Y"], False, DATA_REFERENCIA, max_combinacoes_simultaneas=1)
+
+    next(eventos)
+    time.sleep(0.3)
+    # Um evento entregue, dois na fila e um esperando vaga nela; as demais combinações não começaram.
+    assert len(combinacoes_falsas) <= 5
+    eventos.close()
+    assert not _threads_do_lote()
@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from app.core.cache import CacheComRevalidacao
+
+def _aguardar(condicao, timeout: float = 2.0):
+    limite = time.monotonic() + timeout
+    while not condicao():
+        assert time.monotonic() < limite, "condição não satisfeita a tempo"
+        time.sleep(0.01)
+
+def test_quem_dispara_o_calculo_recebe_o_progresso():
+    cache = CacheComRevalidacao(ttl_segundos=60)
+    recebidos = []
+
+    def calcular(publicar):
+        publicar("etapa 1")
+        publicar("etapa 2")
+        return 42
+
+    assert cache.obter_ou_calcular("chave", calcular, ouvinte=recebidos.append) == (42, "calculado")
+    assert recebidos == ["etapa 1", "etapa 2"]
+
+    recebidos_fresco = []
+    assert cache.obter_ou_calcular("chave", calcular, ouvinte=recebidos_fresco.append) == (42, "fresco")
+    assert recebidos_fresco == []
+
+def test_chamada_coalescida_recebe_o_progresso_ja_publicado_e_o_seguinte():
+    cache = CacheComRevalidacao(ttl_segundos=60)
+    publicou_o_primeiro = threading.Event()
+    liberar = threading.Event()
+
+    def calcular(publicar):
+        publicar("antes")
+        publicou_o_primeiro.set()
+        liberar.wait(2)
+        publicar("depois")
+        return "valor"
+
+    recebidos_primeiro, recebidos_segundo, resultados = [], [], {}
+    primeiro = threading.Thread(target=lambda: resultados.setdefault("primeiro", cache.obter_ou_calcular("chave", calcular, ouvinte=recebidos_primeiro.append)))
+    primeiro.start()
+    publicou_o_primeiro.wait(2)
+    segundo = threading.Thread(target=lambda: resultados.setdefault("segundo", cache.obter_ou_calcular("chave", calcular, ouvinte=recebidos_segundo.append)))
+    segundo.start()
+    _aguardar(lambda: recebidos_segundo == ["antes"])
+    liberar.set()
+    primeiro.join(2)
+    segundo.join(2)
+
+    assert resultados == {"primeiro": ("valor", "calculado"), "segundo": ("valor", "coalescido")}
+    assert recebidos_primeiro == recebidos_segundo == ["antes", "depois"]
+
+def test_revalidacao_em_background_nao_repassa_progresso_a_chamadas_anteriores():
+    cache = CacheComRevalidacao(ttl_segundos=0, janela_stale_segundos=60)
+    recebidos_primeiro = []
+    execucoes = []
+
+    def calcular(publicar):
+        execucoes.append(len(execucoes) + 1)
+        publicar(f"execução {len(execucoes)}")
+        return len(execucoes)
+
+    assert cache.obter_ou_calcular("chave", calcular, ouvinte=recebidos_primeiro.append) == (1, "calculado")
+    time.sleep(0.01)
+
+    recebidos_stale = []
+    assert cache.obter_ou_calcular("chave", calcular, ouvinte=recebidos_stale.append) == (1, "stale")
+    _aguardar(lambda: len(execucoes) == 2)
+    cache._executor_revalidacao.shutdown(wait=True)
+
+    assert recebidos_primeiro == ["execução 1"]
+    assert recebidos_stale == []
+
+def test_falha_no_calculo_chega_as_chamadas_e_nao_e_guardada():
+    cache = CacheComRevalidacao(ttl_segundos=60)
+
+    def falhar(publicar):
+        raise RuntimeError("falhou")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="falhou"):
+            cache.obter_ou_calcular("chave", falhar)
+    assert cache.obter_ou_calcular("chave", lambda publicar: "ok") == ("ok", "calculado")
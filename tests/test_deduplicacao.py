@@ -0,0 +1,124 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from app.agents.consolidador_formatador import consolidar_vagas, remover_textos_duplicados
+from app.core.deduplicacao import (
+    DetectorDeDuplicatas,
+    canonicalizar_url,
+    criar_detector_de_textos_duplicados,
+    empresas_compativeis,
+    normalizar_empresa,
+    normalizar_titulo,
+    senioridades_compativeis,
+    similaridade_jaccard
+)
+from app.core.vaga import Vaga
+
+DATA_REFERENCIA = datetime(2025, 5, 17)
+EMPRESA_LONGA = "Companhia Brasileira de Soluções em Tecnologia da Informação e Dados Ltda"
+
+def _vaga(titulo: str, empresa: str = EMPRESA_LONGA, link: str | None = None, dia: int = 13) -> Vaga:
+    return Vaga(titulo=titulo, empresa=empresa, localizacao="Campinas, SP", link=link, data_normalizada=datetime(2025, 5, dia))
+
+def test_normalizacao_de_titulo_e_empresa():
+    assert normalizar_titulo("Dev. Python Sr (Vaga)") == "desenvolvedor python senior"
+    assert normalizar_empresa("ACME Tecnologia S.A.") == "acme tecnologia"
+    assert normalizar_empresa("ACME Ltda.") == "acme"
+
+@pytest.mark.parametrize("url, esperado", [
+    ("https://www.exemplo.com/vagas/123?utm_source=x&b=2&a=1#topo", "exemplo.com/vagas/123?a=1&b=2"),
+    ("exemplo.com//vagas/123/", "exemplo.com/vagas/123"),
+    ("https://www.linkedin.com/", None),
+    ("https://br.indeed.com/jobs?q=desenvolvedor+python&l=Campinas", None),
+    ("https://www.linkedin.com/jobs/search?keywords=python&location=Campinas", None),
+    ("https://www.linkedin.com/jobs/search?keywords=python&currentJobId=3912", "linkedin.com/jobs/search?currentJobId=3912"),
+    ("https://br.indeed.com/viewjob?jk=abc123&from=serp", "br.indeed.com/viewjob?jk=abc123"),
+    ("https://www.linkedin.com/jobs/view/3912", "linkedin.com/jobs/view/3912"),
+    ("Não informado", None),
+    (None, None),
+])
+def test_canonicalizar_url(url, esperado):
+    assert canonicalizar_url(url) == esperado
+
+def test_senioridades_e_empresas_compativeis():
+    assert not senioridades_compativeis("analista dados junior", "analista dados senior")
+    assert senioridades_compativeis("analista dados", "analista dados senior")
+    assert senioridades_compativeis("estagiario ti", "estagio ti")
+    assert empresas_compativeis("acme", "acme tecnologia")
+    assert empresas_compativeis("", "acme")
+    assert not empresas_compativeis("acme", "globex")
+
+def test_detector_confirma_candidatos_pela_similaridade_exata():
+    detector = DetectorDeDuplicatas(limiar_similaridade=0.8)
+    tokens = {f"t{i}" for i in range(10)}
+    assert detector.encontrar_ou_adicionar("a", tokens) is None
+    assert detector.encontrar_ou_adicionar("b", tokens | {"extra"}) == "a"
+    assert detector.encontrar_ou_adicionar("c", {"outro", "conjunto"}) is None
+    assert detector.encontrar_ou_adicionar("d", tokens, bloco="outra cidade") is None
+    assert detector.encontrar_ou_adicionar("e", tokens, verificar_candidato=lambda candidato: False) is None
+    assert similaridade_jaccard(tokens, tokens | {"extra"}) >= 0.8
+
+def test_detector_chave_exata_e_link():
+    detector = DetectorDeDuplicatas()
+    assert detector.encontrar_ou_adicionar(1, {"a"}, chave_exata="k", link_canonico="exemplo.com/vagas/1") is None
+    assert detector.encontrar_ou_adicionar(2, {"z"}, chave_exata="k") == 1
+    assert detector.encontrar_ou_adicionar(3, {"y"}, link_canonico="exemplo.com/vagas/1") == 1
+    assert detector.encontrar_ou_adicionar(4, {"x"}, link_canonico="exemplo.com/vagas/1", verificar_candidato=lambda candidato: False) is None
+
+@pytest.mark.parametrize("titulo_a, titulo_b", [
+    ("Analista de Dados Jr", "Analista de Dados Sr"),
+    ("Analista de Dados Júnior", "Analista de Dados Pleno"),
+    ("Desenvolvedor Backend Python Django AWS Microsserviços Remoto Pleno", "Desenvolvedor Backend Python Django AWS Microsserviços Remoto Sênior"),
+])
+def test_variantes_de_senioridade_na_mesma_empresa_nao_sao_mescladas(titulo_a, titulo_b):
+    vagas = consolidar_vagas([_vaga(titulo_a), _vaga(titulo_b)], DATA_REFERENCIA)
+    assert sorted(vaga.titulo for vaga in vagas) == sorted([titulo_a, titulo_b])
+
+def test_empresa_longa_nao_compensa_titulos_diferentes():
+    vagas = consolidar_vagas([_vaga("Analista de Dados"), _vaga("Engenheiro de Dados")], DATA_REFERENCIA)
+    assert len(vagas) == 2
+
+def test_mesma_vaga_com_variacoes_e_mesclada_ficando_a_mais_recente():
+    vagas = consolidar_vagas([
+        _vaga("Desenvolvedor Python Sênior Backend APIs", empresa="ACME Ltda", dia=10),
+        _vaga("Dev Python Sr Backend APIs REST", empresa="ACME", dia=12),
+        _vaga("Desenvolvedor Python Sênior Backend APIs", empresa="Globex", dia=11),
+    ], DATA_REFERENCIA)
+    assert sorted((vaga.empresa, vaga.data_normalizada.day) for vaga in vagas) == [("ACME", 12), ("Globex", 11)]
+
+def test_mesmo_link_e_duplicata_mesmo_com_titulos_diferentes():
+    link = "https://exemplo.com/vagas/42?utm_source=linkedin"
+    vagas = consolidar_vagas([_vaga("Analista", link=link), _vaga("Analista de BI", link="exemplo.com/vagas/42")], DATA_REFERENCIA)
+    assert len(vagas) == 1
+
+def test_mesmo_link_de_outra_empresa_nao_e_mesclado():
+    link = "https://exemplo.com/vagas/42"
+    vagas = consolidar_vagas([_vaga("Analista de Dados", empresa="ACME", link=link), _vaga("Analista de Dados", empresa="Globex", link=link)], DATA_REFERENCIA)
+    assert len(vagas) == 2
+
+def test_link_de_busca_do_agregador_nao_identifica_a_vaga():
+    link = "https://br.indeed.com/jobs?q=python&l=Campinas"
+    vagas = consolidar_vagas([_vaga("Desenvolvedor Python", empresa="ACME", link=link), _vaga("Analista de Dados", empresa="Globex", link=link)], DATA_REFERENCIA)
+    assert len(vagas) == 2
+
+def test_ids_automaticos_sao_unicos_entre_threads():
+    detector = DetectorDeDuplicatas()
+
+    def registrar(inicio: int):
+        for i in range(inicio, inicio + 200):
+            detector.encontrar_ou_adicionar(None, {f"texto{i}", f"unico{i}", f"vaga{i}"})
+
+    threads = [threading.Thread(target=registrar, args=(n * 200,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(detector) == 800
+
+def test_remover_textos_duplicados_com_detector_compartilhado():
+    detector = criar_detector_de_textos_duplicados()
+    texto = "Desenvolvedor Python Pleno na ACME em Campinas, trabalhando com Django e APIs REST."
+    assert remover_textos_duplicados([texto, "Outra vaga completamente diferente de analista de dados em Sorocaba."], detector) != []
+    assert remover_textos_duplicados([f"(Origem da busca: Sorocaba) {texto}"], detector) == []
@@ -0,0 +1,51 @@
+from app.agents.consolidador_formatador import extrair_vaga_por_template
+
+TEXTO_NO_TEMPLATE = """(Origem da busca: Campinas)
+1. **Desenvolvedor Python Pleno**
+* Empresa: ACME Tecnologia
+* Localização: Campinas, SP
+* Descrição: Django, APIs REST e PostgreSQL.
+Experiência com filas é um diferencial.
+* Data de Postagem: há 2 dias
+* Link: [Ver vaga](https://exemplo.com/vagas/123)
+"""
+
+def test_texto_no_template_e_extraido_sem_llm():
+    assert extrair_vaga_por_template(TEXTO_NO_TEMPLATE) == {
+        "vaga_valida": True,
+        "titulo": "Desenvolvedor Python Pleno",
+        "empresa": "ACME Tecnologia",
+        "localizacao": "Campinas, SP",
+        "descricao_resumida": "Django, APIs REST e PostgreSQL. Experiência com filas é um diferencial.",
+        "data_postagem_original": "há 2 dias",
+        "link": "https://exemplo.com/vagas/123",
+    }
+
+def test_rotulos_em_negrito_e_campos_opcionais_ausentes():
+    texto = "**Analista de Dados**\n**Empresa:** Beta\n**Local:** Sorocaba\n**Salário:** R$ 6.000"
+    vaga = extrair_vaga_por_template(texto)
+    assert vaga["titulo"] == "Analista de Dados"
+    assert vaga["localizacao"] == "Sorocaba"
+    assert vaga["salario"] == "R$ 6.000"
+    assert vaga["descricao_resumida"] == vaga["link"] == vaga["data_postagem_original"] == "Não informado"
+
+def test_descricao_longa_e_truncada():
+    texto = f"**Dev Python**\nEmpresa: ACME\nLocalização: Campinas\nDescrição: {'requisito ' * 40}"
+    descricao = extrair_vaga_por_template(texto)["descricao_resumida"]
+    assert len(descricao) <= 150
+    assert descricao.endswith("...")
+
+def test_linha_fora_do_template_vai_para_o_llm():
+    texto = "**Dev Python**\nEmpresa: ACME\nLocalização: Campinas\n- Requisito solto em lista"
+    assert extrair_vaga_por_template(texto) is None
+
+def test_campo_repetido_vai_para_o_llm():
+    texto = "**Dev Python**\nEmpresa: ACME\nEmpresa: Beta\nLocalização: Campinas"
+    assert extrair_vaga_por_template(texto) is None
+
+def test_sem_titulo_empresa_ou_localizacao_vai_para_o_llm():
+    assert extrair_vaga_por_template("Dev Python\nEmpresa: ACME\nLocalização: Campinas") is None
+    assert extrair_vaga_por_template("**Dev Python**\nLocalização: Campinas\nLink: https://exemplo.com/v/1") is None
+    assert extrair_vaga_por_template("**Dev Python**\nEmpresa: ACME\nLocalização: Não informado") is None
+    assert extrair_vaga_por_template("**Dev Python**\nEmpresa: ACME") is None
+    assert extrair_vaga_por_template("") is None
@@ -0,0 +1,121 @@
+from datetime import datetime
+
+import pytest
+
+import api
+from app.core.cache import CacheComRevalidacao
+from app.core.indice_vagas import IndiceDeVagas
+from app.core.vaga import Vaga, normalizar_local_base
+
+def _vaga(titulo: str, localizacao: str = "Campinas", empresa: str = "ACME", link: str | None = None, descricao: str | None = None) -> Vaga:
+    return Vaga(titulo=titulo, empresa=empresa, localizacao=localizacao, link=link, descricao_resumida=descricao,
+                data_normalizada=datetime(2025, 5, 13))
+
+@pytest.fixture
+def indice(monkeypatch, tmp_path):
+    indice = IndiceDeVagas(str(tmp_path / "vagas.sqlite3"))
+    monkeypatch.setattr(api, "INDICE_VAGAS_ATIVO", True)
+    monkeypatch.setattr(api, "obter_indice_vagas", lambda: indice)
+    return indice
+
+@pytest.mark.parametrize("localizacao", [
+    "Campinas", "Campinas, SP", "Campinas - Cambuí", "Campinas/SP", "Remoto (Campinas)", "Híbrido - Campinas, SP",
+])
+def test_local_base_ignora_bairro_estado_e_modalidade(localizacao):
+    assert normalizar_local_base(localizacao) == "campinas"
+
+def test_local_base_preserva_nomes_com_hifen_e_vagas_so_remotas():
+    assert normalizar_local_base("Embu-Guaçu, SP") == "embu-guacu"
+    assert normalizar_local_base("Remoto") == "remoto"
+
+def test_busca_casa_variacoes_da_cidade(indice):
+    indice.registrar_vagas([
+        _vaga("Dev Python", "Campinas - Cambuí"),
+        _vaga("Dev Python Sênior", "Remoto (Campinas)"),
+        _vaga("Dev Python Pleno", "Sorocaba, SP"),
+    ])
+    titulos = {vaga.titulo for vaga in indice.buscar("Dev Python", ["Campinas, SP"])}
+    assert titulos == {"Dev Python", "Dev Python Sênior"}
+
+def test_consulta_nunca_buscada_ao_vivo_exige_os_agentes(indice):
+    indice.registrar_vagas([_vaga(f"Dev Python {i}", "Campinas") for i in range(20)])
+
+    vagas, busca_necessaria = api._consultar_indice_local("Dev Python", "Campinas", False)
+    assert len(vagas) == 20
+    assert busca_necessaria
+
+def test_busca_ao_vivo_recente_dispensa_os_agentes_so_para_a_mesma_consulta(indice):
+    indice.registrar_vagas([_vaga("Dev Python", "Campinas")])
+    indice.registrar_busca_ao_vivo("Dev Python", "Campinas", False, total_vagas=1)
+
+    assert api._consultar_indice_local("Dev Python", "Campinas", False)[1] is False
+    assert api._consultar_indice_local("Dev Python", "Campinas", True)[1] is True
+
+def test_busca_ao_vivo_antiga_exige_os_agentes(indice, monkeypatch):
+    indice.registrar_busca_ao_vivo("Dev Python", "Campinas", False, total_vagas=1)
+    monkeypatch.setattr(api, "INDICE_VAGAS_INTERVALO_BUSCA_AO_VIVO_SEGUNDOS", -1)
+
+    assert api._consultar_indice_local("Dev Python", "Campinas", False)[1] is True
+
+def test_busca_casa_qualquer_termo_do_cargo_no_titulo_ou_na_descricao(indice):
+    indice.registrar_vagas([
+        _vaga("Desenvolvedor Python"),
+        _vaga("Engenheiro de Software", descricao="Backend em Python e Django."),
+        _vaga("Desenvolvedor Backend", empresa="Globex"),
+        _vaga("Analista Financeiro", descricao="Conciliação bancária."),
+    ])
+    titulos = {vaga.titulo for vaga in indice.buscar("Desenvolvedor Python", ["Campinas"])}
+    assert titulos == {"Desenvolvedor Python", "Engenheiro de Software", "Desenvolvedor Backend"}
+
+def test_link_de_busca_compartilhado_nao_sobrescreve_outras_vagas(indice):
+    link_de_busca = "https://br.indeed.com/jobs?q=python&l=Campinas"
+    assert indice.registrar_vagas([
+        _vaga("Desenvolvedor Python", link=link_de_busca),
+        _vaga("Analista de Dados Python", empresa="Globex", link=link_de_busca),
+    ]) == 2
+    assert len(indice) == 2
+
+def test_mesma_vaga_com_links_proprios_diferentes_e_registrada_separadamente(indice):
+    indice.registrar_vagas([
+        _vaga("Desenvolvedor Python", link="https://exemplo.com/vagas/1"),
+        _vaga("Desenvolvedor Python", link="https://exemplo.com/vagas/2"),
+        _vaga("Desenvolvedor Python", link="https://exemplo.com/vagas/1?utm_source=x"),
+    ])
+    assert len(indice) == 2
+
+@pytest.fixture
+def pipeline_falso(monkeypatch, indice):
+    """Pipeline que devolve sempre as mesmas vagas e as registra no índice, como a busca ao vivo."""
+    chamadas = []
+
+    def executar_busca_em_pipeline(cargo, cidade, buscar_proximas, data, ao_mudar_etapa=None, ao_aceitar_vaga=None, detalhamento_tempos=None, execucao_incremental=None):
+        chamadas.append(execucao_incremental is not None)
+        return [_vaga("Desenvolvedor Python"), _vaga("Engenheiro de Software", descricao="Python")]
+
+    monkeypatch.setattr(api, "executar_busca_em_pipeline", executar_busca_em_pipeline)
+    monkeypatch.setattr(api, "cache_consultas", CacheComRevalidacao(ttl_segundos=60))
+    monkeypatch.setattr(api, "_carregar_execucao_incremental", lambda *args: api.ExecucaoIncremental({}))
+    monkeypatch.setattr(api, "_salvar_execucao_incremental", lambda *args: None)
+    return chamadas
+
+def _buscar(**opcoes):
+    return api._buscar_vagas_com_cache("Desenvolvedor Python", "Campinas", False, **opcoes)
+
+def test_indice_so_responde_com_opt_in_e_depois_do_cache_de_consultas(pipeline_falso):
+    assert _buscar()[1] == "calculado"
+    assert _buscar()[1] == "fresco"
+
+    api.cache_consultas.invalidar(("desenvolvedor python", "campinas", False, False, False))
+    assert _buscar()[1] == "calculado"
+    assert len(pipeline_falso) == 2
+
+    vagas, estado = _buscar(indice_local=True)
+    assert estado == "indice_local"
+    assert sorted(vaga.titulo for vaga in vagas) == ["Desenvolvedor Python", "Engenheiro de Software"]
+    assert _buscar(indice_local=True)[1] == "fresco"
+    assert len(pipeline_falso) == 2
+
+def test_modo_incremental_nao_usa_o_indice(pipeline_falso):
+    _buscar()
+    assert _buscar(incremental=True, indice_local=True)[1] == "calculado"
+    assert pipeline_falso == [False, True]
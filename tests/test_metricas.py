@@ -0,0 +1,50 @@
+import api
+from app.agents import consolidador_formatador
+from app.core.cache import CacheEmCamadas, CacheMemoria
+from app.core.metricas import RegistroDeMetricas
+from tests.test_extrator_template import TEXTO_NO_TEMPLATE
+
+def _linhas_de_metricas() -> list[str]:
+    resposta = api.app.test_client().get('/metrics')
+    assert resposta.status_code == 200
+    return resposta.get_data(as_text=True).splitlines()
+
+def test_metrica_coletada_le_os_valores_na_exportacao():
+    valores = {("a",): 1}
+    registro = RegistroDeMetricas()
+    registro.coletada("teste_total", "Teste.", "counter", lambda: dict(valores), ("rotulo",))
+    valores[("b",)] = 2.5
+    assert registro.exportar_prometheus().splitlines() == [
+        "# HELP teste_total Teste.", "# TYPE teste_total counter", 'teste_total{rotulo="a"} 1', 'teste_total{rotulo="b"} 2.5',
+    ]
+
+def test_erro_na_coleta_nao_derruba_a_exportacao():
+    registro = RegistroDeMetricas()
+    registro.coletada("teste_taxa", "Teste.", "gauge", lambda: 1 / 0)
+    registro.contador("teste_contador_total", "Teste.").incrementar()
+    assert "teste_contador_total 1" in registro.exportar_prometheus()
+
+def test_metrics_expoe_a_taxa_de_acerto_do_extrator_por_template(monkeypatch):
+    monkeypatch.setattr(consolidador_formatador, "_metricas_extrator_rapido", {"tentativas": 0, "acertos": 0})
+    consolidador_formatador._resolver_sem_llm(TEXTO_NO_TEMPLATE)
+    consolidador_formatador._resolver_sem_llm("**Dev Python**\nEmpresa: ACME\n- Requisito solto")
+
+    linhas = _linhas_de_metricas()
+    assert 'buscador_vagas_extrator_template_total{resultado="tentativas"} 2' in linhas
+    assert 'buscador_vagas_extrator_template_total{resultado="acertos"} 1' in linhas
+    assert "buscador_vagas_extrator_template_taxa_acerto 0.5" in linhas
+
+def test_metrics_expoe_os_contadores_do_cache_de_parse(monkeypatch):
+    cache = CacheEmCamadas(CacheMemoria(max_entradas=10))
+    monkeypatch.setattr(consolidador_formatador, "_cache_parse", cache)
+    consolidador_formatador._registrar_no_cache_parse("Dev Python na ACME", None)
+    consolidador_formatador._consultar_cache_parse("Dev Python na ACME")
+    consolidador_formatador._consultar_cache_parse("Outra vaga")
+
+    linhas = _linhas_de_metricas()
+    assert 'buscador_vagas_cache_parse_consultas_total{resultado="acerto_memoria"} 1' in linhas
+    assert 'buscador_vagas_cache_parse_consultas_total{resultado="acerto_disco"} 0' in linhas
+    assert 'buscador_vagas_cache_parse_consultas_total{resultado="falha"} 1' in linhas
+    assert "buscador_vagas_cache_parse_taxa_acerto 0.5" in linhas
+    assert 'buscador_vagas_cache_parse_entradas{camada="memoria"} 1' in linhas
+    assert 'buscador_vagas_cache_parse_entradas{camada="disco"} 0' in linhas
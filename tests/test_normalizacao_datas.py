@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from app.agents.consolidador_formatador import normalizar_data, normalizar_datas
+
+DATA_REFERENCIA = datetime(2025, 5, 17, 15, 30)
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("25/03/2025", datetime(2025, 3, 25)),
+    ("25/03/25", datetime(2025, 3, 25)),
+    ("01/02/99", datetime(1999, 2, 1)),
+    ("Publicada em: 10/05/2025", datetime(2025, 5, 10)),
+    ("10 de maio de 2025", datetime(2025, 5, 10)),
+    ("17 May 2025", datetime(2025, 5, 17)),
+    ("3 de March de 2025", datetime(2025, 3, 3)),
+    ("1 December 2024", datetime(2024, 12, 1)),
+    ("10/05", datetime(2025, 5, 10)),
+    ("hoje", datetime(2025, 5, 17)),
+    ("Ontem", datetime(2025, 5, 16)),
+    ("há 3 dias", datetime(2025, 5, 14)),
+    ("há 2 semanas", datetime(2025, 5, 3)),
+    ("há 1 mês", datetime(2025, 4, 17)),
+])
+def test_formatos_ja_suportados(texto, esperado):
+    assert normalizar_data(texto, DATA_REFERENCIA) == esperado
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("2025-05-10", datetime(2025, 5, 10)),
+    ("2025-05-10T08:15:00Z", datetime(2025, 5, 10)),
+    ("2025-05-10 08:15:00-03:00", datetime(2025, 5, 10)),
+    ("10 mai. 2025", datetime(2025, 5, 10)),
+    ("3 de set de 2024", datetime(2024, 9, 3)),
+    ("há 2 meses", datetime(2025, 3, 18)),
+    ("há 1 ano", datetime(2024, 5, 17)),
+    ("há 30 minutos", datetime(2025, 5, 17)),
+    ("há uma semana", datetime(2025, 5, 10)),
+    ("há 30+ dias", datetime(2025, 4, 17)),
+])
+def test_formatos_novos(texto, esperado):
+    assert normalizar_data(texto, DATA_REFERENCIA) == esperado
+
+@pytest.mark.parametrize("texto", [None, "", "Não informado", "N/A", "31/02/2025", "2025-13-01", "recentemente", "32/13"])
+def test_textos_invalidos_ou_ausentes_retornam_none(texto):
+    assert normalizar_data(texto, DATA_REFERENCIA) is None
+
+def test_datas_relativas_dependem_do_dia_de_referencia():
+    assert normalizar_data("há 3 dias", datetime(2025, 1, 2)) == datetime(2024, 12, 30)
+    assert normalizar_data("há 3 dias", DATA_REFERENCIA) == datetime(2025, 5, 14)
+
+def test_normalizar_datas_preserva_a_ordem_e_as_repeticoes():
+    textos = ["hoje", None, "há 3 dias", "hoje"]
+    assert normalizar_datas(textos, DATA_REFERENCIA) == [
+        datetime(2025, 5, 17), None, datetime(2025, 5, 14), datetime(2025, 5, 17)
+    ]
@@ -0,0 +1,65 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from app.core.paginacao import (
+    ArmazemDeResultados,
+    CursorInvalidoError,
+    codificar_cursor,
+    decodificar_cursor,
+    ler_campos,
+    projetar_vaga
+)
+from app.core.vaga import Vaga, serializar_para_json
+
+def _vaga(titulo: str, dia: int = 13) -> Vaga:
+    return Vaga(titulo=titulo, empresa="ACME", localizacao="Campinas, SP", link="https://exemplo.com", data_normalizada=datetime(2025, 5, dia))
+
+def test_cursor_ida_e_volta():
+    assert decodificar_cursor(codificar_cursor("abc123", 40)) == ("abc123", 40)
+
+def test_cursor_com_dois_pontos_no_id():
+    assert decodificar_cursor(codificar_cursor("a:b", 7)) == ("a:b", 7)
+
+@pytest.mark.parametrize("cursor", ["", "###", "bm9wb3NpY2Fv", codificar_cursor("abc", -1), codificar_cursor("", 3)])
+def test_cursor_invalido(cursor):
+    with pytest.raises(CursorInvalidoError):
+        decodificar_cursor(cursor)
+
+def test_ler_campos():
+    assert ler_campos(" titulo, ,empresa ") == ("titulo", "empresa")
+    assert ler_campos("") is None
+    assert ler_campos(None) is None
+
+def test_projecao_usa_o_mesmo_formato_de_data_da_resposta_completa():
+    vaga = _vaga("Dev Python")
+    completa = json.loads(json.dumps(vaga, default=serializar_para_json))
+    projetada = projetar_vaga(vaga, ("titulo", "data_normalizada", "inexistente"))
+    assert projetada == {"titulo": "Dev Python", "data_normalizada": "Tue, 13 May 2025 00:00:00 GMT"}
+    assert projetada["data_normalizada"] == completa["data_normalizada"]
+    assert projetar_vaga(vaga) == completa
+
+def test_armazem_pagina_ate_o_fim():
+    armazem = ArmazemDeResultados(ttl_segundos=60)
+    resultado_id = armazem.guardar([_vaga(f"Vaga {i}") for i in range(5)])
+
+    primeira = armazem.pagina(resultado_id, 0, 2, ("titulo",))
+    assert [vaga["titulo"] for vaga in primeira["vagas"]] == ["Vaga 0", "Vaga 1"]
+    assert primeira["total_vagas"] == 5
+
+    _, posicao = decodificar_cursor(primeira["proximo_cursor"])
+    ultima = armazem.pagina(resultado_id, 4, 2)
+    assert posicao == 2
+    assert len(ultima["vagas"]) == 1 and ultima["proximo_cursor"] is None
+    assert armazem.pagina("inexistente", 0, 2) is None
+
+def test_fatia_devolve_as_vagas_sem_serializar():
+    armazem = ArmazemDeResultados(ttl_segundos=None)
+    vagas = [_vaga(f"Vaga {i}") for i in range(3)]
+    resultado_id = armazem.guardar(vagas)
+
+    vagas_da_pagina, total_vagas, proximo_cursor = armazem.fatia(resultado_id, 0, 2)
+    assert vagas_da_pagina == vagas[:2] and total_vagas == 3
+    assert decodificar_cursor(proximo_cursor) == (resultado_id, 2)
+    assert armazem.fatia(resultado_id, 2, 2) == (vagas[2:], 3, None)
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.core import rate_limiter
+from app.core.rate_limiter import LimitadorTokenBucket
+
+class RelogioFalso:
+    """Substitui `time` no módulo do limitador: `sleep` só avança o relógio."""
+
+    def __init__(self):
+        self.agora = 1000.0
+        self.esperas = []
+
+    def monotonic(self) -> float:
+        return self.agora
+
+    def sleep(self, segundos: float):
+        self.esperas.append(segundos)
+        self.agora += segundos
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = RelogioFalso()
+    monkeypatch.setattr(rate_limiter, "time", relogio)
+    return relogio
+
+def test_rajada_inicial_nao_espera_e_o_excedente_espera_a_reposicao(relogio):
+    limitador = LimitadorTokenBucket(requisicoes_por_minuto=60, capacidade=3)
+    assert [limitador.adquirir() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limitador.adquirir() == pytest.approx(1.0)
+    assert relogio.esperas == [pytest.approx(1.0)]
+
+def test_tokens_sao_repostos_com_o_tempo_ate_a_capacidade(relogio):
+    limitador = LimitadorTokenBucket(requisicoes_por_minuto=120, capacidade=2)
+    limitador.adquirir()
+    limitador.adquirir()
+
+    relogio.agora += 0.5
+    assert limitador.adquirir() == 0.0
+    assert limitador.adquirir() == pytest.approx(0.5)
+
+    relogio.agora += 60
+    assert [limitador.adquirir() for _ in range(2)] == [0.0, 0.0]
+    assert limitador.adquirir() == pytest.approx(0.5)
+
+def test_reservas_consecutivas_sem_reposicao_se_acumulam(relogio):
+    limitador = LimitadorTokenBucket(requisicoes_por_minuto=60)
+    limitador._reservar()
+    assert limitador._reservar() == pytest.approx(1.0)
+    assert limitador._reservar() == pytest.approx(2.0)
+
+def test_adquirir_async_espera_sem_bloquear(relogio, monkeypatch):
+    esperas_async = []
+
+    async def sleep_falso(segundos):
+        esperas_async.append(segundos)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", sleep_falso)
+    limitador = LimitadorTokenBucket(requisicoes_por_minuto=30)
+
+    async def adquirir_duas_vezes():
+        return [await limitador.adquirir_async(), await limitador.adquirir_async()]
+
+    assert asyncio.run(adquirir_duas_vezes()) == [0.0, pytest.approx(2.0)]
+    assert esperas_async == [pytest.approx(2.0)]
+    assert relogio.esperas == []
+
+def test_taxa_invalida():
+    with pytest.raises(ValueError):
+        LimitadorTokenBucket(requisicoes_por_minuto=0)